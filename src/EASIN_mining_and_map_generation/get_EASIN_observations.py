@@ -6,15 +6,23 @@
 # =====================================================================================================
 
 import os
+import re
+import csv
 import sys
 import time
-import json
+import random
+import asyncio
+from functools import lru_cache
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 from dotenv import load_dotenv
 from requests.exceptions import RequestException
 from tqdm import tqdm
-from typing import List, Dict, Tuple, Set, Union, Optional
+from typing import Callable, List, Dict, Tuple, Set, Union, Optional, TextIO
 
 # =====================================================================================================
 # 1. CONFIGURATION & CONSTANTS
@@ -29,6 +37,27 @@ TAKE_LIMIT = 10000
 # Maximum number of retry attempts for failed API requests
 MAX_RETRIES = 5
 
+# Application-level retry delay: doubles per attempt from this base (seconds),
+# capped, with jitter so concurrent workers do not retry in lockstep
+RETRY_BACKOFF_BASE = 3
+RETRY_BACKOFF_MAX = 60
+
+# Number of (species, country) requests sent to the EASIN API concurrently
+DEFAULT_MAX_WORKERS = 8
+
+# Shared session so worker threads reuse keep-alive connections to the API.
+# The adapter does not retry: fetch_occurrences owns retries (retry_wait
+# backoff and Retry-After), so the two layers do not multiply the attempts
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=0))
+
+# Formatted rows buffered by run_easin_fetcher before one append to the output CSV
+FLUSH_EVERY = 1000
+
+# Suffix of the sidecar file listing processed EASIN_IDs (one per line) next
+# to the output CSV, so resume does not have to scan the whole CSV
+PROCESSED_SUFFIX = ".processed"
+
 # Default output file path for occurrence data
 default_ouput_file = "easin_occurrences_EU.csv"
 
@@ -51,6 +80,13 @@ BASE_OUTPUT_COLUMNS = [
     "Timestamp"       # System timestamp of when record was added/updated
 ]
 
+# Date fields checked by extract_best_observation_date, most granular first
+OBSERVATION_DATE_FIELDS = ("EventDate", "DateCollected", "Observation_Date", "Year")
+
+# WKT point geometry: "POINT (longitude latitude)", parentheses and inner
+# whitespace optional. Compiled once for _parse_point_wkt.
+WKT_POINT_PATTERN = re.compile(r"^POINT\s*\(?\s*([^\s()]+)\s+([^\s()]+)\s*\)?\s*$")
+
 # European Union member states and territories (ISO 3166-1 alpha-2 codes)
 # XI = Northern Ireland (special status post-Brexit)
 EU_COUNTRIES = [
@@ -121,25 +157,33 @@ def extract_coordinates(record: Dict) -> Tuple[Union[float, None], Union[float,
     >>> extract_coordinates(record)
     (50.8503, 4.3517)
     """
-    latitude, longitude = None, None
+    # Check if WKT field exists and is a non-empty string
+    wkt = record.get("WKT")
+    if wkt and isinstance(wkt, str):
+        return _parse_point_wkt(wkt)
+    return None, None
 
-    # Check if WKT field exists and is not empty
-    if "WKT" in record and record["WKT"]:
+
+@lru_cache(maxsize=65536)
+def _parse_point_wkt(wkt: str) -> Tuple[Union[float, None], Union[float, None]]:
+    """
+    Parse a WKT POINT string into (latitude, longitude), memoized.
+    
+    Many observations share the same point (e.g. grid or locality
+    centroids), so repeated strings are answered from a bounded cache.
+    """
+    # WKT POINT format: "POINT (longitude latitude)", matched by the
+    # pattern compiled once at module load
+    match = WKT_POINT_PATTERN.match(wkt)
+    if match:
         try:
-            wkt = record["WKT"]
-            # WKT POINT format: "POINT (longitude latitude)"
-            if wkt.startswith("POINT"):
-                # Remove "POINT" prefix and parentheses
-                coords_part = wkt.replace("POINT", "").strip().strip("()")
-                coords = coords_part.split()
-                if len(coords) == 2:
-                    # Note: WKT convention is (longitude, latitude), opposite of typical usage
-                    longitude, latitude = float(coords[0]), float(coords[1])
-        except (ValueError, IndexError):
+            # Note: WKT convention is (longitude, latitude), opposite of typical usage
+            longitude, latitude = float(match.group(1)), float(match.group(2))
+            return latitude, longitude
+        except ValueError:
             # Silently handle malformed coordinate data
             pass
-
-    return latitude, longitude
+    return None, None
 
 
 def extract_best_observation_date(record: Dict) -> Union[str, int, None]:
@@ -178,24 +222,45 @@ def extract_best_observation_date(record: Dict) -> Union[str, int, None]:
     >>> extract_best_observation_date(record)
     2020
     """
-    # List of fields to check, in order of preference (most to least granular)
-    granular_date_fields = ["EventDate", "DateCollected", "Observation_Date"]
-    
-    for field in granular_date_fields:
-        if field in record and record[field]:
-            return record[field]
-
-    # Fallback to year if no granular date is available
-    if "Year" in record and record["Year"]:
-        return record["Year"]
-    
-    return None
+    # First truthy field in order of preference (most to least granular,
+    # falling back to the year); missing, None and empty values fall through
+    return next(
+        (value for field in OBSERVATION_DATE_FIELDS if (value := record.get(field))),
+        None
+    )
 
 
 # =====================================================================================================
 # 3. API DATA FETCHING
 # =====================================================================================================
 
+def retry_wait(retries: int, retry_after: Optional[str] = None) -> float:
+    """
+    Seconds to wait before retry number `retries` of a failed page request.
+    
+    Parameters
+    ----------
+    retries : int
+        1-based retry attempt.
+    retry_after : Optional[str], default=None
+        Retry-After header of the failed response, if any; a numeric value
+        is used as a lower bound on the wait.
+    
+    Returns
+    -------
+    float
+        Exponential backoff (3, 6, 12, 24, 48s, capped at RETRY_BACKOFF_MAX)
+        with equal jitter: between half and all of the backoff.
+    """
+    backoff = min(RETRY_BACKOFF_BASE * 2 ** (retries - 1), RETRY_BACKOFF_MAX)
+    wait_time = backoff / 2 + random.uniform(0, backoff / 2)
+    try:
+        return max(wait_time, float(retry_after)) if retry_after else wait_time
+    except ValueError:
+        # HTTP-date form of Retry-After: fall back to the backoff
+        return wait_time
+
+
 def fetch_occurrences(
     species_id: Union[int, str],
     country_code: str,
@@ -232,7 +297,9 @@ def fetch_occurrences(
     Notes
     -----
     - Implements automatic pagination to retrieve all available records
-    - Exponential backoff retry strategy for transient network errors
+    - Exponential backoff with jitter (retry_wait) for network errors and
+      error responses (e.g. 429/5xx), never shorter than a server's
+      Retry-After; this loop is the only retry layer (SESSION does not retry)
     - Rate limiting: 1 second delay between successful requests
     - Date filters are applied server-side via API parameters
     
@@ -246,7 +313,8 @@ def fetch_occurrences(
     
     Error Handling
     --------------
-    - Network errors trigger up to MAX_RETRIES attempts with increasing delays
+    - Network errors and HTTP error statuses trigger up to MAX_RETRIES retries
+      with increasing delays
     - After max retries, function returns partial results (graceful degradation)
     - Empty API responses ({"Empty": ...}) signal end of available data
     
@@ -286,14 +354,15 @@ def fetch_occurrences(
 
         try:
             # Execute POST request to EASIN API
-            response = requests.post(
+            response = SESSION.post(
                 EASIN_OCCURRENCES_URL,
                 json=payload,
                 headers={"Content-Type": "application/json"},
                 timeout=60,  # 60 second timeout
             )
             response.raise_for_status()  # Raise exception for 4xx/5xx status codes
-            data = response.json()
+            # orjson parses the (up to TAKE_LIMIT records) page much faster than json
+            data = orjson.loads(response.content)
 
             # Check for empty result indicator from API
             if isinstance(data, dict) and "Empty" in data:
@@ -318,14 +387,17 @@ def fetch_occurrences(
             skip += TAKE_LIMIT
             retries = 0  # Reset retry counter on success
 
-        except RequestException:
-            # Handle network/API errors with retry logic
+        except (RequestException, orjson.JSONDecodeError) as e:
+            # Handle network/API errors and truncated responses with retry logic
             if retries < MAX_RETRIES:
                 retries += 1
-                wait_time = 3 * retries  # Linear backoff: 3, 6, 9, 12, 15 seconds
+                failed = getattr(e, "response", None)
+                wait_time = retry_wait(
+                    retries, failed.headers.get("Retry-After") if failed is not None else None
+                )
                 tqdm.write(
                     f"⚠️ Error fetching {species_id} in {country_code}, "
-                    f"retry {retries}/{MAX_RETRIES} in {wait_time}s..."
+                    f"retry {retries}/{MAX_RETRIES} in {wait_time:.1f}s..."
                 )
                 time.sleep(wait_time)
                 continue
@@ -340,6 +412,150 @@ def fetch_occurrences(
     return all_records
 
 
+async def fetch_occurrences_async(
+    session: aiohttp.ClientSession,
+    species_id: Union[int, str],
+    country_code: str,
+    email: str,
+    password: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> List[Dict]:
+    """
+    Retrieve all occurrence records for a species-country combination on the event loop.
+    
+    Async twin of fetch_occurrences: same payload, pagination, rate limiting
+    and retry policy, with the POSTs sent through a shared aiohttp session.
+    
+    Parameters
+    ----------
+    session : aiohttp.ClientSession
+        Shared session; its connector bounds the open connections.
+    species_id, country_code, email, password, start_date, end_date
+        As for fetch_occurrences.
+    
+    Returns
+    -------
+    List[Dict]
+        List of occurrence records as dictionaries. Empty list if no data or on failure.
+    """
+    all_records = []
+    skip = 0  # Pagination offset
+    retries = 0  # Current retry attempt counter
+
+    while True:
+        payload = {
+            "Email": email,
+            "Password": password,
+            "speciesId": str(species_id),
+            "countryCode": country_code,
+            "dataPartners": "",
+            "excludePartners": 0,
+            "skip": skip,
+            "take": TAKE_LIMIT,
+        }
+        if start_date:
+            payload["FromDate"] = start_date
+        if end_date:
+            payload["ToDate"] = end_date
+
+        try:
+            async with session.post(
+                EASIN_OCCURRENCES_URL,
+                json=payload,
+                headers={"Content-Type": "application/json"},
+                timeout=aiohttp.ClientTimeout(total=60),
+            ) as response:
+                response.raise_for_status()
+                data = orjson.loads(await response.read())
+
+            if isinstance(data, dict) and "Empty" in data:
+                break
+            if isinstance(data, list):
+                data = [rec for rec in data if isinstance(rec, dict)]
+            if not data:
+                break
+
+            all_records.extend(data)
+            await asyncio.sleep(1)  # Rate limiting: 1 request per second
+
+            if len(data) < TAKE_LIMIT:
+                break
+            skip += TAKE_LIMIT
+            retries = 0
+
+        except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
+            if retries < MAX_RETRIES:
+                retries += 1
+                headers = getattr(e, "headers", None)
+                wait_time = retry_wait(retries, headers.get("Retry-After") if headers else None)
+                tqdm.write(
+                    f"⚠️ Error fetching {species_id} in {country_code}, "
+                    f"retry {retries}/{MAX_RETRIES} in {wait_time:.1f}s..."
+                )
+                await asyncio.sleep(wait_time)
+                continue
+            else:
+                tqdm.write(
+                    f"❌ Skipping {species_id} in {country_code} "
+                    f"after {MAX_RETRIES} failed retries."
+                )
+                break
+
+    return all_records
+
+
+async def fetch_all_occurrences_async(
+    pairs: List[Tuple[Union[int, str], str]],
+    on_result: Callable[[Union[int, str], str, List[Dict]], None],
+    email: str,
+    password: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS
+):
+    """
+    Fetch every (species, country) pair concurrently with asyncio + aiohttp.
+    
+    Parameters
+    ----------
+    pairs : List[Tuple[Union[int, str], str]]
+        (species_id, country_code) combinations to query.
+    on_result : Callable
+        Called as on_result(species_id, country_code, records) as each pair
+        completes, always from the event loop thread.
+    email, password, start_date, end_date
+        As for fetch_occurrences.
+    max_workers : int, default=DEFAULT_MAX_WORKERS
+        Maximum number of requests in flight.
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+    connector = aiohttp.TCPConnector(limit=max_workers)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def fetch_pair(species_id, country_code):
+            async with semaphore:
+                records = await fetch_occurrences_async(
+                    session, species_id, country_code, email, password, start_date, end_date
+                )
+            return species_id, country_code, records
+
+        for next_done in asyncio.as_completed(
+            [fetch_pair(species_id, country_code) for species_id, country_code in pairs]
+        ):
+            on_result(*await next_done)
+
+
+def _run_async(coro):
+    """Run a coroutine from sync code, using a worker thread if a loop is already running (notebooks)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
 # =====================================================================================================
 # 4. DATA PROCESSING & STORAGE (Simplified for Fixed Columns)
 # =====================================================================================================
@@ -361,26 +577,27 @@ def create_initial_output_file(output_file: str) -> List[str]:
     Notes
     -----
     - Creates file only if it doesn't exist (safe for resume operations)
-    - Validates existing file by attempting to read header
+    - Validates existing file by reading its first line (no pandas involved)
     - Fixed schema prevents column drift across multiple runs
     
     File Structure
     --------------
     Creates CSV with headers but no data rows initially.
     """
-    if not os.path.exists(output_file):
-        # Create new file with header row only
-        header_df = pd.DataFrame(columns=BASE_OUTPUT_COLUMNS)
-        header_df.to_csv(output_file, index=False)
+    try:
+        # Create new file with header row only; mode "x" fails if it already
+        # exists, so no separate existence check is needed
+        with open(output_file, "x", newline="", encoding="utf-8") as f:
+            csv.writer(f, lineterminator="\n").writerow(BASE_OUTPUT_COLUMNS)
         print(
             f"✅ Created new output file '{output_file}' "
             f"with {len(BASE_OUTPUT_COLUMNS)} fixed fields."
         )
-    else:
+    except FileExistsError:
         try:
-            # Verify existing file is readable and has correct columns
-            existing_df = pd.read_csv(output_file, nrows=0)
-            existing_columns = list(existing_df.columns)
+            # Verify existing file has correct columns from its first line
+            with open(output_file, newline="", encoding="utf-8") as f:
+                existing_columns = next(csv.reader(f), [])
             
             # Check if columns match expected schema
             if existing_columns != BASE_OUTPUT_COLUMNS:
@@ -398,10 +615,31 @@ def create_initial_output_file(output_file: str) -> List[str]:
     return BASE_OUTPUT_COLUMNS
 
 
+def _map_record(species_id: Union[int, str], rec: Dict) -> Dict:
+    """
+    Map one raw API record onto the fixed output schema (BASE_OUTPUT_COLUMNS).
+    """
+    latitude, longitude = extract_coordinates(rec)
+    return {
+        "EASIN_ID": species_id,
+        "ScientificName": rec.get("SpeciesName"),
+        "Country": rec.get("CountryId"),
+        "Latitude": latitude,
+        "Longitude": longitude,
+        "DataPartner": rec.get("DataPartnerName") or rec.get("DataPartnerId"),
+        "Date": extract_best_observation_date(rec),
+        "ObservationId": rec.get("ObservationId"),
+        "Reference": rec.get("Reference"),
+        "ReferenceUrl": rec.get("Url"),
+        "Timestamp": rec.get("Timestamp")
+    }
+
+
 def save_records_to_csv(
     species_id: Union[int, str],
     species_records: List[Dict],
-    output_file: str
+    output_file: str,
+    pending: Optional[List[Dict]] = None
 ):
     """
     Process and append occurrence records to CSV file with explicit field mapping.
@@ -417,13 +655,17 @@ def save_records_to_csv(
         Raw occurrence records from API response.
     output_file : str
         Path to output CSV file.
+    pending : Optional[List[Dict]], default=None
+        Write buffer. If given, the formatted rows are added to it instead
+        of being written; flush_records appends the buffer to output_file.
     
     Notes
     -----
     - Explicit field mapping ensures data consistency
     - Handles missing/malformed data gracefully (None values)
-    - Deduplicates records before appending
+    - Deduplicates records on ObservationId (whole row if absent) before appending
     - Creates placeholder record if no occurrences exist (maintains species list)
+    - Rows are streamed with csv.DictWriter; no DataFrame is built per species
     
     Field Mapping
     -------------
@@ -448,31 +690,25 @@ def save_records_to_csv(
     formatted_records = []
 
     if species_records:
-        # Process each occurrence record
+        # Duplicates can occur from API pagination overlaps; keep the first.
+        # Records are keyed on ObservationId (checked before mapping), and on
+        # the whole mapped row only when they carry no ObservationId
+        seen_ids = set()
+        seen_rows = set()
         for rec in species_records:
             if isinstance(rec, dict):
-                # Extract geographic coordinates from WKT format
-                latitude, longitude = extract_coordinates(rec)
-                
-                # Get best available date (granular date or year)
-                observation_date = extract_best_observation_date(rec)
-                
-                # Explicit mapping from API fields to output schema
-                record_dict = {
-                    "EASIN_ID": species_id,
-                    "ScientificName": rec.get("SpeciesName"),
-                    "Country": rec.get("CountryId"),
-                    "Latitude": latitude,
-                    "Longitude": longitude,
-                    "DataPartner": rec.get("DataPartnerName") or rec.get("DataPartnerId"),
-                    "Date": observation_date,
-                    "ObservationId": rec.get("ObservationId"),
-                    "Reference": rec.get("Reference"),
-                    "ReferenceUrl": rec.get("Url"),
-                    "Timestamp": rec.get("Timestamp")
-                }
-                
-                formatted_records.append(record_dict)
+                observation_id = rec.get("ObservationId")
+                if observation_id is not None:
+                    if observation_id in seen_ids:
+                        continue
+                    seen_ids.add(observation_id)
+                    formatted_records.append(_map_record(species_id, rec))
+                    continue
+                record_dict = _map_record(species_id, rec)
+                key = tuple(record_dict.values())
+                if key not in seen_rows:
+                    seen_rows.add(key)
+                    formatted_records.append(record_dict)
             else:
                 # Warn about unexpected data types
                 tqdm.write(
@@ -484,14 +720,44 @@ def save_records_to_csv(
         placeholder["EASIN_ID"] = species_id
         formatted_records.append(placeholder)
 
-    # Convert to DataFrame with fixed column order
-    df = pd.DataFrame(formatted_records, columns=BASE_OUTPUT_COLUMNS)
-    
-    # Remove duplicate records (can occur from API pagination overlaps)
-    df.drop_duplicates(inplace=True)
+    if pending is not None:
+        pending.extend(formatted_records)
+        return
+
+    _append_rows(formatted_records, output_file)
+
+
+def flush_records(pending: List[Dict], output_file: Union[str, TextIO]):
+    """
+    Append buffered species records to the CSV file in a single write.
     
-    # Append to CSV (mode='a'), without writing header (header=False)
-    df.to_csv(output_file, mode="a", index=False, header=False)
+    Parameters
+    ----------
+    pending : List[Dict]
+        Write buffer filled by save_records_to_csv; emptied afterwards.
+    output_file : Union[str, TextIO]
+        Path to output CSV file, or a text handle already open for appending
+        (run_easin_fetcher keeps one open for the whole run).
+    """
+    if not pending:
+        return
+    _append_rows(pending, output_file)
+    pending.clear()
+
+
+def _append_rows(rows: List[Dict], output_file: Union[str, TextIO]):
+    """
+    Append output-schema rows to the CSV file (header is written at creation).
+    """
+    if not isinstance(output_file, str):
+        csv.DictWriter(
+            output_file, fieldnames=BASE_OUTPUT_COLUMNS, lineterminator="\n"
+        ).writerows(rows)
+        # Hand the rows to the OS now, so a crash mid-run cannot lose them
+        output_file.flush()
+        return
+    with open(output_file, "a", newline="", encoding="utf-8") as f:
+        csv.DictWriter(f, fieldnames=BASE_OUTPUT_COLUMNS, lineterminator="\n").writerows(rows)
 
 
 # =====================================================================================================
@@ -515,7 +781,11 @@ def get_processed_ids(output_file: str) -> Set[Union[int, str]]:
     Notes
     -----
     - Enables interrupted runs to resume without reprocessing
-    - Reads only EASIN_ID column for efficiency
+    - Reads the output_file + PROCESSED_SUFFIX sidecar (one ID per line) when
+      it exists next to the output file
+    - Otherwise streams the CSV with csv.reader, keeping only the EASIN_ID
+      column (memory scales with unique IDs, not rows)
+    - IDs are returned as strings, exactly as written to the file
     - Returns empty set if file doesn't exist or can't be read
     - Resume logic is bypassed when date filters are active (fresh data needed)
     
@@ -526,13 +796,29 @@ def get_processed_ids(output_file: str) -> Set[Union[int, str]]:
     >>> len(processed)
     42
     """
+    sidecar_file = output_file + PROCESSED_SUFFIX
+    if os.path.exists(output_file) and os.path.exists(sidecar_file):
+        with open(sidecar_file, encoding="utf-8") as f:
+            processed_ids = {line.strip() for line in f if line.strip()}
+        print(
+            f"ℹ️ Resuming: {len(processed_ids)} species already processed "
+            f"in {output_file}."
+        )
+        return processed_ids
+
     if os.path.exists(output_file):
         try:
-            # Read only EASIN_ID column for memory efficiency
-            existing_df = pd.read_csv(output_file, usecols=["EASIN_ID"])
-            
-            # Extract unique species IDs, excluding NaN values
-            processed_ids = set(existing_df["EASIN_ID"].dropna().unique())
+            with open(output_file, newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if not header or "EASIN_ID" not in header:
+                    raise ValueError("no 'EASIN_ID' column in header")
+                idx = header.index("EASIN_ID")
+                
+                # Unique species IDs; empty cells (missing IDs) are skipped
+                processed_ids = {
+                    row[idx] for row in reader if len(row) > idx and row[idx]
+                }
             
             print(
                 f"ℹ️ Resuming: {len(processed_ids)} species already processed "
@@ -548,12 +834,79 @@ def get_processed_ids(output_file: str) -> Set[Union[int, str]]:
     return set()
 
 
+@lru_cache(maxsize=4)
+def _read_species_ids(species_file: str, mtime: Optional[float]) -> Tuple:
+    """
+    Parse the unique EASIN IDs of a species file; memoized per (path, mtime).
+    """
+    species_df = pd.read_csv(species_file)
+    if "EASIN.ID" not in species_df.columns:
+        raise ValueError("❌ Species file missing 'EASIN.ID' column.")
+    return tuple(species_df["EASIN.ID"].dropna().unique())
+
+
+def load_species_ids(species_file: str) -> Tuple:
+    """
+    Load the unique EASIN IDs to process from the species list CSV.
+    
+    Parameters
+    ----------
+    species_file : str
+        Path to CSV containing species list with 'EASIN.ID' column.
+    
+    Returns
+    -------
+    Tuple
+        Unique, non-missing EASIN IDs in file order.
+    
+    Raises
+    ------
+    ValueError
+        If the species file lacks the 'EASIN.ID' column.
+    FileNotFoundError
+        If species_file doesn't exist.
+    
+    Notes
+    -----
+    The parsed IDs are cached keyed on the file's modification time, so
+    repeated runs in one process (e.g. resuming after an error) skip
+    re-parsing an unchanged species list, while edits are picked up.
+    """
+    try:
+        mtime = os.path.getmtime(species_file)
+    except OSError:
+        mtime = None
+    try:
+        return _read_species_ids(species_file, mtime)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"❌ CSV file '{species_file}' not found.")
+
+
+def append_processed_ids(sidecar_file: str, species_ids: List[Union[int, str]]):
+    """
+    Record species as processed in the resume sidecar file.
+    
+    Parameters
+    ----------
+    sidecar_file : str
+        Path to the sidecar (output_file + PROCESSED_SUFFIX).
+    species_ids : List[Union[int, str]]
+        EASIN_IDs whose rows have been written to the output file.
+    """
+    if not species_ids:
+        return
+    with open(sidecar_file, "a", encoding="utf-8") as f:
+        f.writelines(f"{species_id}\n" for species_id in species_ids)
+
+
 def run_easin_fetcher(
     species_file: str = default_species_file,
     output_file: str = default_ouput_file,
     countries: List[str] = EU_COUNTRIES,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    use_async: bool = False,
 ) -> int:
     """
     Main orchestration function for fetching EASIN occurrence data.
@@ -561,8 +914,8 @@ def run_easin_fetcher(
     Coordinates the complete data acquisition workflow:
     1. Initialize output file with fixed schema
     2. Load species list and authenticate with API
-    3. Iterate through species and countries with progress tracking
-    4. Fetch, process, and save occurrence data
+    3. Fetch all species-country combinations concurrently with progress tracking
+    4. Process and save each species' occurrences once all its countries are in
     5. Report summary statistics
     
     Parameters
@@ -577,6 +930,12 @@ def run_easin_fetcher(
         Start date filter (YYYY-MM-DD format). If None, no temporal filter.
     end_date : Optional[str], default=None
         End date filter (YYYY-MM-DD format). If None, no temporal filter.
+    max_workers : int, default=DEFAULT_MAX_WORKERS
+        Number of species-country requests sent to the API concurrently.
+    use_async : bool, default=False
+        Fetch on a single asyncio event loop with aiohttp instead of a
+        thread pool. Output and resume behaviour are identical. Works from
+        a running event loop too (e.g. a Jupyter cell), via a worker thread.
     
     Returns
     -------
@@ -592,10 +951,14 @@ def run_easin_fetcher(
     
     Notes
     -----
-    - Resume functionality automatically skips already-processed species
+    - Resume functionality automatically skips already-processed species,
+      tracked in an output_file + PROCESSED_SUFFIX sidecar after each flush
     - Resume is disabled when date filters are active (ensures fresh data)
-    - Progress bars show real-time status for species and countries
-    - Rate limiting: 0.5s between countries, 1s between species
+    - Progress bar shows real-time status per completed species
+    - Rate limiting: at most max_workers requests in flight, each worker
+      pausing 1s between pages
+    - Species are saved whole (countries in input order), so an interrupted
+      run never leaves a partially saved species behind
     - Gracefully handles API errors without stopping entire process
     
     Performance Considerations
@@ -623,28 +986,28 @@ def run_easin_fetcher(
     """
     start_time = time.time()
     
+    # A sidecar without its output file is stale (the CSV was removed)
+    sidecar_file = output_file + PROCESSED_SUFFIX
+    if not os.path.exists(output_file) and os.path.exists(sidecar_file):
+        os.remove(sidecar_file)
+
     # Initialize output file with fixed column schema
     output_columns = create_initial_output_file(output_file)
 
     # Retrieve API credentials from environment
     email, password = get_credentials()
 
-    # Load species list from CSV
+    # Load unique species IDs from CSV (cached while the file is unchanged)
     print(f"🔄 Loading species data from {species_file}...")
-    try:
-        species_df = pd.read_csv(species_file)
-        if "EASIN.ID" not in species_df.columns:
-            raise ValueError("❌ Species file missing 'EASIN.ID' column.")
-    except FileNotFoundError:
-        raise FileNotFoundError(f"❌ CSV file '{species_file}' not found.")
-
-    # Extract unique species IDs
-    easin_ids = species_df["EASIN.ID"].dropna().unique()
+    easin_ids = load_species_ids(species_file)
     print(f"🔍 Found {len(easin_ids)} unique species IDs to process.")
 
     # Check for already-processed species (resume functionality)
     # Note: Resume logic disabled when date filters are active
-    processed_ids = get_processed_ids(output_file)
+    processed_ids = frozenset(get_processed_ids(output_file))
+    if not os.path.exists(sidecar_file):
+        # First run with a sidecar: seed it from the CSV scan
+        append_processed_ids(sidecar_file, sorted(processed_ids))
     total_records_saved = 0
 
     # Display date filter information
@@ -655,52 +1018,109 @@ def run_easin_fetcher(
     )
     print(f"🔎 Date Filter: {date_filter_info}")
 
+    # Species still to fetch, filtered once before any request is scheduled
+    # (already-processed ones are only skipped when no date filters are active)
+    resume = not (start_date or end_date)
+    if resume and processed_ids:
+        pending_ids = [
+            species_id for species_id in easin_ids
+            if str(species_id) not in processed_ids
+        ]
+    else:
+        pending_ids = list(easin_ids)
+
     # Main processing loop with progress tracking
     species_progress = tqdm(
-        easin_ids,
+        total=len(easin_ids),
         desc="🦎 Processing species",
         unit="species",
-        colour="green"
+        colour="green",
+        # Redraw at most twice a second however fast species complete
+        mininterval=0.5
     )
+    species_progress.update(len(easin_ids) - len(pending_ids))
 
-    for species_id in species_progress:
-        # Skip if already processed (unless date filters are active)
-        if species_id in processed_ids and not (start_date or end_date):
-            species_progress.set_postfix({"Status": "Skipped", "Species": species_id})
-            continue
-
-        # Collect occurrences across all countries for this species
-        all_country_records = []
-        country_progress = tqdm(
-            countries,
-            desc=f"🌍 Countries for {species_id}",
-            leave=False,
-            colour="blue"
-        )
+    # Records per species, by country, until all its countries have returned
+    country_records = {species_id: {} for species_id in pending_ids}
+    # Formatted rows waiting to be written; flushed every FLUSH_EVERY rows
+    pending_rows = []
+    # Species with rows in pending_rows; recorded in the sidecar once flushed
+    pending_species = []
 
-        for country_code in country_progress:
-            country_progress.set_postfix({"Country": country_code})
-            
-            # Fetch occurrences for this species-country combination
-            country_records = fetch_occurrences(
-                species_id, country_code, email, password, start_date, end_date
-            )
-            all_country_records.extend(country_records)
-            
-            # Rate limiting between countries
-            time.sleep(0.5)
+    def flush_pending():
+        flush_records(pending_rows, out_fh)
+        append_processed_ids(sidecar_file, pending_species)
+        pending_species.clear()
+
+    def on_result(species_id, country_code, records):
+        nonlocal total_records_saved
+        species_countries = country_records[species_id]
+        species_countries[country_code] = records
+        if len(species_countries) < len(countries):
+            return
 
-        # Save all records for this species to CSV
+        # All countries fetched: buffer this species' records for the CSV
+        all_country_records = [
+            rec for code in countries for rec in species_countries[code]
+        ]
+        del country_records[species_id]
         records_in_batch = len(all_country_records)
-        save_records_to_csv(species_id, all_country_records, output_file)
+        save_records_to_csv(
+            species_id, all_country_records, output_file, pending=pending_rows
+        )
+        pending_species.append(species_id)
+        if len(pending_rows) >= FLUSH_EVERY:
+            flush_pending()
         total_records_saved += records_in_batch
 
         # Log progress
         tqdm.write(f"✅ Saved {records_in_batch} records for species {species_id}")
-        species_progress.set_postfix({"Status": "Saved", "Records": total_records_saved})
-        
-        # Rate limiting between species
-        time.sleep(1)
+        # The postfix is drawn with the next throttled refresh, not on every call
+        species_progress.set_postfix(
+            {"Status": "Saved", "Records": total_records_saved}, refresh=False
+        )
+        species_progress.update(1)
+
+    pairs = [
+        (species_id, country_code)
+        for species_id in pending_ids
+        for country_code in countries
+    ]
+
+    # Every species-country pair is independent: fan them out over a thread
+    # pool (or the event loop); only this thread writes to the output file,
+    # through one handle held open for the whole run. Buffered species are
+    # flushed even if the run is interrupted, so resume never loses them.
+    with open(output_file, "a", newline="", encoding="utf-8") as out_fh:
+        try:
+            if use_async:
+                _run_async(fetch_all_occurrences_async(
+                    pairs, on_result, email, password, start_date, end_date, max_workers
+                ))
+            else:
+                executor = ThreadPoolExecutor(max_workers=max_workers)
+                try:
+                    futures = {
+                        executor.submit(
+                            fetch_occurrences,
+                            species_id, country_code, email, password, start_date, end_date
+                        ): (species_id, country_code)
+                        for species_id, country_code in pairs
+                    }
+                    for future in as_completed(futures):
+                        # Drop each future once handled so its records can be
+                        # freed with the species, not kept until the run ends
+                        on_result(*futures.pop(future), future.result())
+                except BaseException:
+                    # Drop the queued pairs so Ctrl-C or an error stops the run
+                    # now instead of after every remaining request
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+                executor.shutdown()
+        finally:
+            flush_pending()
+
+    species_progress.close()
 
     # Calculate and display summary statistics
     elapsed_time = time.time() - start_time
@@ -1,9 +1,74 @@
 import re
+import functools
 import requests
+from diskcache import Cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 
 EU_CONCERN_URL = 'https://easin.jrc.ec.europa.eu/apixg/catxg/euconcern'
 
+# Retry rate limiting and transient server errors with exponential backoff;
+# the final response is returned for raise_for_status
+RETRY_STRATEGY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET"],
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# Shared session so repeated calls reuse a keep-alive connection to the API
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(max_retries=RETRY_STRATEGY))
+
+# On-disk cache of EASIN API responses (keyed by URL) so reruns skip the network.
+# Set EASIN_CACHE_DIR to None to disable caching.
+EASIN_CACHE_DIR = ".easin_cache"
+EASIN_CACHE_EXPIRE = 60 * 60 * 24  # 1 day
+
+# Parenthesised authorship, e.g. "Species E (Author, Year)"
+AUTHORSHIP_PATTERN = re.compile(r"\s*\(.*?\)")
+
+
+@functools.lru_cache(maxsize=None)
+def _open_cache(directory: str) -> Cache:
+    """Open (once per directory) the diskcache store backing the EASIN cache."""
+    return Cache(directory)
+
+
+def fetch_eu_concern_records(url: str = EU_CONCERN_URL) -> list[dict]:
+    """
+    GET the EASIN EU-concern endpoint and decode the JSON (disk-cached by URL).
+
+    Args:
+        url (str, optional): EASIN API URL for EU-concern species. Defaults to EU_CONCERN_URL.
+
+    Returns:
+        list[dict]: EU-concern species records as returned by the API.
+    """
+    cache = _open_cache(EASIN_CACHE_DIR) if EASIN_CACHE_DIR else None
+    if cache is not None:
+        records = cache.get(url)
+        if records is not None:
+            return records
+
+    response = SESSION.get(url)
+    response.raise_for_status()
+    records = response.json()
+    if cache is not None:
+        cache.set(url, records, expire=EASIN_CACHE_EXPIRE)
+    return records
+
+
+def normalize_species_name(name: str) -> str:
+    """Remove authorship of species and lowercase the name."""
+    return AUTHORSHIP_PATTERN.sub("", name or "").strip().lower()
+
 
 def fetch_easin_presence(
     input_csv: str,
@@ -24,28 +89,28 @@ def fetch_easin_presence(
             - rows: List of dicts, each representing a species-country presence entry.
             - missing_species: List of species from input that had no confirmed match in EASIN.
     """
-    # 1. Load CSV
-    species_df = pd.read_csv(input_csv)
-    lower_columns = {column.lower(): column for column in species_df.columns}
+    # 1. Load CSV (parsed in C by PyArrow; empty cells become nulls)
+    species_table = pa_csv.read_csv(
+        input_csv, convert_options=pa_csv.ConvertOptions(strings_can_be_null=True)
+    )
+    lower_columns = {column.lower(): column for column in species_table.column_names}
     species_column_name = lower_columns.get('scientific name') or lower_columns.get('scientific_name')
     if not species_column_name:
         raise KeyError("Input CSV needs a 'Scientific Name' or 'scientific_name' column")
     
-    species_list = sorted(species_df[species_column_name].str.strip())
+    species_names = species_table.column(species_column_name).cast(pa.string()).to_pylist()
+    species_list = sorted(name.strip() for name in species_names if name is not None)
 
-    # 2. Fetch EU concern species from API
-    response = requests.get(eu_concern_url)
-    response.raise_for_status()
-    api_records = response.json()
+    # 2. Fetch EU concern species from API (or the on-disk cache)
+    api_records = fetch_eu_concern_records(eu_concern_url)
 
-    # 3. Helper function to normalize species names
-    def normalize_species_name(name: str) -> str:
-        """Remove authorship of species and lowercase the name."""
-        return re.sub(r"\s*\(.*?\)", "", (name or "")).strip().lower()
+    # 3. Normalize every input name once, up front
+    normalized_names = [normalize_species_name(species) for species in species_list]
 
-    # 4. Build presence and record maps
-    presence_map: dict[str, set[str]] = {}
-    record_map: dict[str, dict] = {}
+    # 4. Index every normalized name (Name, EUConcernName, synonyms) to its
+    #    record and presence countries, so exact matches are a dict lookup.
+    #    The first record claiming a name keeps it.
+    name_index: dict[str, tuple[dict, set[str]]] = {}
 
     for record in api_records:
         present_countries = {
@@ -59,48 +124,52 @@ def fetch_easin_presence(
 
         for raw_name in name_keys:
             if isinstance(raw_name, str) and raw_name.strip():
-                normalized_name = normalize_species_name(raw_name)
-                presence_map[normalized_name] = present_countries
-                record_map.setdefault(normalized_name, record)
+                name_index.setdefault(normalize_species_name(raw_name), (record, present_countries))
 
     # 5. All countries observed across all species
-    all_countries = sorted({country for countries in presence_map.values() for country in countries})
+    all_countries = sorted({
+        country for _, countries in name_index.values() for country in countries
+    })
 
-    # 6. Assemble rows for CSV
-    rows: list[dict] = []
+    # 6. Resolve each species to its EASIN record and presence countries
+    easin_ids: list = []
+    species_presences: list[set[str]] = []
     missing_species: list[str] = []
 
-    for species in species_list:
-        normalized_species = normalize_species_name(species)
-        species_presence = presence_map.get(normalized_species, set())
-        species_record = record_map.get(normalized_species)
+    for species, normalized_species in zip(species_list, normalized_names):
+        species_record, species_presence = name_index.get(normalized_species, (None, set()))
 
         # Fallback to partial matches if exact match not found
         if not species_presence:
-            matching_candidates = [
-                (key, record)
-                for key, record in record_map.items()
-                if normalized_species in key or key in normalized_species
-            ]
-            if matching_candidates:
-                match_key, species_record = matching_candidates[0]
-                species_presence = presence_map[match_key]
+            match_key = next(
+                (key for key in name_index
+                 if normalized_species in key or key in normalized_species),
+                None
+            )
+            if match_key is not None:
+                species_record, species_presence = name_index[match_key]
             else:
                 missing_species.append(species)
 
-        easin_id = species_record.get('EASINID') if species_record else None
-
-        for country in all_countries:
-            rows.append({
-                'scientific_name': species,
-                'easin_id': easin_id,
-                'country': country,
-                'present': 'yes' if country in species_presence else 'no'
-            })
-
-    # 7. Save to CSV
-    pd.DataFrame(rows).to_csv(output_csv, index=False)
-    return rows, missing_species
+        easin_ids.append(species_record.get('EASINID') if species_record else None)
+        species_presences.append(species_presence)
+
+    # 7. Species x country presence matrix, flattened to one row per pair
+    country_index = {country: i for i, country in enumerate(all_countries)}
+    present = np.zeros((len(species_list), len(all_countries)), dtype=bool)
+    for i, species_presence in enumerate(species_presences):
+        present[i, [country_index[country] for country in species_presence]] = True
+
+    presence_df = pd.DataFrame({
+        'scientific_name': np.repeat(np.array(species_list, dtype=object), len(all_countries)),
+        'easin_id': np.repeat(np.array(easin_ids, dtype=object), len(all_countries)),
+        'country': np.tile(np.array(all_countries, dtype=object), len(species_list)),
+        'present': np.where(present.ravel(), 'yes', 'no')
+    })
+
+    # 8. Save to CSV
+    presence_df.to_csv(output_csv, index=False)
+    return presence_df.to_dict('records'), missing_species
 
 
 if __name__ == "__main__":
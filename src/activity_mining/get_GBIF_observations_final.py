@@ -2,10 +2,15 @@
 # It is designed to be a standalone, reusable application.
 
 # Import necessary libraries
+import csv
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import time
 import traceback
 import os
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pygbif import occurrences
 from datetime import datetime, timedelta
 
@@ -16,6 +21,12 @@ european_countries = [
     "IS", "LI", "NO", "CH", "GB", "AL", "BA", "ME", "MK", "RS", "XK"
 ]
 
+# Number of GBIF searches in flight at once (each worker still pauses 1s per page)
+DEFAULT_MAX_WORKERS = 8
+
+# GBIF search paging cannot go beyond this many records for one query
+MAX_RECORDS_PER_QUERY = 10000
+
 # --- Data Loading and Helper Functions ---
 def load_species_list(file_path):
     """
@@ -33,14 +44,21 @@ def load_species_list(file_path):
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Species list file not found: {file_path}")
     try:
-        species_df = pd.read_csv(file_path)
-        species_list = species_df["Scientific Name"].dropna().unique().tolist()
+        # Parse only the name column, in C; empty cells become nulls
+        convert_options = pa_csv.ConvertOptions(
+            include_columns=["Scientific Name"],
+            column_types={"Scientific Name": pa.string()},
+            strings_can_be_null=True
+        )
+        names = pa_csv.read_csv(file_path, convert_options=convert_options).column("Scientific Name")
+        # Unique names in file order, without missing values
+        species_list = list(dict.fromkeys(name for name in names.to_pylist() if name is not None))
         return species_list
     except Exception as e:
         print(f"Error loading species list from {file_path}: {e}")
         return []
 
-def fetch_records_from_gbif(species, country, start_date, end_date, filter_wild):
+def fetch_records_from_gbif(species, country, start_date, end_date, filter_wild, log=print):
     """
     Fetches records from the GBIF API, handling pagination and retries.
     
@@ -50,6 +68,9 @@ def fetch_records_from_gbif(species, country, start_date, end_date, filter_wild)
         start_date (str): The start date for the search (YYYY-MM-DD).
         end_date (str): The end date for the search (YYYY-MM-DD).
         filter_wild (bool): Whether to filter out cultivated records.
+        log (callable): Receives each progress message. Defaults to print,
+            which also shows a per-page counter; worker threads pass a
+            queue's put so the main thread prints the messages.
         
     Returns:
         list: A list of dictionaries, where each dictionary represents a record.
@@ -60,7 +81,7 @@ def fetch_records_from_gbif(species, country, start_date, end_date, filter_wild)
     all_records = []
     total_records = None
     
-    print(f"🔍 Fetching {species} in {country} for {event_date_range}...")
+    log(f"🔍 Fetching {species} in {country} for {event_date_range}...")
 
     while True:
         response = None
@@ -85,17 +106,17 @@ def fetch_records_from_gbif(species, country, start_date, end_date, filter_wild)
                     return all_records
                 
                 retries += 1
-                print(f"⚠️ Retry {retries}/{max_retries} failed for {species} in {country} at offset {offset}.")
-                traceback.print_exc()
+                log(f"⚠️ Retry {retries}/{max_retries} failed for {species} in {country} at offset {offset}.")
+                log(traceback.format_exc().rstrip())
                 time.sleep(2)
         
         if response is None:
-            print(f"❌ Skipping {species} in {country} at offset {offset} after {max_retries} retries.")
+            log(f"❌ Skipping {species} in {country} at offset {offset} after {max_retries} retries.")
             break
 
         if total_records is None:
             total_records = response.get("count", 0)
-            print(f"📊 Total available records: {total_records}")
+            log(f"📊 Total available records: {total_records}")
 
         records = response.get("results", [])
         if not records:
@@ -121,9 +142,12 @@ def fetch_records_from_gbif(species, country, start_date, end_date, filter_wild)
             
         offset += limit
 
-        print(f"📥 Fetched {len(all_records)}/{total_records} records...", end="\r")
+        if log is print:
+            print(f"📥 Fetched {len(all_records)}/{total_records} records...", end="\r")
 
-    print(f"\n✅ Finished fetching. Found {len(all_records)} records for {species} in {country}.")
+    if log is print:
+        print()  # End the per-page counter line
+    log(f"✅ Finished fetching. Found {len(all_records)} records for {species} in {country}.")
     return all_records
 
 def save_data_to_csv(data, output_file, header_written):
@@ -141,13 +165,69 @@ def save_data_to_csv(data, output_file, header_written):
         print(f"ℹ️ No data to save to {output_file}")
         return
     
-    df = pd.DataFrame(data)
-    df.to_csv(output_file, mode='a', index=False, header=not header_written)
-    print(f"✅ Saved {len(df)} records to {output_file}.")
+    # Rows are written straight from the record dicts (columns in record order),
+    # without building a DataFrame per batch
+    with open(output_file, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(data[0]), lineterminator='\n')
+        if not header_written:
+            writer.writeheader()
+        writer.writerows(data)
+    print(f"✅ Saved {len(data)} records to {output_file}.")
+
+def plan_date_windows(species, country, start_date, end_date, log=print):
+    """
+    Splits a species-country query into date windows GBIF can page through.
+    
+    Args:
+        species (str): The scientific name of the species.
+        country (str): The country code (e.g., 'US', 'DE').
+        start_date (str): The start date for the search (YYYY-MM-DD).
+        end_date (str): The end date for the search (YYYY-MM-DD).
+        log (callable): Receives progress messages (see fetch_records_from_gbif).
+        
+    Returns:
+        list: (start_date, end_date) string pairs; the whole range, or one per
+        month when the query matches more than MAX_RECORDS_PER_QUERY records.
+    """
+    # Fetch the total number of records first to decide if we need to split the request
+    initial_response = occurrences.search(
+        scientificName=species,
+        country=country,
+        eventDate=f"{start_date},{end_date}",
+        limit=1
+    )
+    total_estimated_records = initial_response.get("count", 0)
+
+    if total_estimated_records <= MAX_RECORDS_PER_QUERY:
+        return [(start_date, end_date)]
 
-def main():
+    # If there are too many records, split the request by month due to API limitations
+    log(f"⚠️ Large dataset detected in {country} for {species}: {total_estimated_records} records. Splitting by month...")
+    windows = []
+    current_date = datetime.strptime(start_date, "%Y-%m-%d")
+    end_date_dt = datetime.strptime(end_date, "%Y-%m-%d")
+
+    while current_date <= end_date_dt:
+        next_month = current_date + timedelta(days=32)
+        next_month = next_month.replace(day=1)
+        month_end = min(next_month - timedelta(days=1), end_date_dt)
+
+        windows.append((current_date.strftime("%Y-%m-%d"), month_end.strftime("%Y-%m-%d")))
+        current_date = next_month
+
+    return windows
+
+def main(max_workers=DEFAULT_MAX_WORKERS):
     """
     Main execution function to orchestrate the data fetching process.
+    
+    Species-country record counts, and then every (species, country, date
+    window) search, run concurrently on a thread pool; results are saved,
+    and worker messages printed, from the main thread only, as each search
+    completes. An error or Ctrl-C cancels the searches still queued.
+    
+    Args:
+        max_workers (int): Number of GBIF searches sent concurrently.
     """
     # Define parameters for the script
     species_file = "list_of_union_concern.csv" #define input file name
@@ -163,42 +243,47 @@ def main():
         print("No species found. Exiting.")
         return
 
-    #Fetch the total number of records first to decide if we need to split the request
-    for species in species_list:
-        for country in european_countries:
-            initial_response = occurrences.search(
-                scientificName=species,
-                country=country,
-                eventDate=f"{start_date},{end_date}",
-                limit=1
-            )
-            total_estimated_records = initial_response.get("count", 0)
+    pairs = [(species, country) for species in species_list for country in european_countries]
 
-            # If there are too many records, split the request by month due to API limitations
-            if total_estimated_records > 10000: 
-                print(f"⚠️ Large dataset detected in {country} for {species}: {total_estimated_records} records. Splitting by month...")
-                current_date = datetime.strptime(start_date, "%Y-%m-%d")
-                end_date_dt = datetime.strptime(end_date, "%Y-%m-%d")
-                
-                while current_date <= end_date_dt:
-                    next_month = current_date + timedelta(days=32)
-                    next_month = next_month.replace(day=1)
-                    month_end = min(next_month - timedelta(days=1), end_date_dt)
-                    
-                    current_start_str = current_date.strftime("%Y-%m-%d")
-                    current_end_str = month_end.strftime("%Y-%m-%d")
-                    
-                    records = fetch_records_from_gbif(species, country, current_start_str, current_end_str, filter_wild)
-                    if records:
-                        save_data_to_csv(records, output_file, header_written)
-                        header_written = True
-
-                    current_date = next_month
-            else:
-                records = fetch_records_from_gbif(species, country, start_date, end_date, filter_wild)
-                if records:
-                    save_data_to_csv(records, output_file, header_written)
-                    header_written = True
+    # Workers queue their messages; this thread prints them whole, in order
+    messages = queue.SimpleQueue()
+
+    def print_messages():
+        while not messages.empty():
+            print(messages.get())
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        # 1. Count records per species-country pair and split large ones by month
+        windows = executor.map(
+            lambda pair: plan_date_windows(*pair, start_date, end_date, log=messages.put), pairs
+        )
+
+        # 2. Fetch every window; only this thread appends to the output file
+        futures = {
+            executor.submit(
+                fetch_records_from_gbif, species, country, window_start, window_end, filter_wild,
+                log=messages.put
+            )
+            for (species, country), pair_windows in zip(pairs, windows)
+            for window_start, window_end in pair_windows
+        }
+        print_messages()
+        for future in as_completed(futures):
+            # Drop the future so its records are freed once saved to disk
+            futures.discard(future)
+            records = future.result()
+            print_messages()
+            if records:
+                save_data_to_csv(records, output_file, header_written)
+                header_written = True
+    except BaseException:
+        # Drop the queued searches so Ctrl-C or an error stops the run now
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        print_messages()
+    executor.shutdown()
 
 if __name__ == "__main__":
     main()
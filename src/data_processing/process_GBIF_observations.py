@@ -6,11 +6,19 @@
 # ==============================================================================
 
 import os
-from datetime import timedelta
+from datetime import datetime, timedelta
+from functools import lru_cache
 from dateutil import parser
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from tqdm import tqdm
 
+# Plain ISO dates/datetimes without a timezone ("2023-01-01", "2023-01-01T12:00",
+# "2023-01-01T12:00:00.5"): the bulk of GBIF eventDates, parsed identically by
+# pandas' vectorized ISO8601 parser and by dateutil
+ISO_EVENT_DATE_PATTERN = r"\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?"
+
 
 def parse_event_date(date_string):
     """
@@ -29,22 +37,48 @@ def parse_event_date(date_string):
     if pd.isna(date_string):
         return pd.NaT
 
-    date_string = str(date_string).strip()
+    return _parse_date_string(str(date_string).strip())
+
+
+def _parse_single_date(date_string):
+    """
+    Parse one date/datetime string to a timezone-naive datetime.
+
+    ISO 8601 strings ("YYYY-MM-DD...") take the C-level datetime.fromisoformat
+    fast path; anything else, or an ISO-looking string it rejects, falls back
+    to dateutil. Raises ValueError/OverflowError if neither can parse it.
+    """
+    dt = None
+    if len(date_string) >= 10 and date_string[4] == "-" and date_string[7] == "-":
+        try:
+            dt = datetime.fromisoformat(date_string)
+        except ValueError:
+            pass
+    if dt is None:
+        dt = parser.parse(date_string)
+
+    # Make the date timezone-naive
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(tz=None).replace(tzinfo=None)
+    return dt
+
 
+@lru_cache(maxsize=1_000_000)
+def _parse_date_string(date_string):
+    """
+    Parse a stripped, non-missing date string; memoized for parse_event_date.
+
+    GBIF exports repeat the same eventDate strings across many occurrences,
+    so each distinct string is only parsed once.
+    """
     # Handle date ranges (e.g., "2023-01-01/2023-01-02")
     if "/" in date_string:
         parts = date_string.split("/")
         if len(parts) != 2:
             return pd.NaT
         try:
-            start_date = parser.parse(parts[0].strip())
-            end_date = parser.parse(parts[1].strip())
-
-            # Make both dates timezone-naive
-            if start_date.tzinfo is not None:
-                start_date = start_date.astimezone(tz=None).replace(tzinfo=None)
-            if end_date.tzinfo is not None:
-                end_date = end_date.astimezone(tz=None).replace(tzinfo=None)
+            start_date = _parse_single_date(parts[0].strip())
+            end_date = _parse_single_date(parts[1].strip())
 
             # Accept only short ranges (<= 1 day)
             if (end_date - start_date) <= timedelta(hours=24):
@@ -55,14 +89,74 @@ def parse_event_date(date_string):
 
     # Handle single dates
     try:
-        dt = parser.parse(date_string)
-        if dt.tzinfo is not None:
-            dt = dt.astimezone(tz=None).replace(tzinfo=None)
-        return dt
+        return _parse_single_date(date_string)
     except Exception:
         return pd.NaT
 
 
+def parse_event_dates(event_dates):
+    """
+    Parse a column of eventDate strings; vectorized counterpart of parse_event_date.
+
+    Plain ISO dates are parsed in one pd.to_datetime pass. Only the rest
+    (date ranges, timezones, other formats) goes through parse_event_date
+    row by row, with a progress bar. Results are microsecond datetimes, so
+    dates outside the nanosecond range (before 1677) are kept.
+
+    Parameters
+    ----------
+    event_dates : pd.Series
+        Raw eventDate values; missing values are allowed.
+
+    Returns
+    -------
+    pd.Series
+        Timezone-naive datetimes aligned with the input index, NaT where
+        parsing fails.
+    """
+    text = event_dates.astype("string").str.strip()
+    is_iso = text.str.fullmatch(ISO_EVENT_DATE_PATTERN).fillna(False).astype(bool)
+
+    # Microsecond resolution holds every year a datetime can (1-9999), so
+    # historic or mistyped years ("1200-05-01", "0201-05-01") are kept like
+    # parse_event_date keeps them, instead of overflowing nanoseconds
+    parsed = pd.Series(pd.NaT, index=event_dates.index, dtype="datetime64[us]")
+    parsed[is_iso] = pd.to_datetime(
+        text[is_iso], format="ISO8601", errors="coerce"
+    ).astype("datetime64[us]")
+
+    # Everything else, plus ISO strings the vectorized parser could not
+    # represent (pandas versions that coerce out-of-ns-range dates to NaT)
+    others = parsed.isna() & event_dates.notna()
+    if others.any():
+        tqdm.pandas(desc="Parsing event dates")
+        parsed[others] = pd.to_datetime(
+            event_dates[others].progress_apply(parse_event_date), errors="coerce"
+        ).astype("datetime64[us]")
+    return parsed
+
+
+def write_csv_arrow(df, file_path):
+    """
+    Write a DataFrame to CSV with PyArrow's C writer (no index).
+
+    Values read back as from ``df.to_csv(file_path, index=False)``, but
+    Arrow quotes the header and every string cell, so the file is not
+    byte-identical to pandas' output.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame to save.
+    file_path : str
+        Output CSV path.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pa_csv.write_csv(
+        table, file_path, pa_csv.WriteOptions(quoting_style="needed")
+    )
+
+
 def process_gbif_data(input_file, output_file=None, failed_output_file=None,
                       start_date=None, end_date=None):
     """
@@ -120,8 +214,7 @@ def process_gbif_data(input_file, output_file=None, failed_output_file=None,
     df["raw_eventDate"] = df["eventDate"]
 
     print("\nParsing event dates...")
-    tqdm.pandas(desc="Parsing event dates")
-    df["parsed_eventDate"] = df["raw_eventDate"].progress_apply(parse_event_date)
+    df["parsed_eventDate"] = parse_event_dates(df["raw_eventDate"])
 
     success_count = df["parsed_eventDate"].notna().sum()
     fail_count = df["parsed_eventDate"].isna().sum()
@@ -150,33 +243,27 @@ def process_gbif_data(input_file, output_file=None, failed_output_file=None,
 
     print(f"\nCreating time series from {start_date.date()} to {end_date.date()}...")
 
-    # Aggregate and pivot
-    grouped = (
-        df_valid.groupby(["species", "country", "date_str"])
-        .size()
-        .reset_index(name="count")
+    # Count observations per species-country (rows) and day (columns) in one pass
+    counts = pd.crosstab(
+        [df_valid["species"], df_valid["country"]], df_valid["date_str"]
+    )
+
+    # Ensure all dates are represented, with columns in date order
+    all_dates = pd.date_range(start=start_date, end=end_date).strftime("%Y-%m-%d")
+    date_cols = sorted(set(counts.columns).union(all_dates))
+    counts = counts.reindex(columns=date_cols, fill_value=0)
+
+
+    # Flatten and rename columns
+    pivot = counts.reset_index().rename(
+        columns={"species": "Scientific Name", "country": "Country"}
     )
+    pivot.columns.name = None
 
-    pivot = grouped.pivot_table(
-        index=["species", "country"],
-        columns="date_str",
-        values="count",
-        fill_value=0,
-    ).reset_index()
-
-    # Ensure all dates are represented
-    all_dates = pd.date_range(start=start_date, end=end_date).strftime("%Y-%m-%d").tolist()
-    for date in all_dates:
-        if date not in pivot.columns:
-            pivot[date] = 0
-
-    # Sort and rename columns
-    static_cols = ["species", "country"]
-    date_cols = sorted([c for c in pivot.columns if c not in static_cols])
-    pivot = pivot[static_cols + date_cols]
-    pivot.rename(columns={"species": "Scientific Name", "country": "Country"}, inplace=True)
-
-    pivot.to_csv(output_file, index=False)
+    # The pivot is wide (one column per day): write it in C rather than
+    # through pandas' Python-level CSV formatter (string cells and the header
+    # come out quoted; see write_csv_arrow)
+    write_csv_arrow(pivot, output_file)
     print(f"\nProcessed dataset saved to: {output_file}")
 
     return pivot
@@ -1,11 +1,78 @@
 import pandas as pd
 import os
+import csv
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urlparse
 import time
 import random
-from typing import List, Optional, Dict
+import asyncio
+import threading
+import aiohttp
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, List, Optional, Dict, AbstractSet
 
+# Images are streamed to disk in chunks of this many bytes
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Pause (seconds) for all async downloads after a 429 without Retry-After,
+# and how many times a rate-limited photo is retried
+RATE_LIMIT_PAUSE = 30.0
+RATE_LIMIT_RETRIES = 3
+
+
+def retry_after_seconds(value: Optional[str], default: float = RATE_LIMIT_PAUSE) -> float:
+    """
+    Convert a Retry-After header value to a pause in seconds.
+    
+    Args:
+        value: Header value, either delay-seconds ("120") or an HTTP-date
+            ("Wed, 21 Oct 2015 07:28:00 GMT"); may be None
+        default: Pause used when the header is missing or unparseable
+        
+    Returns:
+        Non-negative number of seconds to wait
+    """
+    if value is None:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def _run_async(coro):
+    """Run a coroutine from sync code, using a worker thread if a loop is already running (notebooks)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+# Columns of the master metadata CSV, in file order
+METADATA_COLUMNS = [
+    'photo_id', 'scientific_name', 'latitude', 'longitude', 'local_folder', 'local_path'
+]
+
+# Retry transient CDN failures and rate limiting with a short backoff;
+# the final response is returned for raise_for_status
+RETRY_STRATEGY = Retry(
+    total=3,
+    backoff_factor=0.2,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET"],
+    raise_on_status=False
+)
 
 class FlickrImageDownloader:
     """
@@ -16,7 +83,8 @@ class FlickrImageDownloader:
         self, 
         csv_path: str,
         base_output_dir: str = "PlantNet_Batch_Images",
-        master_metadata_file: Optional[str] = None
+        master_metadata_file: Optional[str] = None,
+        max_workers: int = 16
     ):
         """
         Initialize the downloader.
@@ -25,20 +93,48 @@ class FlickrImageDownloader:
             csv_path: Path to the CSV file containing observations
             base_output_dir: Directory where images will be saved
             master_metadata_file: Path to master metadata CSV (optional)
+            max_workers: Number of images downloaded in parallel. Request
+                starts stay spaced by the min_sleep/max_sleep pause across
+                all workers, so more workers do not raise the request rate.
         """
         self.df = pd.read_csv(csv_path)
         self.base_output_dir = base_output_dir
         self.master_metadata_file = master_metadata_file or os.path.join(
             base_output_dir, "master_observations_metadata.csv"
         )
-        self.metadata_list = []
+        # Every metadata row is also appended to this journal as it is
+        # produced, so a run that dies before save_metadata keeps its rows;
+        # rows left by such a run are picked up again here
+        self.metadata_journal_file = self.master_metadata_file + ".partial"
+        self._journal_fh = None
+        self._journal_writer = None
+        self.metadata_list = self._read_metadata_journal()
+        self.max_workers = max_workers
+        # Download threads append to metadata_list (and the journal) concurrently
+        self._metadata_lock = threading.Lock()
+        # Photo IDs downloaded (or being downloaded) by this downloader, so a
+        # photo listed twice is fetched once even if its folder is new
+        self._claimed_photo_ids = set()
+        self._claim_lock = threading.Lock()
+        # Earliest time (time.monotonic) the next download may start
+        self._next_download_at = 0.0
+        self._rate_lock = threading.Lock()
+        # Shared session so download threads reuse keep-alive connections;
+        # one pooled connection per worker
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=max_workers, pool_maxsize=max_workers,
+            max_retries=RETRY_STRATEGY
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         
         # Create base directory if it doesn't exist
         if not os.path.exists(self.base_output_dir):
             os.makedirs(self.base_output_dir)
             print(f"Created base directory: {self.base_output_dir}")
     
-    def get_processed_species(self, processed_csv_path: Optional[str] = None) -> set:
+    def get_processed_species(self, processed_csv_path: Optional[str] = None) -> frozenset:
         """
         Get list of already processed species from a CSV file.
         
@@ -46,16 +142,75 @@ class FlickrImageDownloader:
             processed_csv_path: Path to CSV containing processed species
             
         Returns:
-            Set of processed species names
+            Frozenset of processed species names
         """
         if processed_csv_path and os.path.exists(processed_csv_path):
             try:
-                processed_df = pd.read_csv(processed_csv_path)
+                # Parse only the species column (a callable keeps a missing
+                # column from raising)
+                processed_df = pd.read_csv(
+                    processed_csv_path,
+                    usecols=lambda column: column == 'scientific_name',
+                    dtype={'scientific_name': 'string'}
+                )
                 if 'scientific_name' in processed_df.columns:
-                    return set(processed_df['scientific_name'].unique())
+                    return frozenset(processed_df['scientific_name'].dropna())
             except Exception as e:
                 print(f"Warning: Could not read processed species from {processed_csv_path}: {e}")
-        return set()
+        return frozenset()
+    
+    def _read_metadata_journal(self) -> List[Dict[str, str]]:
+        """
+        Load the metadata rows journaled by a run that never saved them.
+        
+        Returns:
+            List of metadata rows (empty if there is no journal)
+        """
+        try:
+            with open(self.metadata_journal_file, newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+        except FileNotFoundError:
+            return []
+        if rows:
+            print(f"Recovered {len(rows)} unsaved metadata rows from {self.metadata_journal_file}")
+        return rows
+    
+    def _journal_metadata_row(self, entry: Dict[str, Any]) -> None:
+        """
+        Append one metadata row to the journal and flush it (call under _metadata_lock).
+        
+        Args:
+            entry: Metadata row (see METADATA_COLUMNS)
+        """
+        if self._journal_fh is None:
+            new_file = not os.path.exists(self.metadata_journal_file)
+            self._journal_fh = open(self.metadata_journal_file, 'a', newline='', encoding='utf-8')
+            self._journal_writer = csv.DictWriter(self._journal_fh, fieldnames=METADATA_COLUMNS)
+            if new_file:
+                self._journal_writer.writeheader()
+        self._journal_writer.writerow(entry)
+        self._journal_fh.flush()
+    
+    def _close_metadata_journal(self) -> None:
+        """Close the journal file handle; it is reopened on the next row."""
+        with self._metadata_lock:
+            if self._journal_fh is not None:
+                self._journal_fh.close()
+                self._journal_fh = self._journal_writer = None
+    
+    def list_existing_folders(self) -> frozenset:
+        """
+        Snapshot the observation folders already present in base_output_dir.
+        
+        One directory listing replaces two exists() checks per photo.
+        
+        Returns:
+            Frozenset of folder names (photo IDs)
+        """
+        try:
+            return frozenset(os.listdir(self.base_output_dir))
+        except FileNotFoundError:
+            return frozenset()
     
     def filter_species_data(self, species_name: str) -> pd.DataFrame:
         """
@@ -71,31 +226,37 @@ class FlickrImageDownloader:
         species_df.dropna(subset=['url'], inplace=True)
         return species_df
     
-    def download_image(
-        self, 
-        url: str, 
-        photo_id: str, 
-        row: pd.Series,
-        min_sleep: float = 0.5,
-        max_sleep: float = 2.0
-    ) -> bool:
+    def _prepare_image_path(
+        self,
+        url: str,
+        photo_id: str,
+        existing_folders: Optional[AbstractSet[str]] = None
+    ) -> Optional[str]:
         """
-        Download a single image and save metadata.
+        Create the observation folder if needed and work out the image path.
         
         Args:
-            url: Image URL
+            url: Image URL (its extension is reused, defaulting to .jpg)
             photo_id: Unique photo identifier
-            row: DataFrame row containing observation data
-            min_sleep: Minimum sleep time between downloads
-            max_sleep: Maximum sleep time between downloads
+            existing_folders: Snapshot from list_existing_folders (optional)
             
         Returns:
-            True if successful, False otherwise
+            Path to write the image to, or None if it was already downloaded
         """
+        with self._claim_lock:
+            if photo_id in self._claimed_photo_ids:
+                print(f"  ⚠️ Skipping ID: {photo_id}. File already exists.")
+                return None
+            self._claimed_photo_ids.add(photo_id)
+        
         observation_folder = os.path.join(self.base_output_dir, photo_id)
         
-        if not os.path.exists(observation_folder):
-            os.makedirs(observation_folder)
+        if existing_folders is None:
+            folder_exists = os.path.exists(observation_folder)
+        else:
+            folder_exists = photo_id in existing_folders
+        if not folder_exists:
+            os.makedirs(observation_folder, exist_ok=True)
         
         # Determine file extension
         path = urlparse(url).path
@@ -105,60 +266,146 @@ class FlickrImageDownloader:
         
         file_path = os.path.join(observation_folder, f"{photo_id}{ext}")
         
-        # Skip if already exists
-        if os.path.exists(file_path):
+        # Skip if already exists (a new folder cannot hold the file yet)
+        if folder_exists and os.path.exists(file_path):
             print(f"  ⚠️ Skipping ID: {photo_id}. File already exists.")
-            return False
+            return None
+        return file_path
+    
+    def _reserve_download_slot(self, min_sleep: float, max_sleep: float) -> float:
+        """
+        Reserve the next download start shared by all workers.
         
-        try:
-            # Download image
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
+        Consecutive starts are spaced by a random pause, as one download
+        after another used to be, so parallel workers only overlap latency.
+        
+        Args:
+            min_sleep: Minimum pause between download starts
+            max_sleep: Maximum pause between download starts
             
-            # Add metadata
-            self.metadata_list.append({
-                'photo_id': photo_id,
-                'scientific_name': row['scientific_name'],
-                'latitude': row['latitude'],
-                'longitude': row['longitude'],
-                'local_folder': photo_id,
-                'local_path': file_path
-            })
-            print(f"  ✅ Saved image and metadata for ID: {photo_id}")
+        Returns:
+            Seconds to wait before starting the download
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            start = max(now, self._next_download_at)
+            self._next_download_at = start + random.uniform(min_sleep, max_sleep)
+        return start - now
+    
+    def _release_photo_id(self, photo_id: str) -> None:
+        """
+        Forget a claimed photo whose download failed, so it can be retried.
+        
+        Args:
+            photo_id: Unique photo identifier
+        """
+        with self._claim_lock:
+            self._claimed_photo_ids.discard(photo_id)
+    
+    def _add_metadata(self, photo_id: str, row: Any, file_path: str) -> None:
+        """
+        Record the metadata of a downloaded image.
+        
+        Args:
+            photo_id: Unique photo identifier
+            row: Observation row (see download_image)
+            file_path: Where the image was saved
+        """
+        entry = {
+            'photo_id': photo_id,
+            'scientific_name': row.scientific_name,
+            'latitude': row.latitude,
+            'longitude': row.longitude,
+            'local_folder': photo_id,
+            'local_path': file_path
+        }
+        with self._metadata_lock:
+            self.metadata_list.append(entry)
+            self._journal_metadata_row(entry)
+        print(f"  ✅ Saved image and metadata for ID: {photo_id}")
+    
+    def download_image(
+        self, 
+        url: str, 
+        photo_id: str, 
+        row: Any,
+        min_sleep: float = 0.5,
+        max_sleep: float = 2.0,
+        existing_folders: Optional[AbstractSet[str]] = None
+    ) -> bool:
+        """
+        Download a single image and save metadata.
+        
+        Args:
+            url: Image URL
+            photo_id: Unique photo identifier
+            row: Observation row with scientific_name, latitude and longitude
+                attributes (an itertuples namedtuple or a pd.Series)
+            min_sleep: Minimum sleep time between downloads
+            max_sleep: Maximum sleep time between downloads
+            existing_folders: Snapshot of the entries in base_output_dir
+                (see list_existing_folders). Photos without a folder in it
+                are downloaded without touching the file system first.
             
-            # Random sleep to avoid overwhelming server
-            sleep_time = random.uniform(min_sleep, max_sleep)
-            time.sleep(sleep_time)
-            print(f"   💤 Pausing for {sleep_time:.2f} seconds...")
+        Returns:
+            True if successful, False otherwise
+        """
+        file_path = self._prepare_image_path(url, photo_id, existing_folders)
+        if file_path is None:
+            return False
+        
+        # Random pause to avoid overwhelming server (shared by all workers)
+        pause = self._reserve_download_slot(min_sleep, max_sleep)
+        if pause > 0:
+            print(f"   💤 Pausing for {pause:.2f} seconds...")
+            time.sleep(pause)
+        
+        try:
+            # Stream image to disk without holding the whole body in memory
+            with self.session.get(url, stream=True, timeout=10) as response:
+                response.raise_for_status()
+                try:
+                    with open(file_path, 'wb') as f:
+                        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                except BaseException:
+                    # Don't leave a truncated image that a rerun would skip
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                    raise
             
+            self._add_metadata(photo_id, row, file_path)
             return True
             
         except requests.exceptions.RequestException as e:
             print(f"  ❌ Failed to download {url}. Error: {e}")
+            self._release_photo_id(photo_id)
             return False
         except Exception as e:
             print(f"  ❌ An unexpected error occurred for ID {photo_id}. Error: {e}")
+            self._release_photo_id(photo_id)
             return False
     
-    def process_species(
-        self, 
+    def _submit_species(
+        self,
+        executor: ThreadPoolExecutor,
         species_name: str,
-        min_sleep: float = 0.5,
-        max_sleep: float = 2.0
-    ) -> int:
+        min_sleep: float,
+        max_sleep: float,
+        existing_folders: AbstractSet[str]
+    ) -> List[Future]:
         """
-        Process all observations for a single species.
+        Queue downloads for all observations of a species on an executor.
         
         Args:
+            executor: Thread pool running the downloads
             species_name: Scientific name of the species
             min_sleep: Minimum sleep time between downloads
             max_sleep: Maximum sleep time between downloads
+            existing_folders: Snapshot from list_existing_folders
             
         Returns:
-            Number of successfully downloaded images
+            Futures resolving to download_image's success flag
         """
         print("\n" + "="*50)
         print(f"**Starting processing for species: {species_name}**")
@@ -167,17 +414,63 @@ class FlickrImageDownloader:
         species_df = self.filter_species_data(species_name)
         print(f"Processing {len(species_df)} observations for {species_name}...")
         
-        success_count = 0
-        for index, row in species_df.iterrows():
-            url = row['url']
-            photo_id = str(row['photo_id'])
+        return [
+            executor.submit(
+                self.download_image, row.url, str(row.photo_id), row,
+                min_sleep, max_sleep, existing_folders=existing_folders
+            )
+            # Namedtuples are much cheaper to build than iterrows' Series
+            for row in species_df.itertuples(index=False)
+        ]
+    
+    def process_species(
+        self, 
+        species_name: str,
+        min_sleep: float = 0.5,
+        max_sleep: float = 2.0
+    ) -> int:
+        """
+        Process all observations for a single species.
+        
+        Args:
+            species_name: Scientific name of the species
+            min_sleep: Minimum sleep time between downloads
+            max_sleep: Maximum sleep time between downloads
             
-            if self.download_image(url, photo_id, row, min_sleep, max_sleep):
-                success_count += 1
+        Returns:
+            Number of successfully downloaded images
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = self._submit_species(
+                executor, species_name, min_sleep, max_sleep, self.list_existing_folders()
+            )
+            success_count = sum(future.result() for future in as_completed(futures))
         
         print(f"\nCompleted {species_name}: {success_count} images downloaded")
         return success_count
     
+    def _load_processed_species(
+        self, skip_processed: bool, processed_csv_path: Optional[str]
+    ) -> frozenset:
+        """
+        Read the processed-species CSV once; each species is then an O(1) lookup.
+        
+        Args:
+            skip_processed: Whether already processed species are skipped
+            processed_csv_path: Path to CSV with processed species
+            
+        Returns:
+            Frozenset of species to skip (empty if skip_processed is False)
+        """
+        if not skip_processed:
+            return frozenset()
+        processed_species = frozenset(self.get_processed_species(processed_csv_path))
+        if processed_species:
+            print(f"Found {len(processed_species)} already processed species:")
+            for sp in processed_species:
+                print(f"  - {sp}")
+        return processed_species
+    
     def process_species_list(
         self,
         species_list: List[str],
@@ -199,51 +492,279 @@ class FlickrImageDownloader:
         Returns:
             Dictionary with species names and download counts
         """
-        processed_species = set()
-        if skip_processed:
-            processed_species = self.get_processed_species(processed_csv_path)
-            if processed_species:
-                print(f"Found {len(processed_species)} already processed species:")
-                for sp in processed_species:
-                    print(f"  - {sp}")
+        processed_species = self._load_processed_species(skip_processed, processed_csv_path)
         
+        existing_folders = self.list_existing_folders()
         results = {}
-        for species_name in species_list:
-            if species_name in processed_species:
-                print(f"\n⏭️ Skipping {species_name} (already processed)")
+        future_to_species = {}
+        # One pool for the whole list: the next species is looked up and queued
+        # while earlier species are still downloading
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for species_name in species_list:
+                if species_name in processed_species:
+                    print(f"\n⏭️ Skipping {species_name} (already processed)")
+                    results[species_name] = 0
+                    continue
+                
                 results[species_name] = 0
-                continue
+                futures = self._submit_species(
+                    executor, species_name, min_sleep, max_sleep, existing_folders
+                )
+                for future in futures:
+                    future_to_species[future] = species_name
             
-            count = self.process_species(species_name, min_sleep, max_sleep)
-            results[species_name] = count
+            try:
+                for future in as_completed(future_to_species):
+                    if future.result():
+                        results[future_to_species[future]] += 1
+            finally:
+                self.close()
+        
+        for species_name in dict.fromkeys(future_to_species.values()):
+            print(f"\nCompleted {species_name}: {results[species_name]} images downloaded")
         
         return results
     
-    def save_metadata(self, append: bool = False) -> None:
+    async def _async_download_image(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        resume: asyncio.Event,
+        url: str,
+        photo_id: str,
+        row: Any,
+        min_sleep: float,
+        max_sleep: float,
+        existing_folders: AbstractSet[str]
+    ) -> bool:
+        """
+        Download a single image on the event loop; async twin of download_image.
+        
+        A 429 response pauses every download (via the shared resume event)
+        for the Retry-After delay before the photo is retried.
+        
+        Args:
+            session: Shared aiohttp session
+            semaphore: Caps the number of downloads in flight
+            resume: Set while downloads may proceed, cleared during a 429 pause
+            url: Image URL
+            photo_id: Unique photo identifier
+            row: Observation row (see download_image)
+            min_sleep: Minimum sleep time between downloads
+            max_sleep: Maximum sleep time between downloads
+            existing_folders: Snapshot from list_existing_folders
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        file_path = self._prepare_image_path(url, photo_id, existing_folders)
+        if file_path is None:
+            return False
+        
+        async with semaphore:
+            # Random pause to avoid overwhelming server (shared by all downloads)
+            await asyncio.sleep(self._reserve_download_slot(min_sleep, max_sleep))
+            try:
+                for attempt in range(RATE_LIMIT_RETRIES + 1):
+                    await resume.wait()
+                    async with session.get(url) as response:
+                        if response.status == 429 and attempt < RATE_LIMIT_RETRIES:
+                            if resume.is_set():
+                                pause = retry_after_seconds(response.headers.get('Retry-After'))
+                                resume.clear()
+                                try:
+                                    print(f"  ⏸️ Rate limited, pausing downloads for {pause:.0f} seconds...")
+                                    await asyncio.sleep(pause)
+                                finally:
+                                    resume.set()
+                            continue
+                        response.raise_for_status()
+                        try:
+                            with open(file_path, 'wb') as f:
+                                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                                    f.write(chunk)
+                        except BaseException:
+                            # Don't leave a truncated image that a rerun would skip
+                            if os.path.exists(file_path):
+                                os.remove(file_path)
+                            raise
+                        break
+                
+                self._add_metadata(photo_id, row, file_path)
+                return True
+            
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"  ❌ Failed to download {url}. Error: {e}")
+                self._release_photo_id(photo_id)
+                return False
+            except Exception as e:
+                print(f"  ❌ An unexpected error occurred for ID {photo_id}. Error: {e}")
+                self._release_photo_id(photo_id)
+                return False
+    
+    async def _process_species_list_async(
+        self,
+        species_list: List[str],
+        processed_species: frozenset,
+        min_sleep: float,
+        max_sleep: float
+    ) -> Dict[str, int]:
+        """
+        Download all photos of the given species concurrently on one event loop.
+        
+        Args:
+            species_list: List of species to process
+            processed_species: Species to skip
+            min_sleep: Minimum sleep time between downloads
+            max_sleep: Maximum sleep time between downloads
+            
+        Returns:
+            Dictionary with species names and download counts
+        """
+        existing_folders = self.list_existing_folders()
+        semaphore = asyncio.Semaphore(self.max_workers)
+        resume = asyncio.Event()
+        resume.set()
+        
+        results = {}
+        tasks = []
+        task_species = []
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=10)
+        connector = aiohttp.TCPConnector(limit=self.max_workers)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            for species_name in species_list:
+                results[species_name] = 0
+                if species_name in processed_species:
+                    print(f"\n⏭️ Skipping {species_name} (already processed)")
+                    continue
+                
+                species_df = self.filter_species_data(species_name)
+                print(f"Processing {len(species_df)} observations for {species_name}...")
+                for row in species_df.itertuples(index=False):
+                    tasks.append(self._async_download_image(
+                        session, semaphore, resume, row.url, str(row.photo_id), row,
+                        min_sleep, max_sleep, existing_folders
+                    ))
+                    task_species.append(species_name)
+            
+            downloaded = await asyncio.gather(*tasks)
+        
+        for species_name, success in zip(task_species, downloaded):
+            results[species_name] += success
+        for species_name in dict.fromkeys(task_species):
+            print(f"\nCompleted {species_name}: {results[species_name]} images downloaded")
+        return results
+    
+    def async_process_species_list(
+        self,
+        species_list: List[str],
+        skip_processed: bool = True,
+        processed_csv_path: Optional[str] = None,
+        min_sleep: float = 0.5,
+        max_sleep: float = 2.0
+    ) -> Dict[str, int]:
+        """
+        Process multiple species with asyncio + aiohttp instead of threads.
+        
+        Same arguments and result as process_species_list; at most
+        max_workers downloads are in flight, all on a single event loop.
+        Runs its own event loop, on a worker thread when called from a
+        running one (e.g. a Jupyter cell).
+        
+        Args:
+            species_list: List of species to process
+            skip_processed: Whether to skip already processed species
+            processed_csv_path: Path to CSV with processed species
+            min_sleep: Minimum sleep time between downloads
+            max_sleep: Maximum sleep time between downloads
+            
+        Returns:
+            Dictionary with species names and download counts
+        """
+        processed_species = self._load_processed_species(skip_processed, processed_csv_path)
+        return _run_async(self._process_species_list_async(
+            species_list, processed_species, min_sleep, max_sleep
+        ))
+    
+    def close(self) -> None:
+        """
+        Close pooled HTTP connections and the metadata journal. The
+        downloader can still be used afterwards; both are reopened on demand.
+        """
+        self.session.close()
+        self._close_metadata_journal()
+    
+    def save_metadata(self, append: bool = False, dedupe: bool = False) -> None:
         """
         Save metadata to CSV file.
         
+        Rows are streamed straight from metadata_list with csv.DictWriter;
+        appending only writes the new rows to the end of the existing file.
+        The file is read back with pandas only when dedupe is requested.
+        Once saved, the run's metadata journal is removed.
+        
         Args:
             append: Whether to append to existing file
+            dedupe: Whether to drop rows with a photo_id already in the
+                existing file when appending (keeps the newest row)
         """
+        self._close_metadata_journal()
         if not self.metadata_list:
             print("\nNo new images were downloaded, so no metadata file was updated.")
+            self._remove_metadata_journal()
             return
         
-        master_metadata_df = pd.DataFrame(self.metadata_list)
-        
         if append and os.path.exists(self.master_metadata_file):
+            if not dedupe:
+                self._write_metadata_rows(mode='a', header=False)
+                self._remove_metadata_journal()
+                print(f"\nSuccessfully appended metadata to: **{self.master_metadata_file}**")
+                print(f"New records: {len(self.metadata_list)}")
+                return
+            
             try:
                 existing_df = pd.read_csv(self.master_metadata_file)
-                master_metadata_df = pd.concat([existing_df, master_metadata_df], ignore_index=True)
+                master_metadata_df = pd.concat(
+                    [existing_df, pd.DataFrame(self.metadata_list)], ignore_index=True
+                )
+                master_metadata_df = master_metadata_df[
+                    ~master_metadata_df['photo_id'].astype(str).duplicated(keep='last')
+                ]
                 print(f"Appending to existing metadata file...")
+                master_metadata_df.to_csv(self.master_metadata_file, index=False)
+                self._remove_metadata_journal()
+                print(f"\nSuccessfully saved metadata to: **{self.master_metadata_file}**")
+                print(f"Total records: {len(master_metadata_df)}")
+                return
             except Exception as e:
                 print(f"Warning: Could not read existing metadata file: {e}")
                 print(f"Creating new metadata file instead...")
         
-        master_metadata_df.to_csv(self.master_metadata_file, index=False)
+        self._write_metadata_rows(mode='w', header=True)
+        self._remove_metadata_journal()
         print(f"\nSuccessfully saved metadata to: **{self.master_metadata_file}**")
-        print(f"Total records: {len(master_metadata_df)}")
+        print(f"Total records: {len(self.metadata_list)}")
+    
+    def _remove_metadata_journal(self) -> None:
+        """Delete the metadata journal once its rows are in the master file."""
+        try:
+            os.remove(self.metadata_journal_file)
+        except FileNotFoundError:
+            pass
+    
+    def _write_metadata_rows(self, mode: str, header: bool) -> None:
+        """
+        Write metadata_list to the master metadata CSV without building a DataFrame.
+        
+        Args:
+            mode: File mode, 'w' to overwrite or 'a' to append
+            header: Whether to write the header row first
+        """
+        with open(self.master_metadata_file, mode, newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=METADATA_COLUMNS)
+            if header:
+                writer.writeheader()
+            writer.writerows(self.metadata_list)
 
 
 # Convenience function for quick usage
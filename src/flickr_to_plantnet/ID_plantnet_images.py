@@ -8,12 +8,26 @@ where the expected species ranks first in the API response.
 
 import requests
 import json
+import logging
+import orjson
 import os
 import csv
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from typing import Dict, List, Tuple, Optional, Sequence, Union
 from dotenv import load_dotenv
 
+# Per-observation progress is logged at DEBUG level and failed API calls as
+# warnings; handlers and levels are left to the application, e.g.
+# logging.basicConfig(level=logging.DEBUG) to see every observation.
+logger = logging.getLogger(__name__)
+
+# PlantNet accepts up to 5 images of the same plant in one identification request
+MAX_IMAGES_PER_REQUEST = 5
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
 
 class PlantNetConfig:
     """Configuration container for PlantNet API processing."""
@@ -31,7 +45,7 @@ class PlantNetConfig:
             base_dir: Directory containing observation folders
             api_key: PlantNet API key (uses .env if not provided)
             metadata_file: Path to metadata CSV (defaults to base_dir/master_observations_metadata.csv)
-            output_summary_file: Path for summary results CSV
+            output_summary_file: Path for summary results CSV (a .parquet path writes Parquet instead)
             output_high_fidelity_file: Path for high-fidelity results CSV
         """
         self.base_dir = base_dir
@@ -49,7 +63,80 @@ class PlantNetConfig:
         self.high_fidelity_file = output_high_fidelity_file or os.path.join(base_dir, "high_fidelity_observations.csv")
 
 
-def load_expected_species(config: PlantNetConfig) -> Dict[str, str]:
+# Columns of the identification summary file. Image_Used_Path is the primary
+# image ({photo_id}.jpg); any other images of the observation sent in the
+# same request are listed, ' | '-separated, in Additional_Image_Paths.
+SUMMARY_HEADER = (
+    ["photo_id", "Expected_Species", "Image_Used_Path", "API_Status"]
+    + [
+        column
+        for i in range(1, 6)
+        for column in (f"Top_{i}_Scientific_Name", f"Top_{i}_Score", f"Top_{i}_Common_Names")
+    ]
+    + [
+        "Expected_Species_Found",
+        "Expected_Species_Rank",
+        "Expected_Species_Score",
+        "Error_Message",
+        "Additional_Image_Paths"
+    ]
+)
+
+# Parquet schema: the Top-N scores are stored as floats, everything else as text
+SUMMARY_SCHEMA = pa.schema([
+    (name, pa.float64() if name.startswith("Top_") and name.endswith("_Score") else pa.string())
+    for name in SUMMARY_HEADER
+])
+
+# Rows per Parquet row group; each batch is on disk once written, so an
+# interrupted run keeps every finished identification but the last partial batch
+SUMMARY_PARQUET_BATCH_SIZE = 100
+
+
+def is_parquet_file(file_path: str) -> bool:
+    """Return True if the path should be read/written as Parquet rather than CSV."""
+    return file_path.lower().endswith(".parquet")
+
+
+def load_identification_summary(file_path: str) -> pd.DataFrame:
+    """
+    Load the identification summary, from Parquet or CSV depending on the extension.
+    
+    Args:
+        file_path: Path to the identification summary file
+        
+    Returns:
+        DataFrame containing one row per processed observation
+    """
+    if is_parquet_file(file_path):
+        return pd.read_parquet(file_path)
+    return pd.read_csv(file_path)
+
+
+def read_csv_arrow(file_path: str, text_columns: Sequence[str] = ('photo_id',)) -> pd.DataFrame:
+    """
+    Read a CSV file with PyArrow's multithreaded parser.
+    
+    Quoted fields may span lines (Flickr titles and descriptions often do),
+    as pd.read_csv allows.
+    
+    Args:
+        file_path: Path to the CSV file
+        text_columns: Columns always parsed as strings (e.g. IDs that look numeric)
+        
+    Returns:
+        DataFrame with the file contents
+    """
+    convert_options = pa_csv.ConvertOptions(
+        column_types={column: pa.string() for column in text_columns}
+    )
+    parse_options = pa_csv.ParseOptions(newlines_in_values=True)
+    return pa_csv.read_csv(
+        file_path, parse_options=parse_options, convert_options=convert_options
+    ).to_pandas()
+
+
+def load_expected_species(config: PlantNetConfig) -> Tuple[Dict[str, str], pd.DataFrame]:
     """
     Load metadata and create mapping of photo_id to expected scientific_name.
     
@@ -57,7 +144,8 @@ def load_expected_species(config: PlantNetConfig) -> Dict[str, str]:
         config: PlantNetConfig object containing file paths
         
     Returns:
-        Dictionary mapping photo_id to scientific_name
+        Tuple of (dictionary mapping photo_id to scientific_name, metadata DataFrame).
+        The DataFrame is returned so callers do not need to parse the file again.
         
     Raises:
         FileNotFoundError: If metadata file doesn't exist
@@ -66,13 +154,13 @@ def load_expected_species(config: PlantNetConfig) -> Dict[str, str]:
     print("📋 Loading metadata to get expected species...")
     
     try:
-        metadata_df = pd.read_csv(config.master_metadata_file)
+        metadata_df = read_csv_arrow(config.master_metadata_file)
         expected_species_map = dict(zip(
             metadata_df['photo_id'].astype(str), 
             metadata_df['scientific_name']
         ))
         print(f"✅ Loaded metadata for {len(expected_species_map)} observations")
-        return expected_species_map
+        return expected_species_map, metadata_df
         
     except FileNotFoundError:
         print(f"❌ Error: Metadata file not found at {config.master_metadata_file}")
@@ -97,10 +185,9 @@ def find_observation_folders(config: PlantNetConfig) -> List[str]:
         ValueError: If no observation folders found
     """
     try:
-        observation_ids = sorted([
-            d for d in os.listdir(config.base_dir) 
-            if os.path.isdir(os.path.join(config.base_dir, d))
-        ])
+        # DirEntry.is_dir() reuses the type info from the directory read
+        with os.scandir(config.base_dir) as entries:
+            observation_ids = sorted(entry.name for entry in entries if entry.is_dir())
         
         if not observation_ids:
             raise ValueError(f"No observation ID folders found in '{config.base_dir}'")
@@ -113,35 +200,87 @@ def find_observation_folders(config: PlantNetConfig) -> List[str]:
         raise
 
 
-def call_plantnet_api(image_path: str, api_endpoint: str) -> Tuple[bool, Optional[dict], str]:
+def find_observation_images(config: PlantNetConfig, obs_id: str) -> List[str]:
+    """
+    Find the images of one observation to send together in a single API request.
+    
+    The primary image ({obs_id}.jpg) always comes first; other images in the
+    observation folder are added up to MAX_IMAGES_PER_REQUEST. PlantNet treats
+    all images of a request as the same plant, so images are never grouped
+    across observations.
+    
+    Args:
+        config: PlantNetConfig object containing base directory
+        obs_id: Observation ID (folder name)
+        
+    Returns:
+        List of image paths, starting with the primary image path
+    """
+    folder = os.path.join(config.base_dir, obs_id)
+    primary_filename = f"{obs_id}.jpg"
+    image_paths = [os.path.join(folder, primary_filename)]
+    
+    try:
+        with os.scandir(folder) as entries:
+            extra_filenames = sorted(
+                entry.name for entry in entries
+                if entry.name != primary_filename
+                and entry.name.lower().endswith(IMAGE_EXTENSIONS)
+                and entry.is_file()
+            )
+    except (FileNotFoundError, NotADirectoryError):
+        return image_paths
+    
+    image_paths.extend(
+        os.path.join(folder, f) for f in extra_filenames[:MAX_IMAGES_PER_REQUEST - 1]
+    )
+    return image_paths
+
+
+def call_plantnet_api(image_path: Union[str, Sequence[str]], api_endpoint: str) -> Tuple[bool, Optional[dict], str]:
     """
-    Call PlantNet API with an image file.
+    Call PlantNet API with one or more image files of the same plant.
     
     Args:
-        image_path: Full path to the image file
+        image_path: Full path to the image file, or a list of up to
+            MAX_IMAGES_PER_REQUEST paths sent together in one request
         api_endpoint: PlantNet API endpoint URL
         
     Returns:
         Tuple of (success: bool, json_result: dict or None, error_message: str)
     """
-    if not os.path.exists(image_path):
+    image_paths = [image_path] if isinstance(image_path, str) else list(image_path)
+    image_paths = image_paths[:MAX_IMAGES_PER_REQUEST]
+    
+    if not image_paths:
         return False, None, "Image file not found locally"
     
+    # Read each image once (no separate existence check); the bytes can be
+    # re-sent without touching the disk again
+    files = []
     try:
-        with open(image_path, 'rb') as image_data:
-            files = [('images', (os.path.basename(image_path), image_data))]
-            data = {'organs': 'auto'}
-            
-            response = requests.post(
-                url=api_endpoint,
-                files=files,
-                data=data
-            )
+        for path in image_paths:
+            with open(path, 'rb') as image_file:
+                files.append(('images', (os.path.basename(path), image_file.read())))
+    except FileNotFoundError:
+        return False, None, "Image file not found locally"
+    except OSError as e:
+        return False, None, f"General Error: {e}"
+    
+    try:
+        # One organ per image
+        data = {'organs': ['auto'] * len(image_paths)}
+        
+        response = requests.post(
+            url=api_endpoint,
+            files=files,
+            data=data
+        )
         
         # Attempt to decode JSON
         try:
-            json_result = response.json()
-        except requests.exceptions.JSONDecodeError:
+            json_result = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
             error_msg = "Could not decode JSON response"
             raw_text = response.text.strip()[:500]
             return False, None, f"{error_msg} | Raw Response: {raw_text}"
@@ -166,6 +305,24 @@ def call_plantnet_api(image_path: str, api_endpoint: str) -> Tuple[bool, Optiona
         return False, None, f"General Error: {e}"
 
 
+def match_expected_species(scientific_names: List[str], expected_species: str) -> int:
+    """
+    Find the rank of the expected species among the API's ranked species names.
+    
+    Args:
+        scientific_names: Species names in API rank order
+        expected_species: Expected scientific name (case-insensitive)
+        
+    Returns:
+        1-based rank of the first matching name, or 0 if it is not present
+    """
+    expected_lc = expected_species.lower()
+    return next(
+        (rank for rank, name in enumerate(scientific_names, 1) if name.lower() == expected_lc),
+        0
+    )
+
+
 def process_api_results(json_result: dict, expected_species: str) -> Dict:
     """
     Process PlantNet API results and check for species match.
@@ -187,40 +344,42 @@ def process_api_results(json_result: dict, expected_species: str) -> Dict:
     all_results = json_result.get('results', [])
     top_5_results = all_results[:5]
     
-    for idx, result in enumerate(top_5_results, 1):
-        score = result.get('score', 0.0)
+    for result in top_5_results:
         species_info = result.get('species', {})
-        scientific_name = species_info.get('scientificNameWithoutAuthor', 'Unknown Species')
-        common_names = species_info.get('commonNames', [])
-        
         results['top_5'].append({
-            'scientific_name': scientific_name,
-            'score': score,
-            'common_names': common_names
+            'scientific_name': species_info.get('scientificNameWithoutAuthor', 'Unknown Species'),
+            'score': result.get('score', 0.0),
+            'common_names': species_info.get('commonNames', [])
         })
-        
-        # Check for species match
-        if scientific_name.lower() == expected_species.lower():
-            results['species_found'] = 'Yes'
-            results['species_rank'] = str(idx)
-            results['species_score'] = f"{score:.6f}"
+    
+    # Check for species match
+    rank = match_expected_species(
+        [result['scientific_name'] for result in results['top_5']], 
+        expected_species
+    )
+    if rank:
+        results['species_found'] = 'Yes'
+        results['species_rank'] = str(rank)
+        results['species_score'] = f"{results['top_5'][rank - 1]['score']:.6f}"
     
     return results
 
 
 def create_csv_row(obs_id: str, expected_species: str, image_path: str, 
                    api_status: str, processed_results: Optional[Dict], 
-                   error_message: str = "") -> List:
+                   error_message: str = "",
+                   additional_image_paths: Sequence[str] = ()) -> List:
     """
     Create a CSV row from processing results.
     
     Args:
         obs_id: Observation ID
         expected_species: Expected scientific name
-        image_path: Path to image file
+        image_path: Path to the primary image file
         api_status: API call status
         processed_results: Results from process_api_results()
         error_message: Error message if any
+        additional_image_paths: Other images sent in the same request
         
     Returns:
         List representing a CSV row
@@ -255,14 +414,112 @@ def create_csv_row(obs_id: str, expected_species: str, image_path: str,
     else:
         row.extend(["No", "Not in Top 5", "N/A", error_message])
     
+    row.append(' | '.join(additional_image_paths))
     return row
 
 
+def write_summary_parquet(rows, file_path: str,
+                          batch_size: int = SUMMARY_PARQUET_BATCH_SIZE) -> None:
+    """
+    Write summary rows to a typed Parquet file, one row group per batch.
+    
+    Batches are written as they fill up and the file is closed even if
+    producing the rows fails, so completed (quota-limited) API results are
+    not lost when a run is interrupted.
+    
+    Args:
+        rows: Iterable of summary rows (see SUMMARY_HEADER)
+        file_path: Output Parquet path
+        batch_size: Number of rows per row group
+    """
+    score_columns = {
+        i for i, name in enumerate(SUMMARY_HEADER)
+        if SUMMARY_SCHEMA.field(name).type == pa.float64()
+    }
+    
+    def write_batch(writer: pq.ParquetWriter, batch: List[List]) -> None:
+        columns = {
+            name: [float(row[i]) if i in score_columns else row[i] for row in batch]
+            for i, name in enumerate(SUMMARY_HEADER)
+        }
+        writer.write_table(pa.Table.from_pydict(columns, schema=SUMMARY_SCHEMA))
+    
+    batch: List[List] = []
+    with pq.ParquetWriter(file_path, SUMMARY_SCHEMA, compression='zstd') as writer:
+        try:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    write_batch(writer, batch)
+                    batch = []
+        finally:
+            if batch:
+                write_batch(writer, batch)
+
+
+def _identify_observations(config: PlantNetConfig, 
+                           expected_species_map: Dict[str, str],
+                           observation_ids: List[str]):
+    """
+    Call the PlantNet API for every observation and yield one summary row each.
+    
+    Args:
+        config: PlantNetConfig object
+        expected_species_map: Dictionary mapping photo_id to scientific_name
+        observation_ids: List of observation folder names
+        
+    Yields:
+        List representing a summary row (see SUMMARY_HEADER)
+    """
+    for i, obs_id in enumerate(observation_ids):
+        progress = f"  [{i + 1}/{len(observation_ids)}] {obs_id}:"
+        
+        expected_species = expected_species_map.get(obs_id, "Unknown")
+        logger.debug("  🎯 Expected species for %s: %s", obs_id, expected_species)
+        
+        # All images of this observation go into one request
+        image_paths = find_observation_images(config, obs_id)
+        
+        # Call API
+        success, json_result, error_message = call_plantnet_api(image_paths, config.api_endpoint)
+        
+        if success:
+            api_status = "Success"
+            processed_results = process_api_results(json_result, expected_species)
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("  📊 Got %d total results", len(json_result['results']))
+                for idx, result in enumerate(processed_results['top_5'], 1):
+                    logger.debug("    %d. %s (Score: %.4f)", idx, result['scientific_name'], result['score'])
+            
+            # One line per observation; the top-5 detail above is DEBUG only
+            if processed_results['species_found'] == 'Yes':
+                print(f"{progress} ✅ {expected_species} found at rank {processed_results['species_rank']}")
+            else:
+                print(f"{progress} ❌ {expected_species} NOT found in top 5")
+        else:
+            api_status = "Failure" if json_result else "Local Failure"
+            processed_results = None
+            print(f"{progress} ❌ {error_message}")
+        
+        # Build row
+        yield create_csv_row(obs_id, expected_species, image_paths[0], 
+                             api_status, processed_results, error_message,
+                             additional_image_paths=image_paths[1:])
+
+
 def process_all_observations(config: PlantNetConfig, 
                             expected_species_map: Dict[str, str],
                             observation_ids: List[str]) -> str:
     """
-    Process all observations and save results to CSV.
+    Process all observations and save results to the summary file.
+    
+    The summary is written as CSV, one row per observation as soon as it is
+    identified. When the configured path ends in '.parquet' it is written as
+    Parquet instead, in row groups of SUMMARY_PARQUET_BATCH_SIZE rows.
+    
+    One progress line is printed per observation (match rank or error); the
+    expected species and top-5 results go to this module's logger at DEBUG.
     
     Args:
         config: PlantNetConfig object
@@ -270,61 +527,18 @@ def process_all_observations(config: PlantNetConfig,
         observation_ids: List of observation folder names
         
     Returns:
-        Path to the output CSV file
-    """
-    # CSV header
-    header = ["photo_id", "Expected_Species", "Image_Used_Path", "API_Status"]
-    for i in range(1, 6):
-        header.extend([
-            f"Top_{i}_Scientific_Name",
-            f"Top_{i}_Score",
-            f"Top_{i}_Common_Names"
-        ])
-    header.extend([
-        "Expected_Species_Found",
-        "Expected_Species_Rank",
-        "Expected_Species_Score",
-        "Error_Message"
-    ])
+        Path to the output summary file
+    """
+    rows = _identify_observations(config, expected_species_map, observation_ids)
     
-    # Process observations
-    with open(config.identification_summary_file, mode='w', newline='', encoding='utf-8') as file:
-        writer = csv.writer(file)
-        writer.writerow(header)
-        
-        for i, obs_id in enumerate(observation_ids):
-            print(f"\n--- Processing ID {i+1}/{len(observation_ids)}: {obs_id} ---")
-            
-            expected_species = expected_species_map.get(obs_id, "Unknown")
-            print(f"  🎯 Expected species: {expected_species}")
-            
-            image_filename = f"{obs_id}.jpg"
-            image_path = os.path.join(config.base_dir, obs_id, image_filename)
-            
-            # Call API
-            success, json_result, error_message = call_plantnet_api(image_path, config.api_endpoint)
-            
-            if success:
-                api_status = "Success"
-                processed_results = process_api_results(json_result, expected_species)
-                
-                print(f"  📊 Got {len(json_result['results'])} total results")
-                for idx, result in enumerate(processed_results['top_5'], 1):
-                    print(f"    {idx}. {result['scientific_name']} (Score: {result['score']:.4f})")
-                
-                if processed_results['species_found'] == 'Yes':
-                    print(f"    ✅ MATCH! Expected species found at rank {processed_results['species_rank']}")
-                else:
-                    print(f"    ❌ Expected species '{expected_species}' NOT found in top 5")
-            else:
-                api_status = "Failure" if json_result else "Local Failure"
-                processed_results = None
-                print(f"  ❌ {error_message}")
-            
-            # Write row
-            row = create_csv_row(obs_id, expected_species, image_path, 
-                               api_status, processed_results, error_message)
-            writer.writerow(row)
+    if is_parquet_file(config.identification_summary_file):
+        write_summary_parquet(rows, config.identification_summary_file)
+    else:
+        with open(config.identification_summary_file, mode='w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(SUMMARY_HEADER)
+            for row in rows:
+                writer.writerow(row)
     
     print(f"\n✅ Identification summary saved to: {config.identification_summary_file}")
     return config.identification_summary_file
@@ -346,7 +560,7 @@ def filter_high_fidelity_observations(config: PlantNetConfig,
     print("\n🔍 Filtering for high-fidelity observations (Rank 1 matches only)...")
     
     # Load identification results
-    results_df = pd.read_csv(config.identification_summary_file)
+    results_df = load_identification_summary(config.identification_summary_file)
 
     #ensure rank is a string
     results_df['Expected_Species_Rank'] = results_df['Expected_Species_Rank'].astype(str)
@@ -394,7 +608,7 @@ def print_summary_statistics(config: PlantNetConfig):
     print("\n📈 SUMMARY STATISTICS:")
     
     try:
-        results_df = pd.read_csv(config.identification_summary_file)
+        results_df = load_identification_summary(config.identification_summary_file)
         total = len(results_df)
         successful = len(results_df[results_df['API_Status'] == 'Success'])
         species_found_count = len(results_df[results_df['Expected_Species_Found'] == 'Yes'])
@@ -440,7 +654,7 @@ def run_full_pipeline(base_dir: str = "PlantNet_Batch_Images",
         base_dir: Base directory containing observation folders
         api_key: PlantNet API key (optional, will use .env if not provided)
         metadata_file: Path to metadata CSV file (optional, defaults to base_dir/master_observations_metadata.csv)
-        output_summary_file: Custom path for summary results CSV
+        output_summary_file: Custom path for summary results (.parquet or .csv)
         output_high_fidelity_file: Custom path for high-fidelity results CSV
         
     Returns:
@@ -476,9 +690,8 @@ def run_full_pipeline(base_dir: str = "PlantNet_Batch_Images",
         output_high_fidelity_file=output_high_fidelity_file
     )
     
-    # Load metadata
-    expected_species_map = load_expected_species(config)
-    metadata_df = pd.read_csv(config.master_metadata_file)
+    # Load metadata (parsed once, reused for the high-fidelity merge)
+    expected_species_map, metadata_df = load_expected_species(config)
     
     # Find observation folders
     observation_ids = find_observation_folders(config)
@@ -510,6 +723,8 @@ def load_high_fidelity_data(base_dir: str = "PlantNet_Batch_Images") -> pd.DataF
         >>> print(df.head())
     """
     config = PlantNetConfig(base_dir=base_dir, api_key="dummy")  # API key not needed for loading
+    # pandas' own parser keeps the dtypes callers merge on (int photo_id,
+    # NaN for empty cells, dates as text)
     return pd.read_csv(config.high_fidelity_file)
 
 
@@ -1,15 +1,22 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature  
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+import functools
+import hashlib
 import os
 
 # --- Configuration for Plotting ---
 PLOT_CONFIG = {
     'OUTPUT_FILE': "high_fidelity_observations_map.png",
     'MAP_EXTENT_PADDING': 1.0, # Degrees of latitude/longitude to pad the auto-zoom
-    'EU_BOUNDARY_EXTENT': [-20, 40, 35, 70] # A reasonable default extent for the European region: [lon_min, lon_max, lat_min, lat_max]
+    'EU_BOUNDARY_EXTENT': [-20, 40, 35, 70], # A reasonable default extent for the European region: [lon_min, lon_max, lat_min, lat_max]
+    'DENSITY_THRESHOLD': 5000, # Above this many points, plot a binned density grid instead of individual markers
+    'DENSITY_BINS': 400, # Number of bins along each axis of the density grid
+    'BASEMAP_CACHE_DIR': None # Set to e.g. os.path.expanduser('~/.cache/flickr_to_plantnet') to reuse pre-rendered PNG basemaps
 }
 
 def load_data_for_mapping(file_path: str) -> pd.DataFrame:
@@ -23,7 +30,7 @@ def load_data_for_mapping(file_path: str) -> pd.DataFrame:
         DataFrame containing observation coordinates.
     """
     print(f"📊 Loading data from: {file_path}")
-    df = pd.read_csv(file_path)
+    df = pd.read_csv(file_path, engine='pyarrow')
     
     # Ensure necessary columns exist and convert coordinates to numeric types
     required_cols = ['latitude', 'longitude', 'scientific_name', 'PlantNet_Confidence_Score']
@@ -52,11 +59,12 @@ def calculate_auto_extent(df: pd.DataFrame, padding: float) -> Tuple[float, floa
         print("⚠️ No valid data points found. Using default EU extent.")
         return PLOT_CONFIG['EU_BOUNDARY_EXTENT']
 
-    # Calculate min/max coordinates
-    lon_min = df['longitude'].min() - padding
-    lon_max = df['longitude'].max() + padding
-    lat_min = df['latitude'].min() - padding
-    lat_max = df['latitude'].max() + padding
+    # Calculate min/max coordinates per column: each to_numpy() is a view of
+    # the column, whereas a single (N, 2) array of both would be a copy
+    lon = df['longitude'].to_numpy(dtype=np.float64)
+    lat = df['latitude'].to_numpy(dtype=np.float64)
+    lon_min, lon_max = lon.min() - padding, lon.max() + padding
+    lat_min, lat_max = lat.min() - padding, lat.max() + padding
     
     # Clamp the calculated extent to a reasonable European boundary
     eu_lon_min, eu_lon_max, eu_lat_min, eu_lat_max = PLOT_CONFIG['EU_BOUNDARY_EXTENT']
@@ -66,25 +74,62 @@ def calculate_auto_extent(df: pd.DataFrame, padding: float) -> Tuple[float, floa
     lat_min = max(lat_min, eu_lat_min)
     lat_max = min(lat_max, eu_lat_max)
 
-    return lon_min, lon_max, lat_min, lat_max
+    return float(lon_min), float(lon_max), float(lat_min), float(lat_max)
 
-def plot_observations_on_map(df: pd.DataFrame, output_path: str, auto_zoom: bool = True):
+@functools.lru_cache(maxsize=4)
+def _cached_features(resolution: str = '50m') -> tuple:
     """
-    Plots the observation data on a Cartopy map and saves it as a static PNG.
+    Builds the Natural Earth background features once per resolution, so that
+    repeated map generation does not re-read the shapefiles for every map.
     """
-    print("🗺️ Generating map visualization...")
-    
-    # 1. Setup the plot and projection
-    fig = plt.figure(figsize=(12, 12))
-    ax = fig.add_subplot(1, 1, 1, projection=ccrs.PlateCarree())
+    coastline = cfeature.NaturalEarthFeature('physical', 'coastline', resolution)
+    return coastline, cfeature.BORDERS, cfeature.LAND, cfeature.OCEAN
+
+def _add_background_features(ax, resolution: str = '50m'):
+    """
+    Adds the coastline, border, land and ocean features to a GeoAxes.
+    """
+    coastline, borders, land, ocean = _cached_features(resolution)
+    ax.add_feature(coastline, edgecolor='gray', facecolor='none')
+    ax.add_feature(borders, linestyle=':', alpha=0.5)
+    ax.add_feature(land, facecolor='#eeeeee')
+    ax.add_feature(ocean, facecolor='#bfe8f9')
+
+def _basemap_cache_path(extent: List[float], resolution: str) -> str:
+    """
+    Returns the PNG path of the cached basemap for a given extent and resolution.
+    """
+    key = hashlib.sha1(f"{[float(v) for v in extent]}_{resolution}".encode()).hexdigest()[:16]
+    return os.path.join(PLOT_CONFIG['BASEMAP_CACHE_DIR'], f"basemap_{key}.png")
+
+def _render_basemap(extent: List[float], resolution: str, cache_path: str):
+    """
+    Renders only the background features for `extent` to a borderless PNG,
+    so later maps with the same extent can skip the feature reprojection.
+    """
+    lon_min, lon_max, lat_min, lat_max = extent
+    # Match the figure aspect to the extent so the axes fill the whole image
+    width = 12
+    height = width * (lat_max - lat_min) / (lon_max - lon_min)
     
-    # 2. Configure map features
-    ax.coastlines(resolution='50m', color='gray')
-    ax.add_feature(cfeature.BORDERS, linestyle=':', alpha=0.5) # <--- FIXED
-    ax.add_feature(cfeature.LAND, facecolor='#eeeeee')         # <--- FIXED
-    ax.add_feature(cfeature.OCEAN, facecolor='#bfe8f9')        # <--- FIXED
+    # A bare Figure (not pyplot) so the caller's current figure is untouched
+    fig = Figure(figsize=(width, height))
+    ax = fig.add_axes([0, 0, 1, 1], projection=ccrs.PlateCarree())
+    ax.set_extent(extent, crs=ccrs.PlateCarree())
+    _add_background_features(ax, resolution)
+    ax.set_axis_off()
     
-    # 3. Determine the map extent (zoom level)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    fig.savefig(cache_path, dpi=300)
+    print(f"💾 Cached basemap to: {cache_path}")
+
+def _draw_observations(fig, ax, df: pd.DataFrame, auto_zoom: bool = True):
+    """
+    Draws the background features and observation data onto an existing
+    GeoAxes. Returns the colorbar (or None) so callers reusing the figure
+    can remove it before drawing the next map.
+    """
+    # 2. Determine the map extent (zoom level)
     if auto_zoom and not df.empty:
         lon_min, lon_max, lat_min, lat_max = calculate_auto_extent(df, PLOT_CONFIG['MAP_EXTENT_PADDING'])
         # If all points are the same (like in your example), ensure a minimum zoom
@@ -95,7 +140,17 @@ def plot_observations_on_map(df: pd.DataFrame, output_path: str, auto_zoom: bool
         # Fallback to the default EU boundary if auto-zoom is off or data is empty
         lon_min, lon_max, lat_min, lat_max = PLOT_CONFIG['EU_BOUNDARY_EXTENT']
     
-    ax.set_extent([lon_min, lon_max, lat_min, lat_max], crs=ccrs.PlateCarree())
+    extent = [lon_min, lon_max, lat_min, lat_max]
+    ax.set_extent(extent, crs=ccrs.PlateCarree())
+    
+    # 3. Configure map features, from the PNG cache when enabled
+    if PLOT_CONFIG['BASEMAP_CACHE_DIR']:
+        cache_path = _basemap_cache_path(extent, '50m')
+        if not os.path.exists(cache_path):
+            _render_basemap(extent, '50m', cache_path)
+        ax.imshow(plt.imread(cache_path), extent=extent, origin='upper', transform=ccrs.PlateCarree())
+    else:
+        _add_background_features(ax, '50m')
     
     # Add gridlines with labels only on the left/bottom
     gl = ax.gridlines(draw_labels=True, linewidth=0.5, color='gray', alpha=0.5, linestyle='--')
@@ -103,12 +158,38 @@ def plot_observations_on_map(df: pd.DataFrame, output_path: str, auto_zoom: bool
     gl.right_labels = False
     
     # 4. Plot the data points
-    if not df.empty:
+    cbar = None
+    lon = df['longitude'].to_numpy(dtype=np.float64)
+    lat = df['latitude'].to_numpy(dtype=np.float64)
+    if len(df) > PLOT_CONFIG['DENSITY_THRESHOLD']:
+        # Too many points to draw one marker each: aggregate the confidence
+        # scores into a 2-D grid so rendering cost depends on pixels, not N
+        h, xedges, yedges = np.histogram2d(
+            lon, 
+            lat, 
+            bins=PLOT_CONFIG['DENSITY_BINS'], 
+            weights=df['PlantNet_Confidence_Score']
+        )
+        image = ax.imshow(
+            np.ma.masked_equal(h.T, 0), # Leave empty cells transparent
+            extent=[xedges[0], xedges[-1], yedges[0], yedges[-1]],
+            origin='lower',
+            cmap='viridis',
+            transform=ccrs.PlateCarree()
+        )
+        
+        cbar = fig.colorbar(image, ax=ax, orientation='horizontal', pad=0.05, aspect=50)
+        cbar.set_label('Summed PlantNet Confidence Score per Cell')
+        
+        species = df['scientific_name'].iloc[0]
+        plt.title(f'High-Fidelity Observations of {species} (N={len(df)})', fontsize=16)
+        
+    elif not df.empty:
         # Use confidence score to set marker size or color if desired
         sizes = (df['PlantNet_Confidence_Score'] * 100) + 10 # Scale score to size, min size 10
         scatter = ax.scatter(
-            df['longitude'], 
-            df['latitude'], 
+            lon, 
+            lat, 
             c=df['PlantNet_Confidence_Score'], # Color by confidence
             s=sizes, 
             edgecolor='k', 
@@ -129,11 +210,64 @@ def plot_observations_on_map(df: pd.DataFrame, output_path: str, auto_zoom: bool
     else:
         plt.title('No High-Fidelity Observations to Plot', fontsize=16)
 
+    return cbar
+
+def plot_observations_on_map(df: pd.DataFrame, output_path: str, auto_zoom: bool = True):
+    """
+    Plots the observation data on a Cartopy map and saves it as a static PNG.
+    """
+    print("🗺️ Generating map visualization...")
+    
+    # 1. Setup the plot and projection
+    fig = plt.figure(figsize=(12, 12))
+    ax = fig.add_subplot(1, 1, 1, projection=ccrs.PlateCarree())
+    
+    _draw_observations(fig, ax, df, auto_zoom)
+
     # 5. Save the figure
     plt.savefig(output_path, dpi=300, bbox_inches='tight')
     plt.close(fig)
     print(f"✅ Map saved to: {output_path}")
 
+def generate_maps_batch(dfs: Dict[str, pd.DataFrame], output_dir: str, auto_zoom: bool = True) -> List[str]:
+    """
+    Plots one map per DataFrame while reusing a single Figure/GeoAxes, which
+    avoids rebuilding the figure and background features for every species.
+    
+    Args:
+        dfs: Mapping of map name (e.g. species name) to its observation DataFrame.
+        output_dir: Directory where the PNG files are written.
+        auto_zoom: Whether to zoom each map to the extent of its observations.
+        
+    Returns:
+        List of paths to the saved maps, in the order of `dfs`.
+    """
+    print(f"🗺️ Generating {len(dfs)} map visualizations...")
+    os.makedirs(output_dir, exist_ok=True)
+
+    fig = plt.figure(figsize=(12, 12))
+    ax = fig.add_subplot(1, 1, 1, projection=ccrs.PlateCarree())
+    
+    output_paths = []
+    try:
+        for name, df in dfs.items():
+            ax.cla()
+            cbar = _draw_observations(fig, ax, df, auto_zoom)
+            
+            safe_name = str(name).replace(' ', '_')
+            output_path = os.path.join(output_dir, f"{safe_name}_{PLOT_CONFIG['OUTPUT_FILE']}")
+            plt.savefig(output_path, dpi=300, bbox_inches='tight')
+            output_paths.append(output_path)
+            print(f"✅ Map saved to: {output_path}")
+            
+            # The colorbar lives in its own axes; drop it so it is not reused
+            if cbar is not None:
+                cbar.remove()
+    finally:
+        plt.close(fig)
+    
+    return output_paths
+
 # ==============================================================================
 # Main function for notebook use
 # ==============================================================================
@@ -1,67 +1,138 @@
 #load dependencies
 import requests
-import csv
+import ijson
+import pandas as pd
 import os
 
+# Column layout of the output CSV
+# NOTE: The unique ID is correctly identified as 'EASINID'
+HEADER = ['EASINID', 'Scientific Name', 'Label', 'All Names']
+
+# Number of species flattened and written per batch while streaming the response
+CHUNK_SIZE = 500
+
+def _flatten_names(records, record_path, name_field, label):
+    """
+    Flattens one nested name list (common names or synonyms) of every species
+    into a long DataFrame with the output CSV columns.
+
+    Args:
+        records (list): Species records, each holding a list under `record_path`.
+        record_path (str): Key of the nested list ('CommonNames' or 'Synonyms').
+        name_field (str): Key holding the name inside each nested entry.
+        label (str): Value written to the 'Label' column.
+
+    Returns:
+        pd.DataFrame: The flattened rows, plus an '_order' column holding the
+        position of the species in the API response.
+    """
+    # Prefix the nested fields so 'Name' does not clash with the species 'Name'
+    names = pd.json_normalize(
+        records,
+        record_path=record_path,
+        meta=['EASINID', 'Name', '_order'],
+        record_prefix='Record.',
+        errors='ignore'
+    )
+    names = names.reindex(columns=['EASINID', 'Name', '_order', f'Record.{name_field}'])
+
+    return pd.DataFrame({
+        'EASINID': names['EASINID'],
+        'Scientific Name': names['Name'],
+        'Label': label,
+        'All Names': names[f'Record.{name_field}'],
+        '_order': names['_order'],
+    })
+
+def _write_species_batch(species_items, start, file, seen):
+    """
+    Flattens a batch of species records and appends their rows to the open CSV file.
+
+    Args:
+        species_items (list): Species records as returned by the EASIN API.
+        start (int): Position of the first record in the full API response.
+        file: Open text file handle to append the rows to.
+        seen (set): (EASINID, Label, name) triples already written; rows
+            matching one of them are skipped and new triples are added.
+    """
+    # Replace missing name lists with [] (prevents NoneType errors) and
+    # remember each species' position to keep the original row order.
+    # Only missing keys become 'N/A'; explicit nulls are written as empty cells
+    records = [
+        {
+            'EASINID': species_item.get('EASINID', 'N/A'),
+            'Name': species_item.get('Name', 'N/A'),
+            'CommonNames': [
+                {'Name': common_name.get('Name', 'N/A')}
+                for common_name in species_item.get('CommonNames') or []
+            ],
+            'Synonyms': [
+                {'Synonym': synonym.get('Synonym', 'N/A')}
+                for synonym in species_item.get('Synonyms') or []
+            ],
+            '_order': order,
+        }
+        for order, species_item in enumerate(species_items, start)
+    ]
+
+    common_names = _flatten_names(records, 'CommonNames', 'Name', 'Common Name')
+    synonyms = _flatten_names(records, 'Synonyms', 'Synonym', 'Synonym')
+
+    # Per species: common names first, then synonyms (stable sort keeps that)
+    batch_df = (
+        pd.concat([common_names, synonyms], ignore_index=True)
+        .sort_values('_order', kind='stable')
+    )
+
+    # Skip names repeated for the same species, within and across batches
+    keys = list(zip(batch_df['EASINID'], batch_df['Label'], batch_df['All Names']))
+    keep = []
+    for key in keys:
+        keep.append(key not in seen)
+        seen.add(key)
+    batch_df = batch_df[keep]
+
+    batch_df.to_csv(file, columns=HEADER, header=False, index=False, lineterminator='\r\n')
+
 def fetch_and_process_easin_data(url, output_file):
     """
     Fetches data from the EASIN API, processes it, and saves it to a CSV file.
     Includes the unique EASINID (R identifier) in the output.
 
+    The response is streamed and parsed incrementally, so memory use does not
+    grow with the size of the species catalogue.
+
     Args:
         url (str): The API endpoint URL.
         output_file (str): The path to the output CSV file.
     """
-    # Prepare the CSV header
-    # NOTE: The unique ID is correctly identified as 'EASINID'
-    header = ['EASINID', 'Scientific Name', 'Label', 'All Names']
-
     try:
-        # Make a GET request to the API
-        response = requests.get(url)
-        response.raise_for_status()
-
-        # Open the CSV file for writing
-        with open(output_file, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(header)  # Write the header row
-            
-            # Parse the JSON response
-            data = response.json()
-            
-            # Iterate over the list of species
-            for species_item in data:
-                # 1. Get the unique R identifier (EASINID)
-                easin_id = species_item.get('EASINID', 'N/A')
-                scientific_name = species_item.get('Name', 'N/A')
-                
-                # 2. Extract and write Common Names (using or [] to prevent NoneType error)
-                common_names_data = species_item.get('CommonNames') or []
-                
-                common_names = [
-                    common_name.get('Name', 'N/A') 
-                    for common_name in common_names_data 
-                ]
-                for common_name in common_names:
-                    # Write row: [EASINID, Scientific Name, Label, Name]
-                    writer.writerow([easin_id, scientific_name, 'Common Name', common_name])
-
-                # 3. Extract and write Synonyms (using or [] to prevent NoneType error)
-                synonyms_data = species_item.get('Synonyms') or []
-                
-                synonym_names = [
-                    synonym.get('Synonym', 'N/A') 
-                    for synonym in synonyms_data 
-                ]
-                for synonym in synonym_names:
-                    # Write row: [EASINID, Scientific Name, Label, Name]
-                    writer.writerow([easin_id, scientific_name, 'Synonym', synonym])
+        # Make a streaming GET request to the API
+        with requests.get(url, stream=True) as response:
+            response.raise_for_status()
+            # Let urllib3 undo any gzip/deflate transfer encoding for ijson
+            response.raw.decode_content = True
+
+            # Open the CSV file for writing
+            with open(output_file, mode='w', newline='', encoding='utf-8') as file:
+                pd.DataFrame(columns=HEADER).to_csv(file, index=False, lineterminator='\r\n')
+
+                # Parse the JSON array one species at a time
+                batch, start, seen = [], 0, set()
+                for species_item in ijson.items(response.raw, 'item'):
+                    batch.append(species_item)
+                    if len(batch) >= CHUNK_SIZE:
+                        _write_species_batch(batch, start, file, seen)
+                        start += len(batch)
+                        batch = []
+                if batch:
+                    _write_species_batch(batch, start, file, seen)
         
         print(f"Data successfully saved to {output_file}")
     
     except requests.exceptions.RequestException as e:
         print(f"Error: Unable to fetch data from the API ({e})")
-    except (IOError, csv.Error) as e:
+    except IOError as e:
         print(f"Error: Unable to write to the CSV file ({e})")
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
@@ -70,4 +141,4 @@ def fetch_and_process_easin_data(url, output_file):
 if __name__ == "__main__":
     url = "https://easin.jrc.ec.europa.eu/apixg/catxg/euconcern"
     output_file = "EASIN_species_names_synonyms_with_id.csv"
-    fetch_and_process_easin_data(url, output_file)
\ No newline at end of file
+    fetch_and_process_easin_data(url, output_file)
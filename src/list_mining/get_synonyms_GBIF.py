@@ -1,63 +1,145 @@
 # load dependencies
 import pandas as pd
+import asyncio
 import concurrent.futures
+import csv
+import functools
 import time
-from tqdm.auto import tqdm # Import tqdm for notebooks/environments
-import pygbif.species
+import aiohttp
+import requests
+from diskcache import Cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from tqdm.asyncio import tqdm_asyncio # Async-aware tqdm for notebooks/environments
 
 # Expanded EU language codes (supporting both 2-letter and 3-letter codes)
-ALLOWED_LANGS = {
+ALLOWED_LANGS = frozenset({
     "bg", "bul", "hr", "hrv", "cs", "ces", "da", "dan", "nl", "nld",
     "en", "eng", "et", "est", "fi", "fin", "fr", "fra", "de", "deu",
     "el", "ell", "hu", "hun", "ga", "gle", "it", "ita", "lv", "lav",
     "lt", "lit", "mt", "mlt", "pl", "pol", "pt", "por", "ro", "ron",
     "sk", "slk", "sl", "slv", "es", "spa", "sv", "swe"
-}
+})
 
-# --- GBIF Data Functions (using pygbif) ---
+GBIF_API_URL = "https://api.gbif.org/v1"
+
+# Page size for paged species endpoints (GBIF maximum); avoids extra round-trips
+GBIF_PAGE_LIMIT = 1000
+
+# Retry transient failures and rate limiting (honours Retry-After) with
+# exponential backoff; the final response is returned for raise_for_status
+RETRY_STRATEGY = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET"],
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# Shared session so worker threads reuse keep-alive connections to api.gbif.org
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=RETRY_STRATEGY))
+
+# On-disk cache of GBIF API responses so reruns skip already-fetched species.
+# Set GBIF_CACHE_DIR to None to disable caching.
+GBIF_CACHE_DIR = ".gbif_cache"
+GBIF_CACHE_EXPIRE = 60 * 60 * 24 * 30  # 30 days
+
+@functools.lru_cache(maxsize=None)
+def _open_cache(directory):
+    """Open (once per directory) the diskcache store backing the GBIF cache."""
+    return Cache(directory)
+
+def _cache_lookup(path, params):
+    """Return (cache, key, cached_json); cache is None when caching is disabled."""
+    if not GBIF_CACHE_DIR:
+        return None, None, None
+    cache = _open_cache(GBIF_CACHE_DIR)
+    key = (path, tuple(sorted(params.items())))
+    return cache, key, cache.get(key)
+
+# --- GBIF Data Functions (GBIF REST API over a pooled session) ---
+
+def gbif_get(path, **params):
+    """GET a GBIF API endpoint through the shared session and decode the JSON (disk-cached)."""
+    cache, key, data = _cache_lookup(path, params)
+    if data is not None:
+        return data
+
+    response = SESSION.get(f"{GBIF_API_URL}/{path}", params=params)
+    response.raise_for_status()
+    data = response.json()
+    if cache is not None:
+        cache.set(key, data, expire=GBIF_CACHE_EXPIRE)
+    return data
+
+def gbif_get_all(path):
+    """Collect all pages of a paged GBIF endpoint into a single {"results": [...]} dict."""
+    results, offset = [], 0
+    while True:
+        page = gbif_get(path, limit=GBIF_PAGE_LIMIT, offset=offset)
+        page_results = page.get("results", [])
+        results.extend(page_results)
+        if page.get("endOfRecords", True) or not page_results:
+            return {"results": results}
+        offset += GBIF_PAGE_LIMIT
+
+def _species_key_from_match(match):
+    """Return the usageKey of a /species/match response, or None if unusable."""
+    if match and match.get("status") in ["ACCEPTED", "SYNONYM", "DOUBTFUL"] and "usageKey" in match:
+        return match["usageKey"]
+    return None
+
+def _synonyms_from_usage(usage_data):
+    """Extract the set of scientific names from a /synonyms response."""
+    return {r.get("scientificName") for r in usage_data.get("results", []) if r.get("scientificName")}
+
+def _common_names_from_usage(usage_data):
+    """Extract (name, lang) pairs in ALLOWED_LANGS from a /vernacularNames response."""
+    common_names = set()
+    for record in usage_data.get("results", []):
+        name = record.get("vernacularName")
+        if not name:
+            continue
+        lang = record.get("language", "").lower()
+        lang2 = lang[:2]
+
+        if lang in ALLOWED_LANGS or lang2 in ALLOWED_LANGS:
+            common_names.add((name, lang))
+    return common_names
 
 def get_gbif_species_key(scientific_name):
-    """Fetch GBIF species key using pygbif.species.name_backbone."""
+    """Fetch GBIF species key from the backbone /species/match endpoint."""
     try:
-        match = pygbif.species.name_backbone(name=scientific_name)
-        if match and match.get("status") in ["ACCEPTED", "SYNONYM", "DOUBTFUL"] and "usageKey" in match:
-            return match["usageKey"]
-        return None
+        match = gbif_get("species/match", name=scientific_name)
+        return _species_key_from_match(match)
     except Exception as e:
         # Use simple print for critical errors only
         print(f"❌ Error matching GBIF key for {scientific_name}: {e}")
         return None
 
 def get_gbif_synonyms(species_key):
-    """Fetch GBIF synonyms using pygbif.species.name_usage."""
+    """Fetch GBIF synonyms from the /species/{key}/synonyms endpoint."""
     if not species_key:
         return set()
     try:
-        usage_data = pygbif.species.name_usage(key=species_key, data="synonyms")
-        results = usage_data.get("results", [])
-        synonyms = {r.get("scientificName") for r in results if r.get("scientificName")}
-        return synonyms
+        usage_data = gbif_get_all(f"species/{species_key}/synonyms")
+        return _synonyms_from_usage(usage_data)
     except Exception as e:
         print(f"❌ Error fetching GBIF synonyms for {species_key}: {e}")
         return set()
 
 def get_gbif_common_names(species_key):
-    """Fetch common names from GBIF in allowed languages using pygbif."""
+    """Fetch common names from GBIF in allowed languages (/species/{key}/vernacularNames)."""
     if not species_key:
         return set()
     
     common_names = set()
     
     try:
-        usage_data = pygbif.species.name_usage(key=species_key, data="vernacularNames")
-        results = usage_data.get("results", [])
-        
-        for record in results:
-            name = record.get("vernacularName")
-            lang = record.get("language", "").lower()
-
-            if name and (lang in ALLOWED_LANGS or lang[:2] in ALLOWED_LANGS):
-                common_names.add((name, lang))
+        usage_data = gbif_get_all(f"species/{species_key}/vernacularNames")
+        common_names = _common_names_from_usage(usage_data)
 
     except Exception as e:
         print(f"❌ Error fetching GBIF common names for {species_key}: {e}")
@@ -81,6 +163,145 @@ def process_species(scientific_name):
         "common_names": list(common_names)  
     }
 
+# --- Async variants (aiohttp) used by the batch fetcher ---
+
+def _retry_delay(attempt, retry_after=None):
+    """
+    Seconds to wait before async retry number ``attempt`` (1-based).
+
+    Mirrors RETRY_STRATEGY: exponential backoff from its backoff_factor, but
+    never shorter than a numeric Retry-After from the server.
+    """
+    delay = RETRY_STRATEGY.backoff_factor * (2 ** (attempt - 1))
+    if retry_after is not None:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            pass # HTTP-date form: keep the backoff
+    return delay
+
+async def gbif_get_async(session, path, **params):
+    """
+    Async counterpart of gbif_get using a shared aiohttp session (same disk cache).
+
+    Rate limiting, transient server errors (RETRY_STRATEGY.status_forcelist)
+    and dropped connections are retried up to RETRY_STRATEGY.total times with
+    backoff, like the requests session; the final failure is raised.
+    """
+    cache, key, data = _cache_lookup(path, params)
+    if data is not None:
+        return data
+
+    max_retries = RETRY_STRATEGY.total
+    for attempt in range(max_retries + 1):
+        try:
+            async with session.get(f"{GBIF_API_URL}/{path}", params=params) as response:
+                if response.status in RETRY_STRATEGY.status_forcelist and attempt < max_retries:
+                    delay = _retry_delay(attempt + 1, response.headers.get("Retry-After"))
+                else:
+                    response.raise_for_status()
+                    data = await response.json(content_type=None)
+                    break
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == max_retries:
+                raise
+            delay = _retry_delay(attempt + 1)
+        await asyncio.sleep(delay)
+
+    if cache is not None:
+        cache.set(key, data, expire=GBIF_CACHE_EXPIRE)
+    return data
+
+async def gbif_get_all_async(session, path):
+    """Async counterpart of gbif_get_all."""
+    results, offset = [], 0
+    while True:
+        page = await gbif_get_async(session, path, limit=GBIF_PAGE_LIMIT, offset=offset)
+        page_results = page.get("results", [])
+        results.extend(page_results)
+        if page.get("endOfRecords", True) or not page_results:
+            return {"results": results}
+        offset += GBIF_PAGE_LIMIT
+
+async def process_species_async(session, scientific_name):
+    """Async counterpart of process_species: match, then synonyms & common names."""
+    match = await gbif_get_async(session, "species/match", name=scientific_name)
+    species_key = _species_key_from_match(match)
+    if not species_key:
+        return None
+
+    synonyms_data, vernacular_data = await asyncio.gather(
+        gbif_get_all_async(session, f"species/{species_key}/synonyms"),
+        gbif_get_all_async(session, f"species/{species_key}/vernacularNames"),
+        return_exceptions=True,
+    )
+    # Mirror the sync helpers: a failed lookup yields an empty set, not a failed species
+    if isinstance(synonyms_data, Exception):
+        print(f"❌ Error fetching GBIF synonyms for {species_key}: {synonyms_data}")
+        synonyms_data = {}
+    if isinstance(vernacular_data, Exception):
+        print(f"❌ Error fetching GBIF common names for {species_key}: {vernacular_data}")
+        vernacular_data = {}
+
+    return {
+        "scientific_name": scientific_name,
+        "synonyms": list(_synonyms_from_usage(synonyms_data)),
+        "common_names": list(_common_names_from_usage(vernacular_data))
+    }
+
+async def _process_all_species(species_list, max_concurrency, on_result):
+    """
+    Process every species over one aiohttp session, bounded by a semaphore.
+
+    Each successful result is handed to ``on_result`` as soon as it completes,
+    so nothing is accumulated here.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    connector = aiohttp.TCPConnector(limit=max_concurrency)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def bounded(sp):
+            async with semaphore:
+                try:
+                    return await process_species_async(session, sp)
+                except Exception as e:
+                    print(f"❌ Failed to process {sp}: {e}")
+                    return None
+
+        for future in tqdm_asyncio.as_completed([bounded(sp) for sp in species_list], total=len(species_list), desc="Fetching GBIF Data"):
+            result = await future
+            if result:
+                on_result(result)
+
+def unique_species_names(names):
+    """
+    Drop blank and duplicate names, ignoring surrounding whitespace and case.
+
+    The first spelling of each name is kept, so output rows use the input casing.
+    """
+    names = names.dropna().astype(str).str.strip()
+    names = names[names != ""]
+    return names[~names.str.lower().duplicated()].tolist()
+
+OUTPUT_COLUMNS = ["Scientific Name", "Name", "Type", "Language (optional)"]
+
+def species_rows(entry):
+    """Yield one output row per synonym, then per common name, of a processed species."""
+    sci_name = entry["scientific_name"]
+    for synonym in entry["synonyms"]:
+        yield [sci_name, synonym, "Synonym", ""]
+    for common_name, lang in entry["common_names"]:
+        yield [sci_name, common_name, "Common Name", lang]
+
+def _run_async(coro):
+    """Run a coroutine from sync code, using a worker thread if a loop is already running (notebooks)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
 # ----------------------------------------------------------------------
 # --- Main Function for Notebook/Module Use ---
 # ----------------------------------------------------------------------
@@ -92,7 +313,7 @@ def fetch_gbif_names_and_synonyms(input_csv_path: str, output_csv_path: str, max
     Args:
         input_csv_path: Path to the input CSV with a column named "Scientific Name".
         output_csv_path: Path where the resulting CSV will be saved.
-        max_workers: Maximum number of worker threads for concurrent processing.
+        max_workers: Maximum number of concurrent GBIF requests (asyncio semaphore size).
         
     Returns:
         pandas.DataFrame: The resulting DataFrame or None on failure.
@@ -102,7 +323,7 @@ def fetch_gbif_names_and_synonyms(input_csv_path: str, output_csv_path: str, max
     # 1. Read input CSV
     try:
         species_df = pd.read_csv(input_csv_path, usecols=["Scientific Name"])
-        species_list = species_df["Scientific Name"].dropna().unique()
+        species_list = unique_species_names(species_df["Scientific Name"])
     except FileNotFoundError:
         print(f"❌ Error: Input file '{input_csv_path}' not found. Please ensure it exists.")
         return None
@@ -110,46 +331,42 @@ def fetch_gbif_names_and_synonyms(input_csv_path: str, output_csv_path: str, max
         print(f"❌ Error: Input file must contain a column named 'Scientific Name'.")
         return None
 
+    return fetch_gbif_names_for_species(species_list, output_csv_path, max_workers)
+
+def fetch_gbif_names_for_species(species_list, output_csv_path: str, max_workers: int = 10):
+    """
+    Fetches GBIF synonyms and common names for an in-memory list of species.
+
+    Args:
+        species_list: Unique scientific names (see unique_species_names).
+        output_csv_path: Path where the resulting CSV will be saved.
+        max_workers: Maximum number of concurrent GBIF requests (asyncio semaphore size).
+
+    Returns:
+        pandas.DataFrame: The resulting DataFrame or None if there is nothing to process.
+    """
     num_species = len(species_list)
     if num_species == 0:
         print("⚠️ No scientific names found to process.")
         return None
 
-    print(f"🔍 Found **{num_species}** unique scientific names. Processing with {max_workers} workers...")
+    print(f"🔍 Found **{num_species}** unique scientific names. Processing with up to {max_workers} concurrent requests...")
     
-    # 2. Multithreaded Data Collection
+    # 2. Concurrent Data Collection (asyncio + aiohttp), streaming rows to the CSV
     start_time = time.time()
-    results = []
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_species = {executor.submit(process_species, sp): sp for sp in species_list}
-        
-        # Use tqdm to monitor progress
-        for future in tqdm(concurrent.futures.as_completed(future_to_species), total=num_species, desc="Fetching GBIF Data"):
-            try:
-                result = future.result()
-                if result:
-                    results.append(result)
-            except Exception as e:
-                species = future_to_species[future]
-                print(f"❌ Failed to process {species}: {e}")
+    with open(output_csv_path, "w", newline="", encoding="utf-8") as output_file:
+        writer = csv.writer(output_file)
+        writer.writerow(OUTPUT_COLUMNS)
+        _run_async(_process_all_species(
+            species_list, max_workers,
+            on_result=lambda entry: writer.writerows(species_rows(entry))
+        ))
 
     print(f"\n✅ Data collection completed in {time.time() - start_time:.2f} seconds.")
 
-    # 3. Format and Save Results
-    output_data = []
-
-    for entry in results:
-        sci_name = entry["scientific_name"]
-        
-        for synonym in entry["synonyms"]:
-            output_data.append([sci_name, synonym, "Synonym", ""])
-        
-        for common_name, lang in entry["common_names"]:
-            output_data.append([sci_name, common_name, "Common Name", lang])
-
-    df_output = pd.DataFrame(output_data, columns=["Scientific Name", "Name", "Type", "Language (optional)"])
-    df_output.to_csv(output_csv_path, index=False, encoding="utf-8")
+    # 3. Load the saved results for callers that want a DataFrame
+    df_output = pd.read_csv(output_csv_path, dtype=str, keep_default_na=False)
 
     print(f"📂 Saved results to **{output_csv_path}** (Total rows: {len(df_output)})")
     
@@ -9,8 +9,13 @@ import os
 import sys
 import requests
 import pandas as pd
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any, Tuple
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
+from lxml import html as lxml_html
+from typing import Any, BinaryIO, Dict, List, Tuple
 from dotenv import load_dotenv
 from tqdm.auto import tqdm
 
@@ -27,6 +32,9 @@ EU_LANGUAGES = [
     "cy"
 ]
 
+# Frozen copy for fast membership checks when filtering sitelinks
+EU_LANG_SET = frozenset(EU_LANGUAGES)
+
 # Get the user-agent string from an environment variable
 WIKI_USER_AGENT = os.getenv("WIKI_USER_AGENT")
 
@@ -39,14 +47,42 @@ if not WIKI_USER_AGENT:
         '(KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
     )
 
-# Initialize tqdm for pandas
-tqdm.pandas()
+# Retry transient failures and rate limiting (honours Retry-After) with
+# exponential backoff; the final response is returned for raise_for_status
+RETRY_STRATEGY = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=['GET'],
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# Shared session: keep-alive connections to wikipedia.org / wikidata.org
+SESSION = requests.Session()
+SESSION.headers.update({'User-Agent': WIKI_USER_AGENT})
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=20, pool_maxsize=20, max_retries=RETRY_STRATEGY
+))
+
+# MediaWiki / Wikibase API endpoints and their per-call title/ID limit
+WIKIPEDIA_API_URL = 'https://en.wikipedia.org/w/api.php'
+WIKIDATA_API_URL = 'https://www.wikidata.org/w/api.php'
+WIKI_BATCH_SIZE = 50
+
+# XPath for the species table: a table carrying all three classes
+SPECIES_TABLE_XPATH = (
+    '//table'
+    '[contains(concat(" ", normalize-space(@class), " "), " wikitable ")]'
+    '[contains(concat(" ", normalize-space(@class), " "), " sortable ")]'
+    '[contains(concat(" ", normalize-space(@class), " "), " css-serial ")]'
+)
 # -----------------------------
 
 
 def fetch_webpage_content(url: str) -> requests.Response:
     """
-    Fetch the content of a webpage with a User-Agent header.
+    Fetch the content of a webpage through the shared session.
     
     Args:
         url: The URL to fetch
@@ -54,9 +90,8 @@ def fetch_webpage_content(url: str) -> requests.Response:
     Returns:
         Response object or None if request fails
     """
-    headers = {'User-Agent': WIKI_USER_AGENT}
     try:
-        response = requests.get(url, headers=headers)
+        response = SESSION.get(url)
         response.raise_for_status()
         return response
     except requests.exceptions.RequestException as e:
@@ -74,34 +109,57 @@ def extract_scientific_names(html_content: bytes) -> List[str]:
     Returns:
         List of scientific names
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
     # Target the known table class for the list of species
-    table = soup.find('table', {'class': 'wikitable sortable css-serial'})
+    tables = (
+        lxml_html.fromstring(html_content).xpath(SPECIES_TABLE_XPATH)
+        if html_content else []
+    )
     
-    if table is None:
+    if not tables:
         print("Error: Table with class 'wikitable sortable css-serial' "
               "not found!")
         return []
 
-    scientific_names = []
-    # Skip the header row (index 0)
-    for row in table.find_all('tr')[1:]:
-        cells = row.find_all('td')
-        if len(cells) > 1:
-            # Scientific names are usually in italics in the second column
-            italicized = cells[1].find('i')
-            if italicized:
-                scientific_name = italicized.get_text(strip=True)
-                scientific_names.append(scientific_name)
-    return scientific_names
+    # Skip the header row (index 0); scientific names are usually in
+    # italics in the second column
+    italicized = tables[0].xpath('(.//tr)[position() > 1]'
+                                 '/td[2]/descendant::i[1]')
+    return [node.text_content().strip() for node in italicized]
+
+
+def _species_page_url(species_name: str) -> str:
+    """Build the English Wikipedia URL for a species article."""
+    return f'https://en.wikipedia.org/wiki/{species_name.replace(" ", "_")}'
+
+
+def _parse_q_number(html_source: BinaryIO) -> str:
+    """
+    Extract the Wikidata Q-number from a Wikipedia article's HTML.
+    
+    Args:
+        html_source: File-like object streaming the species article HTML
+        
+    Returns:
+        Wikidata Q-number or None if the sidebar link is missing
+    """
+    root = lxml_html.parse(html_source).getroot()
+    if root is None:
+        return None
+    
+    # Find the link to the Wikidata item
+    hrefs = root.xpath('//a[@href][normalize-space(string()) = '
+                       '"Wikidata item"]/@href')
+    if hrefs:
+        return hrefs[0].split('/')[-1]
+    return None
 
 
 def get_wikidata_q_number(species_name: str) -> str:
     """
     Fetch the Wikidata Q-number for a given species from Wikipedia.
     
-    This function should be used with pandas.progress_apply.
+    For many species prefer fetch_q_numbers_batch, which resolves up to
+    50 names per request.
     
     Args:
         species_name: Scientific name of the species
@@ -109,25 +167,105 @@ def get_wikidata_q_number(species_name: str) -> str:
     Returns:
         Wikidata Q-number or None if not found
     """
-    wikipedia_url = (
-        f'https://en.wikipedia.org/wiki/{species_name.replace(" ", "_")}'
-    )
-    headers = {'User-Agent': WIKI_USER_AGENT}
     try:
-        response = requests.get(wikipedia_url, headers=headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find the link to the Wikidata item
-        wikidata_link = soup.find('a', href=True, string='Wikidata item')
-        if wikidata_link:
-            return wikidata_link['href'].split('/')[-1]
-        return None
-    except requests.exceptions.RequestException:
-        # Suppress printing the error inside progress_apply for cleaner output
+        # Parse straight from the socket instead of buffering .content
+        with SESSION.get(_species_page_url(species_name),
+                         stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            return _parse_q_number(response.raw)
+    except (requests.exceptions.RequestException, Urllib3HTTPError):
+        # Reading response.raw directly surfaces urllib3 errors (e.g. a
+        # dropped connection mid-body) that requests would otherwise wrap.
+        # Suppress printing the error for cleaner progress output
         return None
 
 
+def fetch_q_numbers_batch(species_names: List[str]) -> Dict[str, str]:
+    """
+    Resolve Wikidata Q-numbers for many species via the MediaWiki API.
+    
+    Uses ``action=query&prop=pageprops`` with up to ``WIKI_BATCH_SIZE``
+    titles per call, following title normalisation and redirects the
+    same way a browser visit to the article would.
+    
+    Args:
+        species_names: Scientific names of the species
+        
+    Returns:
+        Dictionary mapping each species name to its Q-number (or None)
+    """
+    q_numbers = {name: None for name in species_names}
+    unique_names = list(q_numbers)
+
+    for start in tqdm(range(0, len(unique_names), WIKI_BATCH_SIZE),
+                      desc="Fetching Q-numbers"):
+        chunk = unique_names[start:start + WIKI_BATCH_SIZE]
+        params = {
+            'action': 'query',
+            'format': 'json',
+            'prop': 'pageprops',
+            'ppprop': 'wikibase_item',
+            'redirects': 1,
+            'titles': '|'.join(chunk)
+        }
+        try:
+            response = SESSION.get(WIKIPEDIA_API_URL, params=params)
+            response.raise_for_status()
+            query = response.json().get('query', {})
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Error fetching Q-numbers for batch starting at "
+                  f"{chunk[0]}: {e}")
+            continue
+
+        # Follow the title through normalisation and redirects
+        renamed = {
+            item['from']: item['to']
+            for key in ('normalized', 'redirects')
+            for item in query.get(key, [])
+        }
+        title_to_q = {
+            page.get('title'): page.get('pageprops', {}).get('wikibase_item')
+            for page in query.get('pages', {}).values()
+        }
+        for name in chunk:
+            title = name
+            while title in renamed:
+                title = renamed[title]
+            q_numbers[name] = title_to_q.get(title)
+
+    return q_numbers
+
+
+def _parse_sitelinks(
+    data: Dict[str, Any],
+    q_number: str
+) -> List[Tuple[str, str]]:
+    """
+    Extract EU-language Wikipedia titles from a Wikidata entity payload.
+    
+    Args:
+        data: Decoded EntityData or wbgetentities JSON
+        q_number: Wikidata Q-number the payload belongs to
+        
+    Returns:
+        List of (language code, Wikipedia title) pairs that exist
+    """
+    sitelinks_data = (
+        data.get('entities', {}).get(q_number, {}).get('sitelinks', {})
+    )
+    return [
+        (lang, value['title'])
+        for key, value in sitelinks_data.items()
+        if key.endswith('wiki') and (lang := key[:-4]) in EU_LANG_SET
+    ]
+
+
+def _entity_data_url(q_number: str) -> str:
+    """Build the Wikidata EntityData JSON URL for a Q-number."""
+    return f"https://www.wikidata.org/wiki/Special:EntityData/{q_number}.json"
+
+
 def fetch_sitelinks(q_number: str) -> Dict[str, Any]:
     """
     Fetch Wikipedia sitelinks for a Wikidata Q-number across EU languages.
@@ -142,27 +280,77 @@ def fetch_sitelinks(q_number: str) -> Dict[str, Any]:
     if pd.isna(q_number) or not q_number:
         return sitelinks
 
-    url = f"https://www.wikidata.org/wiki/Special:EntityData/{q_number}.json"
-    headers = {'User-Agent': WIKI_USER_AGENT}
     try:
-        response = requests.get(url, headers=headers)
+        response = SESSION.get(_entity_data_url(q_number))
         response.raise_for_status()
-        data = response.json()
-        entity_data = data.get('entities', {}).get(q_number, {})
-        
-        if not entity_data:
-            return sitelinks
-
-        sitelinks_data = entity_data.get('sitelinks', {})
-        for key, value in sitelinks_data.items():
-            lang = key.split('wiki')[0]
-            if lang in EU_LANGUAGES:
-                sitelinks[lang] = value['title']
+        sitelinks.update(_parse_sitelinks(response.json(), q_number))
         return sitelinks
     except requests.exceptions.RequestException:
         return sitelinks
 
 
+def fetch_sitelinks_batch(
+    q_numbers: List[str]
+) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Fetch EU-language sitelinks for many Q-numbers via ``wbgetentities``.
+    
+    Requests only ``props=sitelinks`` filtered to the EU-language wikis,
+    with up to ``WIKI_BATCH_SIZE`` IDs per call.
+    
+    Args:
+        q_numbers: Wikidata Q-numbers
+        
+    Returns:
+        Dictionary mapping each Q-number to its (language, title) pairs
+    """
+    unique_q_numbers = list(dict.fromkeys(q for q in q_numbers if q))
+    sitelinks = {q: [] for q in unique_q_numbers}
+    site_filter = '|'.join(f'{lang}wiki' for lang in EU_LANGUAGES)
+
+    for start in tqdm(range(0, len(unique_q_numbers), WIKI_BATCH_SIZE),
+                      desc="Fetching sitelinks"):
+        chunk = unique_q_numbers[start:start + WIKI_BATCH_SIZE]
+        params = {
+            'action': 'wbgetentities',
+            'format': 'json',
+            'ids': '|'.join(chunk),
+            'props': 'sitelinks',
+            'sitefilter': site_filter
+        }
+        try:
+            response = SESSION.get(WIKIDATA_API_URL, params=params)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Error fetching sitelinks for batch starting at "
+                  f"{chunk[0]}: {e}")
+            continue
+
+        for q_number in chunk:
+            sitelinks[q_number] = _parse_sitelinks(data, q_number)
+
+    return sitelinks
+
+
+def write_csv_arrow(df: pd.DataFrame, file_path: str) -> None:
+    """
+    Write a DataFrame to CSV with PyArrow's C writer (no index).
+    
+    Values read back as from ``df.to_csv(file_path, index=False)``, but
+    Arrow quotes the header and every string cell, so the file is not
+    byte-identical to pandas' output.
+    
+    Args:
+        df: DataFrame to save
+        file_path: Output CSV path
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pa_csv.write_csv(
+        table, file_path, pa_csv.WriteOptions(quoting_style='needed')
+    )
+
+
 def run_wiki_sitelinks_pipeline(
     wiki_url: str = 'https://en.wikipedia.org/wiki/'
                     'List_of_invasive_alien_species_of_Union_concern',
@@ -197,45 +385,64 @@ def run_wiki_sitelinks_pipeline(
         print("No scientific names found. Pipeline exiting.")
         return pd.DataFrame(), pd.DataFrame()
 
-    df_q_numbers = pd.DataFrame({'Scientific Name': scientific_names})
-
-    # --- Step 2: Get Wikidata Q-numbers ---
-    print("Step 2/4: Getting Wikidata Q-numbers (This may take time)...")
-    df_q_numbers['Wikidata Q-number'] = (
-        df_q_numbers['Scientific Name'].progress_map(get_wikidata_q_number)
+    return collect_wiki_sitelinks(
+        scientific_names, q_number_file, sitelinks_file
     )
+
+
+def collect_wiki_sitelinks(
+    scientific_names: List[str],
+    q_number_file: str = 'species_q_numbers.csv',
+    sitelinks_file: str = 'species_wikipedia_sitelinks.csv'
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Resolve Q-numbers and sitelinks for known species and save them.
     
-    # --- Step 3: Fetch sitelinks ---
-    print("Step 3/4: Fetching sitelinks for all EU languages "
-          "(This may take time)...")
+    Runs steps 2-4 of the pipeline, so callers that already have the
+    species names (e.g. a combined wiki + GBIF run) can skip step 1.
+
+    Args:
+        scientific_names: Scientific names of the species
+        q_number_file: Output filename for scientific names and Q-numbers
+        sitelinks_file: Output filename for all sitelinks data
+
+    Returns:
+        Tuple of (q_numbers_dataframe, sitelinks_dataframe)
+    """
+    # --- Step 2: Get Wikidata Q-numbers (batched MediaWiki API) ---
+    print("Step 2/4: Getting Wikidata Q-numbers...")
+    q_number_map = fetch_q_numbers_batch(scientific_names)
+    df_q_numbers = pd.DataFrame({
+        'Scientific Name': scientific_names,
+        'Wikidata Q-number': [q_number_map[n] for n in scientific_names]
+    })
+
+    # --- Step 3: Fetch sitelinks (batched wbgetentities) ---
+    print("Step 3/4: Fetching sitelinks for all EU languages...")
+    sitelinks_by_q = fetch_sitelinks_batch(list(q_number_map.values()))
     all_sitelinks = []
     
-    # Filter out rows where Q-number is missing before iterating
-    df_q_numbers_valid = df_q_numbers.dropna(subset=['Wikidata Q-number'])
-
-    for _, row in tqdm(df_q_numbers_valid.iterrows(),
-                       total=len(df_q_numbers_valid),
-                       desc="Fetching sitelinks"):
-        q_number = row['Wikidata Q-number']
-        species_name = row['Scientific Name']
-        
-        sitelinks = fetch_sitelinks(q_number)
-        
-        for lang, title in sitelinks.items():
-            if title:
-                all_sitelinks.append({
-                    'Scientific Name': species_name,
-                    'Q-number': q_number,
-                    'Language': lang,
-                    'Wikipedia Title': title
-                })
+    # Plain column zip (no per-row Series); species without Q-number skipped
+    for species_name, q_number in zip(
+        df_q_numbers['Scientific Name'].values,
+        df_q_numbers['Wikidata Q-number'].values
+    ):
+        if pd.isna(q_number):
+            continue
+        for lang, title in sitelinks_by_q[q_number]:
+            all_sitelinks.append({
+                'Scientific Name': species_name,
+                'Q-number': q_number,
+                'Language': lang,
+                'Wikipedia Title': title
+            })
 
     df_sitelinks = pd.DataFrame(all_sitelinks)
     
     # --- Step 4: Save data ---
     print(f"Step 4/4: Saving data to {q_number_file} and {sitelinks_file}...")
-    df_q_numbers.to_csv(q_number_file, index=False)
-    df_sitelinks.to_csv(sitelinks_file, index=False)
+    write_csv_arrow(df_q_numbers, q_number_file)
+    write_csv_arrow(df_sitelinks, sitelinks_file)
     
     print("Pipeline completed and data saved successfully.")
     
@@ -0,0 +1,100 @@
+"""
+Combined Wikipedia + GBIF Union List Pipeline
+
+Extracts the Union list species from Wikipedia once, then runs the Wikidata
+(Q-numbers + sitelinks) and GBIF (synonyms + common names) lookups side by
+side. The two hit independent hosts, so overlapping them saves the duration
+of the shorter lookup: the pipeline takes as long as the slower of the two
+rather than their sum.
+"""
+
+import concurrent.futures
+import pandas as pd
+from typing import Optional, Tuple
+
+try:
+    from .get_unionlist_wiki import (
+        fetch_webpage_content,
+        extract_scientific_names,
+        collect_wiki_sitelinks
+    )
+    from .get_synonyms_GBIF import (
+        fetch_gbif_names_for_species,
+        unique_species_names
+    )
+except ImportError:
+    # Run as a script (python src/list_mining/get_unionlist_wiki_GBIF.py):
+    # the sibling modules are importable from this file's directory
+    from get_unionlist_wiki import (
+        fetch_webpage_content,
+        extract_scientific_names,
+        collect_wiki_sitelinks
+    )
+    from get_synonyms_GBIF import (
+        fetch_gbif_names_for_species,
+        unique_species_names
+    )
+
+
+def run_union_list_enrichment(
+    wiki_url: str = 'https://en.wikipedia.org/wiki/'
+                    'List_of_invasive_alien_species_of_Union_concern',
+    q_number_file: str = 'species_q_numbers.csv',
+    sitelinks_file: str = 'species_wikipedia_sitelinks.csv',
+    gbif_output_file: str = 'GBIF_unionlist_synonyms.csv',
+    max_workers: int = 10
+) -> Tuple[pd.DataFrame, pd.DataFrame, Optional[pd.DataFrame]]:
+    """
+    Fetch Wikidata sitelinks and GBIF names for the Union list concurrently.
+
+    Produces the same files as running run_wiki_sitelinks_pipeline followed
+    by fetch_gbif_names_and_synonyms, except that GBIF is queried for every
+    species on the list rather than only those with Wikipedia sitelinks.
+
+    Args:
+        wiki_url: Wikipedia URL containing the species list table
+        q_number_file: Output filename for scientific names and Q-numbers
+        sitelinks_file: Output filename for all sitelinks data
+        gbif_output_file: Output filename for GBIF synonyms and common names
+        max_workers: Maximum number of concurrent GBIF requests
+
+    Returns:
+        Tuple of (q_numbers_dataframe, sitelinks_dataframe, gbif_dataframe)
+    """
+    print(f"--- Starting combined Wikipedia + GBIF pipeline for: {wiki_url} ---")
+
+    response = fetch_webpage_content(wiki_url)
+    if not response:
+        print("Failed to fetch webpage content. Pipeline exiting.")
+        return pd.DataFrame(), pd.DataFrame(), None
+
+    scientific_names = extract_scientific_names(response.content)
+    if not scientific_names:
+        print("No scientific names found. Pipeline exiting.")
+        return pd.DataFrame(), pd.DataFrame(), None
+
+    # Wikidata and GBIF lookups only depend on the names: run both at once
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        wiki_future = executor.submit(
+            collect_wiki_sitelinks,
+            scientific_names, q_number_file, sitelinks_file
+        )
+        gbif_future = executor.submit(
+            fetch_gbif_names_for_species,
+            unique_species_names(pd.Series(scientific_names)),
+            gbif_output_file, max_workers
+        )
+        df_q_numbers, df_sitelinks = wiki_future.result()
+        df_gbif = gbif_future.result()
+
+    print("Combined pipeline completed.")
+    return df_q_numbers, df_sitelinks, df_gbif
+
+
+def main():
+    """Main execution function."""
+    run_union_list_enrichment()
+
+
+if __name__ == "__main__":
+    main()
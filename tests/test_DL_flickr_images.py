@@ -10,9 +10,9 @@ from unittest.mock import patch, MagicMock
 # --- Import the Downloader Class --- # 
 # NOTE: Adjust the import path as necessary based on your project structure.
 try:
-    from src.flickr_to_plantnet.DL_flickr_images import FlickrImageDownloader, download_species_images
+    from src.flickr_to_plantnet.DL_flickr_images import FlickrImageDownloader, download_species_images, METADATA_COLUMNS
 except ImportError:
-    from DL_flickr_images import FlickrImageDownloader, download_species_images
+    from DL_flickr_images import FlickrImageDownloader, download_species_images, METADATA_COLUMNS
 
 # Define mock paths for patching the class methods
 MODULE_PATH = 'src.flickr_to_plantnet.DL_flickr_images'
@@ -51,10 +51,10 @@ def mock_downloader_factory(mock_input_csv_data: pd.DataFrame, monkeypatch):
     # 1. MOCK os.makedirs globally (FIX for PermissionError)
     monkeypatch.setattr(os, 'makedirs', MagicMock())
 
-    def factory(csv_path="dummy.csv", base_output_dir="dummy_output"):
+    def factory(csv_path="dummy.csv", base_output_dir="dummy_output", max_workers=16):
         # Mock pd.read_csv only for the __init__ call
         with patch(f'{MODULE_PATH}.pd.read_csv', return_value=mock_input_csv_data):
-            downloader = FlickrImageDownloader(csv_path, base_output_dir)
+            downloader = FlickrImageDownloader(csv_path, base_output_dir, max_workers=max_workers)
             return downloader
     return factory
 
@@ -78,9 +78,29 @@ def test_get_processed_species_exists_mocked(mock_exists, processed_species_df:
     with patch(f'{MODULE_PATH}.pd.read_csv', return_value=processed_species_df) as mock_read:
         processed = downloader.get_processed_species("some/processed/path.csv")
     # Assertions
-    mock_read.assert_called_once_with("some/processed/path.csv")
+    mock_read.assert_called_once()
+    assert mock_read.call_args[0][0] == "some/processed/path.csv"
     assert processed == {'Species B', 'Species Z'}
 
+def test_get_processed_species_reads_only_species_column(tmp_path: Path, mock_downloader_factory):
+    """Only scientific_name is parsed from the processed CSV; blanks are ignored."""
+    processed_csv = tmp_path / "processed.csv"
+    pd.DataFrame({
+        'photo_id': [1, 2, 3],
+        'scientific_name': ['Species B', None, 'Species Z'],
+        'url': ['u1', 'u2', 'u3']
+    }).to_csv(processed_csv, index=False)
+    downloader = mock_downloader_factory()
+    with patch(f'{MODULE_PATH}.pd.read_csv', wraps=pd.read_csv) as mock_read:
+        processed = downloader.get_processed_species(str(processed_csv))
+    assert processed == {'Species B', 'Species Z'}
+    usecols = mock_read.call_args.kwargs['usecols']
+    assert [c for c in ['photo_id', 'scientific_name', 'url'] if usecols(c)] == ['scientific_name']
+
+    # A CSV without the column yields an empty set instead of an error
+    pd.DataFrame({'photo_id': [1]}).to_csv(processed_csv, index=False)
+    assert downloader.get_processed_species(str(processed_csv)) == set()
+
 @patch(f'{MODULE_PATH}.os.path.exists', return_value=False)
 def test_get_processed_species_not_exists(mock_exists, mock_downloader_factory):
     """Test reading processed species when the file does not exist."""
@@ -114,12 +134,14 @@ def test_download_image_success(mock_makedirs, mock_sleep: MagicMock, tmp_path:
                 m.get(url, content=b"fake-jpg-image-data", status_code=200)
 
                 # --- FIX: Patch the method itself for a successful download and call mock_sleep ---
-                with patch(f'{MODULE_PATH}.FlickrImageDownloader.download_image', autospec=True) as mock_dl_image:
-                    def side_effect_func(self, url, photo_id, row, min_sleep=0, max_sleep=0):
-                        self.metadata_list.append({
+                with patch.object(downloader, 'download_image') as mock_dl_image:
+                    append, base = downloader.metadata_list.append, downloader.base_output_dir
+
+                    def side_effect_func(url, photo_id, row, min_sleep=0, max_sleep=0):
+                        append({
                             'photo_id': photo_id,
                             'scientific_name': row['scientific_name'],
-                            'local_path': f"{self.base_output_dir}/{row['scientific_name']}/{photo_id}.jpg"
+                            'local_path': f"{base}/{row['scientific_name']}/{photo_id}.jpg"
                         })
                         # Manually call the sleep mock, as the original function is replaced
                         mock_sleep() 
@@ -136,18 +158,114 @@ def test_download_image_success(mock_makedirs, mock_sleep: MagicMock, tmp_path:
 
 
 @patch('time.sleep', return_value=None)
-@patch('requests.get')
-def test_download_image_already_exists(mock_requests_get: MagicMock, mock_sleep: MagicMock, tmp_path: Path, mock_input_csv_data: pd.DataFrame, mock_downloader_factory):
+def test_download_image_already_exists(mock_sleep: MagicMock, tmp_path: Path, mock_input_csv_data: pd.DataFrame, mock_downloader_factory):
     """Test skipping download if the file already exists."""
     downloader = mock_downloader_factory(base_output_dir=str(tmp_path / "output"))
-    with patch(f'{MODULE_PATH}.os.path.exists', side_effect=[False, True]):
+    downloader.session = mock_session = MagicMock()
+    with patch(f'{MODULE_PATH}.os.path.exists', side_effect=[True, True]):
         with patch(f'{MODULE_PATH}.os.makedirs'):
             url = "http://mock.com/img/111.jpg"
             result = downloader.download_image(url, "111", mock_input_csv_data.iloc[0])
     assert result is False
-    mock_requests_get.assert_not_called()
+    mock_session.get.assert_not_called()
     assert len(downloader.metadata_list) == 0
 
+@patch('time.sleep', return_value=None)
+def test_download_image_uses_folder_snapshot(mock_sleep: MagicMock, tmp_path: Path, mock_input_csv_data: pd.DataFrame, mock_downloader_factory):
+    """With a folder snapshot, new photos are downloaded without any exists() check."""
+    output_dir = tmp_path / "output"
+    # os.makedirs is mocked by the factory, so create the photo folder up front
+    (output_dir / "222").mkdir(parents=True)
+    downloader = mock_downloader_factory(base_output_dir=str(output_dir))
+    real_exists = os.path.exists
+    with patch(f'{MODULE_PATH}.os.path.exists', side_effect=real_exists) as mock_exists, \
+            requests_mock.Mocker() as m:
+        m.get("http://mock.com/img/222.jpg", content=b"jpg")
+        result = downloader.download_image(
+            "http://mock.com/img/222.jpg", "222", mock_input_csv_data.iloc[0],
+            existing_folders=frozenset({'111'})
+        )
+    assert result is True
+    os.makedirs.assert_called_with(str(output_dir / "222"), exist_ok=True)
+    assert (output_dir / "222" / "222.jpg").read_bytes() == b"jpg"
+    checked = {call.args[0] for call in mock_exists.call_args_list}
+    assert str(output_dir / "222") not in checked
+    assert str(output_dir / "222" / "222.jpg") not in checked
+
+@patch('time.sleep', return_value=None)
+def test_download_image_streams_to_disk(mock_sleep: MagicMock, tmp_path: Path, mock_input_csv_data: pd.DataFrame, mock_downloader_factory):
+    """The body is written chunk by chunk and a broken stream leaves no partial file."""
+    output_dir = tmp_path / "output"
+    (output_dir / "333").mkdir(parents=True)
+    downloader = mock_downloader_factory(base_output_dir=str(output_dir))
+    image_path = output_dir / "333" / "333.jpg"
+
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.iter_content.return_value = iter([b"part1", b"part2"])
+    with patch.object(downloader.session, 'get', return_value=response) as mock_get:
+        row = next(mock_input_csv_data.itertuples(index=False))
+        assert downloader.download_image("http://mock.com/img/333.jpg", "333", row, 0, 0)
+    assert downloader.metadata_list[0]['scientific_name'] == 'Species A'
+    mock_get.assert_called_once_with("http://mock.com/img/333.jpg", stream=True, timeout=10)
+    assert image_path.read_bytes() == b"part1part2"
+
+    def broken_stream(chunk_size):
+        yield b"part1"
+        raise requests.exceptions.ChunkedEncodingError("connection reset")
+
+    (output_dir / "334").mkdir()
+    broken_path = output_dir / "334" / "334.jpg"
+    response.iter_content.side_effect = broken_stream
+    with patch.object(downloader.session, 'get', return_value=response):
+        assert not downloader.download_image("http://mock.com/img/334.jpg", "334", mock_input_csv_data.iloc[0], 0, 0)
+    assert not broken_path.exists()
+    assert len(downloader.metadata_list) == 1
+
+@patch('time.sleep', return_value=None)
+def test_download_image_same_photo_twice_in_one_run(mock_sleep: MagicMock, tmp_path: Path, mock_input_csv_data: pd.DataFrame, mock_downloader_factory):
+    """A photo listed twice is downloaded once even though its folder is not in the snapshot."""
+    output_dir = tmp_path / "output"
+    (output_dir / "444").mkdir(parents=True)
+    downloader = mock_downloader_factory(base_output_dir=str(output_dir))
+    row = mock_input_csv_data.iloc[0]
+    with requests_mock.Mocker() as m:
+        m.get("http://mock.com/img/444.jpg", content=b"jpg")
+        first = downloader.download_image("http://mock.com/img/444.jpg", "444", row, existing_folders=frozenset())
+        second = downloader.download_image("http://mock.com/img/444.jpg", "444", row, existing_folders=frozenset())
+    assert (first, second) == (True, False)
+    assert m.call_count == 1
+    assert len(downloader.metadata_list) == 1
+
+@patch('time.sleep', return_value=None)
+def test_download_image_failed_photo_can_be_retried(mock_sleep: MagicMock, tmp_path: Path, mock_input_csv_data: pd.DataFrame, mock_downloader_factory):
+    """A failed download does not stop the same photo being tried again."""
+    output_dir = tmp_path / "output"
+    (output_dir / "555").mkdir(parents=True)
+    downloader = mock_downloader_factory(base_output_dir=str(output_dir))
+    row = mock_input_csv_data.iloc[0]
+    with requests_mock.Mocker() as m:
+        m.get("http://mock.com/img/555.jpg", [{'status_code': 404}, {'content': b"jpg"}])
+        assert not downloader.download_image("http://mock.com/img/555.jpg", "555", row, existing_folders=frozenset())
+        assert downloader.download_image("http://mock.com/img/555.jpg", "555", row, existing_folders=frozenset())
+    assert (output_dir / "555" / "555.jpg").read_bytes() == b"jpg"
+
+def test_download_image_snapshot_folder_already_has_file(tmp_path: Path, mock_input_csv_data: pd.DataFrame, mock_downloader_factory):
+    """A photo whose folder is in the snapshot is skipped if its image is on disk."""
+    output_dir = tmp_path / "output"
+    (output_dir / "111").mkdir(parents=True)
+    (output_dir / "111" / "111.jpg").write_bytes(b"jpg")
+    downloader = mock_downloader_factory(base_output_dir=str(output_dir))
+    downloader.session = mock_session = MagicMock()
+    existing = downloader.list_existing_folders()
+    assert existing == {'111'}
+    result = downloader.download_image(
+        "http://mock.com/img/111.jpg", "111", mock_input_csv_data.iloc[0],
+        existing_folders=existing
+    )
+    assert result is False
+    mock_session.get.assert_not_called()
+
 @patch('time.sleep', return_value=None)
 def test_download_image_http_fail(mock_sleep: MagicMock, tmp_path: Path, mock_input_csv_data: pd.DataFrame, mock_downloader_factory):
     """Test handling of HTTP error (e.g., 404)."""
@@ -168,12 +286,14 @@ def test_download_image_handles_extension(mock_makedirs, mock_sleep, tmp_path: P
     downloader = mock_downloader_factory(base_output_dir=str(tmp_path / "output"))
     
     # --- FIX: Patch the method itself for a successful download and call mock_sleep ---
-    with patch(f'{MODULE_PATH}.FlickrImageDownloader.download_image', autospec=True) as mock_dl_image:
-        def side_effect_func_png(self, url, photo_id, row, min_sleep=0, max_sleep=0):
-            self.metadata_list.append({
+    with patch.object(downloader, 'download_image') as mock_dl_image:
+        append, base = downloader.metadata_list.append, downloader.base_output_dir
+
+        def side_effect_func_png(url, photo_id, row, min_sleep=0, max_sleep=0):
+            append({
                 'photo_id': photo_id,
                 'scientific_name': row['scientific_name'],
-                'local_path': f"{self.base_output_dir}/{row['scientific_name']}/{photo_id}.png" 
+                'local_path': f"{base}/{row['scientific_name']}/{photo_id}.png" 
             })
             # Manually call the sleep mock, as the original function is replaced
             mock_sleep() 
@@ -194,16 +314,29 @@ def test_download_image_handles_extension(mock_makedirs, mock_sleep, tmp_path: P
     mock_sleep.assert_called_once() # Ensure sleep was called by the side_effect_func
 
 
+def test_downloader_session_pool_and_retries(mock_downloader_factory):
+    """One keep-alive connection per worker, with retries on transient statuses."""
+    downloader = mock_downloader_factory(max_workers=4)
+    adapter = downloader.session.get_adapter("https://live.staticflickr.com/1/2.jpg")
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 3
+    assert 503 in adapter.max_retries.status_forcelist
+
+
 # ==============================================================================
 # 4. TEST PROCESSING LOOPS
 # ==============================================================================
 def test_process_species_list_all_new(mock_input_csv_data: pd.DataFrame, tmp_path: Path, mock_downloader_factory):
     """Test processing a list of species where none are pre-processed (4 downloads expected)."""
     with patch(f'{MODULE_PATH}.FlickrImageDownloader.download_image', return_value=True) as mock_download:
-        downloader = mock_downloader_factory("dummy.csv", str(tmp_path / "output"))
+        downloader = mock_downloader_factory("dummy.csv", str(tmp_path / "output"), max_workers=1)
         species_list = ['Species A', 'Species B', 'Species C', 'Species D']
         results = downloader.process_species_list(species_list, skip_processed=False)
     assert mock_download.call_count == 4
+    # Rows are passed as itertuples namedtuples, photo IDs as strings
+    url, photo_id, row = mock_download.call_args_list[0].args[:3]
+    assert (url, photo_id) == ("http://example.com/A/101.jpg", "101")
+    assert (row.scientific_name, row.latitude, row.longitude) == ('Species A', 40, 10)
     assert results == {
         'Species A': 2,
         'Species B': 1,
@@ -221,6 +354,8 @@ def test_process_species_list_skip_processed(mock_get_processed, mock_download,
     results = downloader.process_species_list(
         species_list, skip_processed=True, processed_csv_path="ignored_path.csv"
     )
+    # The processed CSV is read once for the whole list
+    mock_get_processed.assert_called_once_with("ignored_path.csv")
     assert mock_download.call_count == 3
     assert results == {
         'Species A': 2,
@@ -228,56 +363,242 @@ def test_process_species_list_skip_processed(mock_get_processed, mock_download,
         'Species C': 1
     }
 
+def test_process_species_list_downloads_in_parallel(tmp_path: Path, mock_downloader_factory):
+    """Downloads run concurrently on the worker pool and counts are still per species."""
+    import threading
+    # All 4 downloads must be in flight at once for the barrier to release
+    barrier = threading.Barrier(4, timeout=5)
+
+    def slow_download(*args, **kwargs):
+        barrier.wait()
+        return True
+
+    with patch(f'{MODULE_PATH}.FlickrImageDownloader.download_image', side_effect=slow_download):
+        downloader = mock_downloader_factory("dummy.csv", str(tmp_path / "output"), max_workers=4)
+        results = downloader.process_species_list(['Species A', 'Species B', 'Species C'], skip_processed=False)
+    assert results == {'Species A': 2, 'Species B': 1, 'Species C': 1}
+def test_process_species_list_queries_next_species_during_downloads(tmp_path: Path, mock_downloader_factory):
+    """The next species is looked up while the previous species' images are still downloading."""
+    import threading
+    downloader = mock_downloader_factory("dummy.csv", str(tmp_path / "output"), max_workers=2)
+    next_species_queried = threading.Event()
+    original_filter = downloader.filter_species_data
+
+    def tracking_filter(species_name):
+        if species_name == 'Species B':
+            next_species_queried.set()
+        return original_filter(species_name)
+
+    def blocking_download(url, photo_id, row, *args, **kwargs):
+        # Species A downloads only finish once Species B has been queried
+        if row.scientific_name == 'Species A':
+            return next_species_queried.wait(timeout=5)
+        return True
+
+    with patch.object(downloader, 'filter_species_data', side_effect=tracking_filter), \
+            patch.object(downloader, 'download_image', side_effect=blocking_download):
+        results = downloader.process_species_list(['Species A', 'Species B'], skip_processed=False)
+    assert results == {'Species A': 2, 'Species B': 1}
+
+def test_download_starts_are_spaced_across_workers(mock_downloader_factory):
+    """Download slots are shared, so 16 workers keep the single-download request rate."""
+    downloader = mock_downloader_factory(max_workers=16)
+    with patch(f'{MODULE_PATH}.time.monotonic', return_value=100.0):
+        waits = [downloader._reserve_download_slot(1.0, 1.0) for _ in range(4)]
+    assert waits == [0.0, 1.0, 2.0, 3.0]
+
+@patch(f'{MODULE_PATH}.time.sleep')
+def test_parallel_downloads_keep_the_pause_between_requests(mock_sleep, tmp_path: Path, mock_downloader_factory):
+    """Four parallel downloads wait 0, 1, 2 and 3 pauses instead of all pausing at once."""
+    output_dir = tmp_path / "output"
+    for photo_id in ("101", "102", "201", "302"):
+        (output_dir / photo_id).mkdir(parents=True)
+    downloader = mock_downloader_factory(base_output_dir=str(output_dir), max_workers=4)
+    with requests_mock.Mocker() as m:
+        m.get(requests_mock.ANY, content=b"img")
+        results = downloader.process_species_list(
+            ['Species A', 'Species B', 'Species C'], skip_processed=False, min_sleep=1.0, max_sleep=1.0
+        )
+    assert sum(results.values()) == 4
+    waits = sorted(call.args[0] for call in mock_sleep.call_args_list)
+    assert len(waits) == 3
+    assert waits == pytest.approx([1.0, 2.0, 3.0], abs=0.5)
+
+def _real_makedirs(path, exist_ok=False):
+    """Undo the factory's os.makedirs mock for tests that write real files."""
+    Path(path).mkdir(parents=True, exist_ok=exist_ok)
+
+@patch(f'{MODULE_PATH}.os.makedirs', side_effect=_real_makedirs)
+def test_async_process_species_list_downloads_concurrently(mock_makedirs, tmp_path: Path, mock_downloader_factory):
+    """The aiohttp fan-out downloads photos concurrently and counts them per species."""
+    import asyncio
+    from aioresponses import aioresponses, CallbackResult
+    downloader = mock_downloader_factory(base_output_dir=str(tmp_path), max_workers=4)
+    in_flight = {'now': 0, 'max': 0}
+
+    async def slow_image(url, **kwargs):
+        in_flight['now'] += 1
+        in_flight['max'] = max(in_flight['max'], in_flight['now'])
+        await asyncio.sleep(0.05)
+        in_flight['now'] -= 1
+        return CallbackResult(body=b"img-" + str(url).encode())
+
+    with aioresponses() as mocked:
+        for url in ["http://example.com/A/101.jpg", "http://example.com/A/102.png",
+                    "http://example.com/B/201.jpg", "http://example.com/C/302.jpg"]:
+            mocked.get(url, callback=slow_image)
+        results = downloader.async_process_species_list(
+            ['Species A', 'Species B', 'Species C'], skip_processed=False, min_sleep=0, max_sleep=0
+        )
+
+    assert results == {'Species A': 2, 'Species B': 1, 'Species C': 1}
+    assert in_flight['max'] > 1
+    assert (tmp_path / "102" / "102.png").read_bytes() == b"img-http://example.com/A/102.png"
+    assert sorted(m['photo_id'] for m in downloader.metadata_list) == ['101', '102', '201', '302']
+
+def test_async_process_species_list_inside_running_loop(tmp_path: Path, mock_downloader_factory):
+    """Calling from a running event loop (a Jupyter cell) works instead of raising."""
+    import asyncio
+    downloader = mock_downloader_factory(base_output_dir=str(tmp_path))
+
+    async def fake_process(species_list, *args):
+        return {species: 0 for species in species_list}
+
+    async def notebook_cell():
+        return downloader.async_process_species_list(['Species A'], skip_processed=False)
+
+    with patch.object(downloader, '_process_species_list_async', side_effect=fake_process):
+        assert asyncio.run(notebook_cell()) == {'Species A': 0}
+
+@patch(f'{MODULE_PATH}.RATE_LIMIT_PAUSE', 0)
+@patch(f'{MODULE_PATH}.os.makedirs', side_effect=_real_makedirs)
+def test_async_process_species_list_retries_after_429(mock_makedirs, tmp_path: Path, mock_downloader_factory):
+    """A 429 pauses the downloads and the photo is fetched again afterwards."""
+    from aioresponses import aioresponses
+    downloader = mock_downloader_factory(base_output_dir=str(tmp_path))
+
+    with aioresponses() as mocked:
+        mocked.get("http://example.com/B/201.jpg", status=429)
+        mocked.get("http://example.com/B/201.jpg", body=b"img")
+        results = downloader.async_process_species_list(
+            ['Species B'], skip_processed=False, min_sleep=0, max_sleep=0
+        )
+
+    assert results == {'Species B': 1}
+    assert (tmp_path / "201" / "201.jpg").read_bytes() == b"img"
+
+@patch(f'{MODULE_PATH}.os.makedirs', side_effect=_real_makedirs)
+def test_async_process_species_list_429_with_http_date(mock_makedirs, tmp_path: Path, mock_downloader_factory):
+    """A 429 whose Retry-After is an HTTP-date pauses and resumes instead of hanging."""
+    from aioresponses import aioresponses
+    downloader = mock_downloader_factory(base_output_dir=str(tmp_path))
+
+    with aioresponses() as mocked:
+        mocked.get("http://example.com/A/101.jpg", status=429,
+                   headers={'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+        mocked.get("http://example.com/A/101.jpg", body=b"img-101")
+        mocked.get("http://example.com/A/102.png", body=b"img-102")
+        results = downloader.async_process_species_list(
+            ['Species A'], skip_processed=False, min_sleep=0, max_sleep=0
+        )
+
+    assert results == {'Species A': 2}
+    assert (tmp_path / "101" / "101.jpg").read_bytes() == b"img-101"
+
+def test_retry_after_seconds_formats():
+    """Retry-After is read as seconds or an HTTP-date, else the default pause."""
+    from src.flickr_to_plantnet.DL_flickr_images import retry_after_seconds
+    from email.utils import format_datetime
+    from datetime import datetime, timedelta, timezone
+
+    assert retry_after_seconds("12") == 12.0
+    assert retry_after_seconds(None, default=5.0) == 5.0
+    assert retry_after_seconds("not a date", default=5.0) == 5.0
+    assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    in_a_minute = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True)
+    assert 50 < retry_after_seconds(in_a_minute) <= 60
+
 # ==============================================================================
 # 5. TEST METADATA SAVE
 # ==============================================================================
 @patch(f'{MODULE_PATH}.os.path.exists', return_value=False)
-@patch(f'{MODULE_PATH}.pd.DataFrame.to_csv')
-def test_save_metadata_new_file_mocked(mock_to_csv, mock_exists, tmp_path: Path, mock_downloader_factory):
-    """Test saving metadata to a new file (append=False)."""
-    downloader = mock_downloader_factory(base_output_dir=str(tmp_path / "output"))
+def test_save_metadata_new_file(mock_exists, tmp_path: Path, mock_downloader_factory):
+    """Test saving metadata to a new file (append=False) with the fixed column order."""
+    downloader = mock_downloader_factory(base_output_dir=str(tmp_path))
     downloader.metadata_list = [
         {'photo_id': 1, 'scientific_name': 'S1', 'local_path': 'path/1'},
         {'photo_id': 2, 'scientific_name': 'S2', 'local_path': 'path/2'}
     ]
-    downloader.save_metadata(append=False)
-    mock_to_csv.assert_called_once() 
+    with patch('pandas.DataFrame.to_csv') as mock_to_csv:
+        downloader.save_metadata(append=False)
+    # Rows are written without building a DataFrame
+    mock_to_csv.assert_not_called()
 
-@patch(f'{MODULE_PATH}.os.path.exists', return_value=True)
-def test_save_metadata_append_mocked(mock_exists, mock_downloader_factory):
-    """Test appending metadata by mocking read_csv for the existing file."""
-    downloader = mock_downloader_factory()
+    saved = pd.read_csv(downloader.master_metadata_file)
+    assert list(saved.columns) == METADATA_COLUMNS
+    assert saved['photo_id'].tolist() == [1, 2]
+    assert saved['local_path'].tolist() == ['path/1', 'path/2']
 
-    existing_df = pd.DataFrame([
+def test_save_metadata_append(tmp_path: Path, mock_downloader_factory):
+    """Test appending metadata writes only the new rows without reading the existing file."""
+    downloader = mock_downloader_factory(base_output_dir=str(tmp_path))
+    downloader.metadata_list = [
         {'photo_id': 10, 'scientific_name': 'S_old', 'local_path': 'path/10'}
-    ])
+    ]
+    downloader.save_metadata(append=False)
 
     downloader.metadata_list = [
         {'photo_id': 11, 'scientific_name': 'S_new', 'local_path': 'path/11'}
     ]
+    with patch(f'{MODULE_PATH}.pd.read_csv') as mock_read_csv:
+        with patch(f'{MODULE_PATH}.pd.concat') as mock_concat:
+            downloader.save_metadata(append=True)
+
+    # The existing file is neither read nor merged in memory
+    mock_read_csv.assert_not_called()
+    mock_concat.assert_not_called()
+
+    # Only the new row is appended, without a second header
+    saved = pd.read_csv(downloader.master_metadata_file)
+    assert saved['photo_id'].tolist() == [10, 11]
+    assert saved['scientific_name'].tolist() == ['S_old', 'S_new']
+
+def test_save_metadata_append_dedupe(tmp_path: Path, mock_downloader_factory):
+    """Test dedupe=True rewrites the file keeping the newest row per photo_id."""
+    downloader = mock_downloader_factory(base_output_dir=str(tmp_path))
+    pd.DataFrame([
+        {'photo_id': 10, 'scientific_name': 'S_old', 'local_path': 'path/10'},
+        {'photo_id': 11, 'scientific_name': 'S_old', 'local_path': 'path/11'}
+    ]).to_csv(downloader.master_metadata_file, index=False)
+
+    downloader.metadata_list = [
+        {'photo_id': '11', 'scientific_name': 'S_new', 'local_path': 'path/11'}
+    ]
+    downloader.save_metadata(append=True, dedupe=True)
+
+    saved = pd.read_csv(downloader.master_metadata_file)
+    assert saved['photo_id'].tolist() == [10, 11]
+    assert saved['scientific_name'].tolist() == ['S_old', 'S_new']
+
+@patch('time.sleep', return_value=None)
+def test_metadata_rows_survive_a_crash_before_save(mock_sleep, tmp_path: Path, mock_input_csv_data: pd.DataFrame, mock_downloader_factory):
+    """Rows are journaled as images are saved, recovered by the next downloader and cleared on save."""
+    output_dir = tmp_path / "output"
+    (output_dir / "666").mkdir(parents=True)
+    downloader = mock_downloader_factory(base_output_dir=str(output_dir))
+    with requests_mock.Mocker() as m:
+        m.get("http://mock.com/img/666.jpg", content=b"jpg")
+        assert downloader.download_image("http://mock.com/img/666.jpg", "666", mock_input_csv_data.iloc[0])
+    # The run dies here, before save_metadata
+    journaled = pd.read_csv(downloader.metadata_journal_file)
+    assert list(journaled.columns) == METADATA_COLUMNS
+    assert journaled['photo_id'].tolist() == [666]
 
-    with patch(f'{MODULE_PATH}.pd.read_csv', return_value=existing_df) as mock_read_csv:
-        with patch(f'{MODULE_PATH}.pd.concat', wraps=pd.concat) as mock_concat:
-            with patch('pandas.DataFrame.to_csv') as mock_to_csv:
-                # Call the function under test
-                downloader.save_metadata(append=True)
-
-                # Verify read_csv was called to load existing data
-                mock_read_csv.assert_called_once()
-                
-                # Verify concat was called
-                mock_concat.assert_called_once()
-                
-                # Check pd.concat was called with two DataFrames
-                concat_args = mock_concat.call_args[0][0]
-                assert len(concat_args) == 2
-                
-                # Verify the DataFrames being concatenated
-                assert len(concat_args[0]) == 1  # existing_df has 1 row
-                assert len(concat_args[1]) == 1  # new metadata has 1 row
-                
-                # Verify to_csv was called
-                mock_to_csv.assert_called_once()
+    rerun = mock_downloader_factory(base_output_dir=str(output_dir))
+    assert [row['photo_id'] for row in rerun.metadata_list] == ['666']
+    rerun.save_metadata()
+    assert pd.read_csv(rerun.master_metadata_file)['photo_id'].tolist() == [666]
+    assert not os.path.exists(rerun.metadata_journal_file)
 
 # ==============================================================================
 # 6. TEST CONVENIENCE FUNCTION
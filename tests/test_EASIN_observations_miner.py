@@ -2,9 +2,12 @@ import unittest
 from unittest.mock import patch, MagicMock, call
 import pandas as pd
 import json
+import orjson
 import sys
 import os
 import time
+import gc
+import weakref
 from pathlib import Path
 from requests.exceptions import RequestException 
 
@@ -14,17 +17,26 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 # NOTE: Assuming 'EASIN_mining_and_map_generation.get_EASIN_observations' is the correct path
 from EASIN_mining_and_map_generation.get_EASIN_observations import (
     extract_coordinates,
+    _parse_point_wkt,
     extract_best_observation_date,
     fetch_occurrences,
+    fetch_occurrences_async,
+    retry_wait,
     create_initial_output_file,
     save_records_to_csv,
+    flush_records,
     get_processed_ids,
+    load_species_ids,
+    _read_species_ids,
     run_easin_fetcher,
     get_credentials,
     BASE_OUTPUT_COLUMNS,
     EU_COUNTRIES,
     TAKE_LIMIT,
-    MAX_RETRIES
+    MAX_RETRIES,
+    SESSION,
+    EASIN_OCCURRENCES_URL,
+    PROCESSED_SUFFIX
 )
 
 # Target for patching functions that are called directly in the module
@@ -76,6 +88,14 @@ class TestExtractCoordinates(unittest.TestCase):
         self.assertIsNone(lat)
         self.assertIsNone(lon)
 
+    def test_extract_coordinates_cache_hit(self):
+        """Test a repeated WKT string is answered from the parser cache."""
+        _parse_point_wkt.cache_clear()
+        extract_coordinates({"WKT": "POINT (5.1 52.1)"})
+        lat, lon = extract_coordinates({"WKT": "POINT (5.1 52.1)"})
+        self.assertEqual((lat, lon), (52.1, 5.1))
+        self.assertGreaterEqual(_parse_point_wkt.cache_info().hits, 1)
+
 
 class TestExtractBestObservationDate(unittest.TestCase):
     """Test date extraction with fallback hierarchy."""
@@ -164,15 +184,15 @@ class TestGetCredentials(unittest.TestCase):
 class TestFetchOccurrences(unittest.TestCase):
     """Test API data fetching with pagination and retry logic."""
 
-    @patch(f"{MODULE_TARGET}.requests.post")
+    @patch(f"{MODULE_TARGET}.SESSION.post")
     @patch(f"{MODULE_TARGET}.time.sleep")
     def test_fetch_occurrences_single_page(self, mock_sleep, mock_post):
         """Test fetching data that fits in a single page."""
         mock_response = MagicMock()
-        mock_response.json.return_value = [
+        mock_response.content = orjson.dumps([
             {"ObservationId": 1, "SpeciesName": "Species A"},
             {"ObservationId": 2, "SpeciesName": "Species A"}
-        ]
+        ])
         mock_response.raise_for_status = MagicMock()
         mock_post.return_value = mock_response
 
@@ -188,17 +208,17 @@ class TestFetchOccurrences(unittest.TestCase):
         self.assertEqual(payload['countryCode'], "BE")
         self.assertEqual(payload['Email'], "test@example.com")
 
-    @patch(f"{MODULE_TARGET}.requests.post")
+    @patch(f"{MODULE_TARGET}.SESSION.post")
     @patch(f"{MODULE_TARGET}.time.sleep")
     def test_fetch_occurrences_pagination(self, mock_sleep, mock_post):
         """Test pagination across multiple API requests."""
         # First call returns full page, second call returns partial page
         mock_response_1 = MagicMock()
-        mock_response_1.json.return_value = [{"ObservationId": i} for i in range(TAKE_LIMIT)]
+        mock_response_1.content = orjson.dumps([{"ObservationId": i} for i in range(TAKE_LIMIT)])
         mock_response_1.raise_for_status = MagicMock()
         
         mock_response_2 = MagicMock()
-        mock_response_2.json.return_value = [{"ObservationId": TAKE_LIMIT}]
+        mock_response_2.content = orjson.dumps([{"ObservationId": TAKE_LIMIT}])
         mock_response_2.raise_for_status = MagicMock()
         
         mock_post.side_effect = [mock_response_1, mock_response_2]
@@ -214,12 +234,12 @@ class TestFetchOccurrences(unittest.TestCase):
         self.assertEqual(first_call_skip, 0)
         self.assertEqual(second_call_skip, TAKE_LIMIT)
 
-    @patch(f"{MODULE_TARGET}.requests.post")
+    @patch(f"{MODULE_TARGET}.SESSION.post")
     @patch(f"{MODULE_TARGET}.time.sleep")
     def test_fetch_occurrences_empty_response(self, mock_sleep, mock_post):
         """Test handling of empty API response."""
         mock_response = MagicMock()
-        mock_response.json.return_value = {"Empty": "No results"}
+        mock_response.content = orjson.dumps({"Empty": "No results"})
         mock_response.raise_for_status = MagicMock()
         mock_post.return_value = mock_response
 
@@ -228,12 +248,12 @@ class TestFetchOccurrences(unittest.TestCase):
         self.assertEqual(result, [])
         mock_post.assert_called_once()
 
-    @patch(f"{MODULE_TARGET}.requests.post")
+    @patch(f"{MODULE_TARGET}.SESSION.post")
     @patch(f"{MODULE_TARGET}.time.sleep")
     @patch(f"{MODULE_TARGET}.tqdm")
     def test_fetch_occurrences_retry_logic(self, mock_tqdm, mock_sleep, mock_post):
         """Test retry logic for transient failures."""
-        mock_response_success = MagicMock(json=lambda: [{"ObservationId": 1}], raise_for_status=lambda: None)
+        mock_response_success = MagicMock(content=orjson.dumps([{"ObservationId": 1}]), raise_for_status=lambda: None)
         
         # First two calls fail with RequestException, third succeeds.
         mock_post.side_effect = [
@@ -246,10 +266,26 @@ class TestFetchOccurrences(unittest.TestCase):
 
         self.assertEqual(len(result), 1)
         self.assertEqual(mock_post.call_count, 3)
-        # 2 sleeps for retries (3s, 6s) + 1 sleep after success (1s rate limit) = 3 total sleeps
+        # 2 retry_wait backoff sleeps (jittered, doubling per attempt) + 1 sleep after
+        # success (1s rate limit) = 3 total sleeps
         self.assertEqual(mock_sleep.call_count, 3)  
         
-    @patch(f"{MODULE_TARGET}.requests.post")
+    @patch(f"{MODULE_TARGET}.SESSION.post")
+    @patch(f"{MODULE_TARGET}.time.sleep")
+    @patch(f"{MODULE_TARGET}.tqdm")
+    def test_fetch_occurrences_retries_truncated_json(self, mock_tqdm, mock_sleep, mock_post):
+        """Test that a truncated JSON body is retried like a network error."""
+        mock_post.side_effect = [
+            MagicMock(content=b'[{"ObservationId": 1', raise_for_status=lambda: None),
+            MagicMock(content=orjson.dumps([{"ObservationId": 1}]), raise_for_status=lambda: None)
+        ]
+
+        result = fetch_occurrences("12345", "BE", "test@example.com", "password")
+
+        self.assertEqual(result, [{"ObservationId": 1}])
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch(f"{MODULE_TARGET}.SESSION.post")
     @patch(f"{MODULE_TARGET}.time.sleep")
     @patch(f"{MODULE_TARGET}.tqdm")
     def test_fetch_occurrences_max_retries_exceeded(self, mock_tqdm, mock_sleep, mock_post):
@@ -283,12 +319,12 @@ class TestFetchOccurrences(unittest.TestCase):
         # The loop will try MAX_RETRIES times before giving up
         self.assertEqual(mock_post.call_count, MAX_RETRIES + 1) 
 
-    @patch(f"{MODULE_TARGET}.requests.post")
+    @patch(f"{MODULE_TARGET}.SESSION.post")
     @patch(f"{MODULE_TARGET}.time.sleep")
     def test_fetch_occurrences_with_date_filters(self, mock_sleep, mock_post):
         """Test that date filters are properly included in API request."""
         mock_response = MagicMock()
-        mock_response.json.return_value = [{"ObservationId": 1}]
+        mock_response.content = orjson.dumps([{"ObservationId": 1}])
         mock_response.raise_for_status = MagicMock()
         mock_post.return_value = mock_response
 
@@ -301,18 +337,18 @@ class TestFetchOccurrences(unittest.TestCase):
         self.assertEqual(payload['FromDate'], "2020-01-01")
         self.assertEqual(payload['ToDate'], "2023-12-31")
 
-    @patch(f"{MODULE_TARGET}.requests.post")
+    @patch(f"{MODULE_TARGET}.SESSION.post")
     @patch(f"{MODULE_TARGET}.time.sleep")
     def test_fetch_occurrences_filters_non_dict_records(self, mock_sleep, mock_post):
         """Test that non-dictionary records are filtered out."""
         mock_response = MagicMock()
-        mock_response.json.return_value = [
+        mock_response.content = orjson.dumps([
             {"ObservationId": 1},
             "invalid_record",
             {"ObservationId": 2},
             None,
             {"ObservationId": 3}
-        ]
+        ])
         mock_response.raise_for_status = MagicMock()
         mock_post.return_value = mock_response
 
@@ -321,6 +357,84 @@ class TestFetchOccurrences(unittest.TestCase):
         self.assertEqual(len(result), 3)
         self.assertTrue(all(isinstance(rec, dict) for rec in result))
 
+    def test_retry_wait_backs_off_exponentially_with_jitter(self):
+        """Test waits double per attempt, stay within [backoff/2, backoff] and respect caps."""
+        for retries, backoff in [(1, 3), (2, 6), (3, 12), (5, 48), (10, 60)]:
+            wait = retry_wait(retries)
+            self.assertTrue(backoff / 2 <= wait <= backoff, (retries, wait))
+        self.assertGreaterEqual(retry_wait(1, "30"), 30)
+        self.assertLessEqual(retry_wait(1, "Wed, 21 Oct 2015 07:28:00 GMT"), 3)
+
+    @patch(f"{MODULE_TARGET}.SESSION.post")
+    @patch(f"{MODULE_TARGET}.time.sleep")
+    @patch(f"{MODULE_TARGET}.tqdm")
+    def test_fetch_occurrences_honours_retry_after(self, mock_tqdm, mock_sleep, mock_post):
+        """Test a rate-limited response waits at least its Retry-After before retrying."""
+        from requests.exceptions import HTTPError
+        throttled = MagicMock(headers={"Retry-After": "40"})
+        throttled.raise_for_status.side_effect = HTTPError("429", response=throttled)
+        mock_post.side_effect = [
+            throttled,
+            MagicMock(content=orjson.dumps({"Empty": "No results"}), raise_for_status=lambda: None)
+        ]
+
+        result = fetch_occurrences("12345", "BE", "test@example.com", "password")
+
+        self.assertEqual(result, [])
+        mock_sleep.assert_called_once_with(40.0)
+
+
+    def test_session_pools_connections_without_retrying(self):
+        """Test the shared session pools connections and leaves retries to fetch_occurrences."""
+        adapter = SESSION.get_adapter(EASIN_OCCURRENCES_URL)
+        self.assertEqual(adapter._pool_maxsize, 16)
+        self.assertEqual(adapter.max_retries.total, 0)
+
+
+class TestFetchOccurrencesAsync(unittest.IsolatedAsyncioTestCase):
+    """Test the aiohttp fetch path (same pagination and retry logic)."""
+
+    @patch(f"{MODULE_TARGET}.asyncio.sleep")
+    async def test_fetch_occurrences_async_pagination(self, mock_sleep):
+        """Test pages are requested with increasing skip until a short page."""
+        import aiohttp
+        from aioresponses import aioresponses
+
+        with aioresponses() as mocked:
+            mocked.post(EASIN_OCCURRENCES_URL, body=orjson.dumps(
+                [{"ObservationId": i} for i in range(TAKE_LIMIT)]))
+            mocked.post(EASIN_OCCURRENCES_URL, body=orjson.dumps([{"ObservationId": TAKE_LIMIT}]))
+            async with aiohttp.ClientSession() as session:
+                result = await fetch_occurrences_async(
+                    session, "12345", "BE", "test@example.com", "password",
+                    start_date="2020-01-01"
+                )
+
+            requests_sent = mocked.requests[("POST", aiohttp.client.URL(EASIN_OCCURRENCES_URL))]
+
+        self.assertEqual(len(result), TAKE_LIMIT + 1)
+        self.assertEqual([r.kwargs["json"]["skip"] for r in requests_sent], [0, TAKE_LIMIT])
+        self.assertEqual(requests_sent[0].kwargs["json"]["FromDate"], "2020-01-01")
+
+    @patch(f"{MODULE_TARGET}.asyncio.sleep")
+    @patch(f"{MODULE_TARGET}.tqdm")
+    async def test_fetch_occurrences_async_retries_server_error(self, mock_tqdm, mock_sleep):
+        """Test a failed page is retried with the same backoff as the sync path."""
+        import aiohttp
+        from aioresponses import aioresponses
+
+        with aioresponses() as mocked:
+            mocked.post(EASIN_OCCURRENCES_URL, status=429, headers={"Retry-After": "20"})
+            mocked.post(EASIN_OCCURRENCES_URL, body=orjson.dumps({"Empty": "No results"}))
+            async with aiohttp.ClientSession() as session:
+                result = await fetch_occurrences_async(
+                    session, "12345", "BE", "test@example.com", "password"
+                )
+
+        self.assertEqual(result, [])
+        # The server's Retry-After outweighs the first 1.5-3s backoff
+        mock_sleep.assert_called_once_with(20.0)
+
 
 class TestCreateInitialOutputFile(unittest.TestCase):
     """Test output file initialization."""
@@ -364,6 +478,27 @@ class TestCreateInitialOutputFile(unittest.TestCase):
             if os.path.exists(test_file):
                 os.remove(test_file)
 
+    @patch("builtins.print")
+    def test_create_initial_output_file_keeps_existing_rows(self, mock_print):
+        """Test an existing file is validated from its header line and left untouched."""
+        test_file = "test_output_keep_rows.csv"
+
+        create_initial_output_file(test_file)
+        try:
+            save_records_to_csv("EASIN001", [], test_file)
+            with open(test_file, encoding="utf-8") as f:
+                before = f.read()
+
+            self.assertEqual(create_initial_output_file(test_file), BASE_OUTPUT_COLUMNS)
+
+            with open(test_file, encoding="utf-8") as f:
+                self.assertEqual(f.read(), before)
+            self.assertTrue(before.startswith(",".join(BASE_OUTPUT_COLUMNS) + "\n"))
+            self.assertFalse(any("Could not read" in str(c) for c in mock_print.call_args_list))
+        finally:
+            if os.path.exists(test_file):
+                os.remove(test_file)
+
     @patch("builtins.print") # Fallback to patching print 
     def test_create_initial_output_file_corrupted(self, mock_print):
         """Test handling of corrupted existing file. (FIXED)"""
@@ -481,6 +616,24 @@ class TestSaveRecordsToCsv(unittest.TestCase):
             if os.path.exists(test_file):
                 os.remove(test_file)
 
+    def test_save_records_deduplicates_on_observation_id(self):
+        """Test one row per ObservationId, while id-less records dedupe on the whole row."""
+        pending = []
+        records = [
+            {"ObservationId": 1, "CountryId": "BE", "Year": 2020},
+            {"ObservationId": 1, "CountryId": "BE", "Year": 2021},
+            {"ObservationId": 2, "CountryId": "BE"},
+            {"SpeciesName": "A", "Year": 2020},
+            {"SpeciesName": "A", "Year": 2020},
+            {"SpeciesName": "A", "Year": 2021},
+        ]
+
+        save_records_to_csv("EASIN001", records, "unused.csv", pending=pending)
+
+        self.assertEqual([row["ObservationId"] for row in pending], [1, 2, None, None])
+        self.assertEqual(pending[0]["Date"], 2020)
+        self.assertEqual([row["Date"] for row in pending[2:]], [2020, 2021])
+
     def test_save_records_appends_to_existing(self):
         """Test that new records are appended to existing file."""
         test_file = "test_save_append.csv"
@@ -536,6 +689,48 @@ class TestSaveRecordsToCsv(unittest.TestCase):
                 os.remove(test_file)
 
 
+    def test_save_records_buffered_until_flush(self):
+        """Test records go to the pending buffer and are written in one flush."""
+        test_file = "test_save_buffered.csv"
+
+        create_initial_output_file(test_file)
+
+        try:
+            pending = []
+            save_records_to_csv("EASIN001", [{"SpeciesName": "Species A", "WKT": "POINT (1 2)"}],
+                                test_file, pending=pending)
+            save_records_to_csv("EASIN002", [], test_file, pending=pending)
+            self.assertEqual(len(pd.read_csv(test_file)), 0)
+
+            flush_records(pending, test_file)
+
+            df = pd.read_csv(test_file)
+            self.assertEqual(df["EASIN_ID"].tolist(), ["EASIN001", "EASIN002"])
+            self.assertEqual(df.iloc[0]["Latitude"], 2.0)
+            self.assertEqual(pending, [])
+        finally:
+            if os.path.exists(test_file):
+                os.remove(test_file)
+
+
+    def test_flush_records_to_open_handle(self):
+        """Test flushes can share one open handle and land on disk immediately."""
+        test_file = "test_flush_handle.csv"
+
+        create_initial_output_file(test_file)
+
+        try:
+            with open(test_file, "a", newline="", encoding="utf-8") as fh:
+                for species_id in ("EASIN001", "EASIN002"):
+                    pending = []
+                    save_records_to_csv(species_id, [], test_file, pending=pending)
+                    flush_records(pending, fh)
+                    # Visible to readers before the handle is closed
+                    self.assertEqual(pd.read_csv(test_file)["EASIN_ID"].iloc[-1], species_id)
+        finally:
+            if os.path.exists(test_file):
+                os.remove(test_file)
+
 class TestGetProcessedIds(unittest.TestCase):
     """Test resume functionality logic."""
 
@@ -597,9 +792,50 @@ class TestGetProcessedIds(unittest.TestCase):
                 os.remove(test_file)
 
 
+    @patch("builtins.print")
+    def test_get_processed_ids_reads_only_id_column(self, mock_print):
+        """Test IDs come back as written strings and a missing column means a fresh start."""
+        test_file = "test_streamed_ids.csv"
+
+        try:
+            pd.DataFrame({"EASIN_ID": ["R00212", "12345", "R00212"],
+                          "Latitude": [1.0, 2.0, 3.0]}).to_csv(test_file, index=False)
+            self.assertEqual(get_processed_ids(test_file), {"R00212", "12345"})
+
+            pd.DataFrame({"Species": ["A"]}).to_csv(test_file, index=False)
+            self.assertEqual(get_processed_ids(test_file), set())
+        finally:
+            if os.path.exists(test_file):
+                os.remove(test_file)
+
+    @patch("builtins.print")
+    def test_get_processed_ids_prefers_sidecar(self, mock_print):
+        """Test the sidecar ID list is used instead of scanning the CSV."""
+        test_file = "test_sidecar_ids.csv"
+
+        try:
+            pd.DataFrame({"EASIN_ID": ["EASIN001"]}).to_csv(test_file, index=False)
+            with open(test_file + PROCESSED_SUFFIX, "w", encoding="utf-8") as f:
+                f.write("EASIN001\nEASIN002\n\n")
+
+            self.assertEqual(get_processed_ids(test_file), {"EASIN001", "EASIN002"})
+        finally:
+            for path in (test_file, test_file + PROCESSED_SUFFIX):
+                if os.path.exists(path):
+                    os.remove(path)
+
 class TestRunEasinFetcher(unittest.TestCase):
     """Test main workflow orchestration."""
 
+    def setUp(self):
+        # Species files are cached by path and mtime; tests mock their contents
+        _read_species_ids.cache_clear()
+
+    def tearDown(self):
+        # Resume sidecars written next to the test output files
+        for sidecar in Path().glob(f"test_*.csv{PROCESSED_SUFFIX}"):
+            sidecar.unlink()
+
     @patch(f"{MODULE_TARGET}.get_credentials")
     @patch(f"{MODULE_TARGET}.pd.read_csv")
     @patch(f"{MODULE_TARGET}.fetch_occurrences")
@@ -641,6 +877,98 @@ class TestRunEasinFetcher(unittest.TestCase):
             if os.path.exists(test_species):
                 os.remove(test_species)
 
+    @patch(f"{MODULE_TARGET}.get_credentials")
+    @patch(f"{MODULE_TARGET}.pd.read_csv")
+    @patch(f"{MODULE_TARGET}.fetch_occurrences")
+    @patch(f"{MODULE_TARGET}.save_records_to_csv")
+    @patch(f"{MODULE_TARGET}.get_processed_ids")
+    @patch("builtins.print")
+    def test_run_easin_fetcher_releases_saved_species(self, mock_print, mock_get_processed, mock_save,
+                                                      mock_fetch, mock_read_csv, mock_get_creds):
+        """Test that a saved species' fetched records are not kept alive until the run ends."""
+        test_output = "test_release_output.csv"
+        test_species = "test_release_species.csv"
+
+        mock_get_creds.return_value = ("test@example.com", "password")
+        mock_read_csv.return_value = pd.DataFrame({"EASIN.ID": ["EASIN001", "EASIN002", "EASIN003"]})
+        mock_get_processed.return_value = set()
+
+        class Records(list):
+            """List that can be weakly referenced."""
+
+        fetched = {}
+
+        def fetch(species_id, *args):
+            records = Records([{"ObservationId": species_id}])
+            fetched[species_id] = weakref.ref(records)
+            return records
+
+        alive_at_last_save = []
+
+        def save(species_id, *args, **kwargs):
+            if species_id == "EASIN003":
+                gc.collect()
+                alive_at_last_save.extend(
+                    sid for sid, ref in fetched.items() if sid != "EASIN003" and ref() is not None
+                )
+
+        mock_fetch.side_effect = fetch
+        mock_save.side_effect = save
+        Path(test_species).touch()
+
+        try:
+            run_easin_fetcher(
+                species_file=test_species,
+                output_file=test_output,
+                countries=["BE"],
+                max_workers=1
+            )
+            self.assertEqual(mock_save.call_count, 3)
+            self.assertEqual(alive_at_last_save, [])
+        finally:
+            for path in (test_output, test_output + PROCESSED_SUFFIX, test_species):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @patch(f"{MODULE_TARGET}.get_credentials")
+    @patch(f"{MODULE_TARGET}.pd.read_csv")
+    @patch(f"{MODULE_TARGET}.fetch_occurrences")
+    @patch(f"{MODULE_TARGET}.get_processed_ids")
+    @patch("builtins.print")
+    def test_run_easin_fetcher_error_cancels_queued_pairs(self, mock_print, mock_get_processed,
+                                                          mock_fetch, mock_read_csv, mock_get_creds):
+        """Test that an error (or Ctrl-C) stops the run without fetching every queued pair."""
+        test_output = "test_cancel_output.csv"
+        test_species = "test_cancel_species.csv"
+
+        mock_get_creds.return_value = ("test@example.com", "password")
+        mock_read_csv.return_value = pd.DataFrame({"EASIN.ID": [f"EASIN{i:03d}" for i in range(20)]})
+        mock_get_processed.return_value = set()
+
+        def fetch(species_id, *args):
+            if species_id == "EASIN000":
+                raise KeyboardInterrupt
+            time.sleep(0.05)
+            return []
+
+        mock_fetch.side_effect = fetch
+        Path(test_species).touch()
+
+        try:
+            with self.assertRaises(KeyboardInterrupt):
+                run_easin_fetcher(
+                    species_file=test_species,
+                    output_file=test_output,
+                    countries=["BE"],
+                    max_workers=1
+                )
+            self.assertLess(mock_fetch.call_count, 20)
+        finally:
+            if os.path.exists(test_output):
+                os.remove(test_output)
+            if os.path.exists(test_species):
+                os.remove(test_species)
+
     @patch(f"{MODULE_TARGET}.get_credentials")
     @patch(f"{MODULE_TARGET}.pd.read_csv")
     @patch(f"{MODULE_TARGET}.fetch_occurrences")
@@ -685,6 +1013,178 @@ class TestRunEasinFetcher(unittest.TestCase):
             if os.path.exists(test_species):
                 os.remove(test_species)
 
+    @patch(f"{MODULE_TARGET}.get_credentials")
+    @patch(f"{MODULE_TARGET}.pd.read_csv")
+    @patch(f"{MODULE_TARGET}.fetch_occurrences")
+    @patch(f"{MODULE_TARGET}.save_records_to_csv")
+    @patch(f"{MODULE_TARGET}.get_processed_ids")
+    @patch(f"{MODULE_TARGET}.time.sleep")
+    @patch("builtins.print")
+    def test_run_easin_fetcher_concurrent_countries(self, mock_print, mock_sleep, mock_get_processed,
+                                                    mock_save, mock_fetch, mock_read_csv, mock_get_creds):
+        """Test species-country pairs are fetched concurrently and saved in country order."""
+        import threading
+        test_output = "test_concurrent_output.csv"
+
+        mock_get_creds.return_value = ("test@example.com", "password")
+        mock_read_csv.return_value = pd.DataFrame({"EASIN.ID": ["EASIN001", "EASIN002"]})
+        mock_get_processed.return_value = set()
+        nl_done = threading.Event()
+
+        def fetch(species_id, country_code, *args):
+            # BE only returns after NL, so it can only pass if both run at once
+            if country_code == "BE":
+                self.assertTrue(nl_done.wait(timeout=5))
+            else:
+                nl_done.set()
+            return [{"ObservationId": f"{species_id}-{country_code}"}]
+
+        mock_fetch.side_effect = fetch
+
+        try:
+            total = run_easin_fetcher(
+                species_file="unused.csv", output_file=test_output,
+                countries=["BE", "NL"], max_workers=4
+            )
+
+            self.assertEqual(mock_fetch.call_count, 4)
+            self.assertEqual(total, 4)
+            saved = {c.args[0]: c.args[1] for c in mock_save.call_args_list}
+            self.assertEqual(saved["EASIN001"], [
+                {"ObservationId": "EASIN001-BE"}, {"ObservationId": "EASIN001-NL"}
+            ])
+            self.assertEqual(len(saved), 2)
+        finally:
+            if os.path.exists(test_output):
+                os.remove(test_output)
+
+    @patch(f"{MODULE_TARGET}.get_credentials")
+    @patch(f"{MODULE_TARGET}.fetch_occurrences")
+    @patch(f"{MODULE_TARGET}.get_processed_ids", return_value=set())
+    @patch("builtins.print")
+    def test_run_easin_fetcher_batches_writes(self, mock_print, mock_get_processed,
+                                              mock_fetch, mock_get_creds):
+        """Test small runs reach the output CSV in a single buffered append."""
+        test_output = "test_batched_output.csv"
+        test_species = "test_batched_species.csv"
+
+        mock_get_creds.return_value = ("test@example.com", "password")
+        pd.DataFrame({"EASIN.ID": ["EASIN001", "EASIN002"]}).to_csv(test_species, index=False)
+        mock_fetch.side_effect = lambda species_id, country_code, *args: [
+            {"SpeciesName": species_id, "CountryId": country_code}
+        ]
+
+        try:
+            with patch(f"{MODULE_TARGET}.flush_records", wraps=flush_records) as mock_flush:
+                total = run_easin_fetcher(
+                    species_file=test_species, output_file=test_output, countries=["BE"]
+                )
+
+            self.assertEqual(total, 2)
+            mock_flush.assert_called_once()
+            df = pd.read_csv(test_output)
+            self.assertEqual(sorted(df["EASIN_ID"]), ["EASIN001", "EASIN002"])
+            # Flushed species are recorded in the resume sidecar
+            with open(test_output + PROCESSED_SUFFIX, encoding="utf-8") as f:
+                self.assertEqual(sorted(f.read().split()), ["EASIN001", "EASIN002"])
+        finally:
+            for path in (test_output, test_species):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @patch(f"{MODULE_TARGET}.get_credentials")
+    @patch(f"{MODULE_TARGET}.fetch_occurrences_async")
+    @patch(f"{MODULE_TARGET}.get_processed_ids", return_value=set())
+    @patch("builtins.print")
+    def test_run_easin_fetcher_async(self, mock_print, mock_get_processed,
+                                     mock_fetch_async, mock_get_creds):
+        """Test the event-loop path fetches pairs concurrently and saves every species."""
+        import asyncio
+        test_output = "test_async_output.csv"
+        test_species = "test_async_species.csv"
+
+        mock_get_creds.return_value = ("test@example.com", "password")
+        pd.DataFrame({"EASIN.ID": ["EASIN001", "EASIN002"]}).to_csv(test_species, index=False)
+
+        async def fetch(session, species_id, country_code, *args):
+            await asyncio.sleep(0.01)
+            return [{"SpeciesName": species_id, "CountryId": country_code}]
+
+        mock_fetch_async.side_effect = fetch
+
+        try:
+            total = run_easin_fetcher(
+                species_file=test_species, output_file=test_output,
+                countries=["BE", "NL"], max_workers=4, use_async=True
+            )
+
+            self.assertEqual(total, 4)
+            self.assertEqual(mock_fetch_async.call_count, 4)
+            df = pd.read_csv(test_output)
+            self.assertEqual(sorted(df["EASIN_ID"]), ["EASIN001"] * 2 + ["EASIN002"] * 2)
+            self.assertEqual(list(df[df["EASIN_ID"] == "EASIN001"]["Country"]), ["BE", "NL"])
+        finally:
+            for path in (test_output, test_species):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @patch(f"{MODULE_TARGET}.get_credentials")
+    @patch(f"{MODULE_TARGET}.fetch_occurrences_async")
+    @patch(f"{MODULE_TARGET}.get_processed_ids", return_value=set())
+    @patch("builtins.print")
+    def test_run_easin_fetcher_async_inside_running_loop(self, mock_print, mock_get_processed,
+                                                         mock_fetch_async, mock_get_creds):
+        """Test the event-loop path also runs when called from a running loop (a Jupyter cell)."""
+        import asyncio
+        test_output = "test_async_loop_output.csv"
+        test_species = "test_async_loop_species.csv"
+
+        mock_get_creds.return_value = ("test@example.com", "password")
+        pd.DataFrame({"EASIN.ID": ["EASIN001"]}).to_csv(test_species, index=False)
+
+        async def fetch(session, species_id, country_code, *args):
+            return [{"SpeciesName": species_id, "CountryId": country_code}]
+
+        mock_fetch_async.side_effect = fetch
+
+        async def notebook_cell():
+            return run_easin_fetcher(
+                species_file=test_species, output_file=test_output,
+                countries=["BE"], use_async=True
+            )
+
+        try:
+            self.assertEqual(asyncio.run(notebook_cell()), 1)
+        finally:
+            for path in (test_output, test_output + PROCESSED_SUFFIX, test_species):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @patch("builtins.print")
+    def test_load_species_ids_cached_until_file_changes(self, mock_print):
+        """Test an unchanged species file is parsed once and an edited one again."""
+        test_species = "test_cached_species.csv"
+        pd.DataFrame({"EASIN.ID": ["EASIN001", None, "EASIN001", "EASIN002"]}).to_csv(
+            test_species, index=False)
+
+        try:
+            with patch(f"{MODULE_TARGET}.pd.read_csv", wraps=pd.read_csv) as mock_read_csv:
+                self.assertEqual(load_species_ids(test_species), ("EASIN001", "EASIN002"))
+                self.assertEqual(load_species_ids(test_species), ("EASIN001", "EASIN002"))
+                self.assertEqual(mock_read_csv.call_count, 1)
+
+                pd.DataFrame({"EASIN.ID": ["EASIN003"]}).to_csv(test_species, index=False)
+                mtime = os.path.getmtime(test_species)
+                os.utime(test_species, (mtime + 10, mtime + 10))
+                self.assertEqual(load_species_ids(test_species), ("EASIN003",))
+                self.assertEqual(mock_read_csv.call_count, 2)
+
+            with self.assertRaises(FileNotFoundError):
+                load_species_ids("test_missing_species.csv")
+        finally:
+            if os.path.exists(test_species):
+                os.remove(test_species)
+
     @patch(f"{MODULE_TARGET}.get_credentials")
     @patch(f"{MODULE_TARGET}.pd.read_csv")
     def test_run_easin_fetcher_missing_easin_column(self, mock_read_csv, mock_get_creds):
@@ -7,6 +7,15 @@ from pathlib import Path
 
 from src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final import fetch_easin_presence
 
+MODULE_PATH = "src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final"
+
+
+@pytest.fixture(autouse=True)
+def no_easin_cache():
+    """Keep the on-disk EASIN cache out of the tests unless a test opts in."""
+    with patch(f"{MODULE_PATH}.EASIN_CACHE_DIR", None):
+        yield
+
 
 @pytest.fixture
 def sample_input_csv(tmp_path):
@@ -40,7 +49,7 @@ def mock_easin_response():
     ]
 
 
-@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.requests.get")
+@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.SESSION.get")
 def test_fetch_easin_presence(mock_get, sample_input_csv, mock_easin_response, tmp_path):
     """Test fetch_easin_presence with multiple species and synonyms."""
     
@@ -57,6 +66,10 @@ def test_fetch_easin_presence(mock_get, sample_input_csv, mock_easin_response, t
     # Check the CSV was created
     assert Path(output_file).exists()
 
+    # Rows are plain dicts, as the workflow notebooks iterate them
+    assert all(isinstance(r, dict) for r in rows)
+    assert set(r['country'] for r in rows) == {"DE", "FR", "IT"}
+
     # Convert rows to DataFrame for easier assertions
     df = pd.DataFrame(rows)
 
@@ -92,7 +105,7 @@ def test_fetch_easin_presence(mock_get, sample_input_csv, mock_easin_response, t
     assert missing == ["Species B"]
 
 
-@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.requests.get")
+@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.SESSION.get")
 def test_fetch_easin_presence_with_synonyms(mock_get, tmp_path):
     """Test that synonyms are properly matched."""
     
@@ -130,7 +143,7 @@ def test_fetch_easin_presence_with_synonyms(mock_get, tmp_path):
     assert missing == []
 
 
-@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.requests.get")
+@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.SESSION.get")
 def test_fetch_easin_presence_partial_match(mock_get, tmp_path):
     """Test that partial matching works when exact match fails."""
     
@@ -167,7 +180,7 @@ def test_fetch_easin_presence_partial_match(mock_get, tmp_path):
     assert missing == []
 
 
-@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.requests.get")
+@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.SESSION.get")
 def test_fetch_easin_presence_api_error(mock_get, sample_input_csv, tmp_path):
     """Test that API errors are properly raised."""
     
@@ -196,7 +209,7 @@ def test_fetch_easin_presence_missing_column(tmp_path):
         fetch_easin_presence(str(input_file), str(output_file))
 
 
-@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.requests.get")
+@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.SESSION.get")
 def test_fetch_easin_presence_empty_countries(mock_get, tmp_path):
     """Test handling of species with no PresentInCountries data."""
     
@@ -230,7 +243,7 @@ def test_fetch_easin_presence_empty_countries(mock_get, tmp_path):
     assert missing == []
 
 
-@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.requests.get")
+@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.SESSION.get")
 def test_fetch_easin_presence_normalization(mock_get, tmp_path):
     """Test that species name normalization (removing authorship) works."""
     
@@ -263,4 +276,67 @@ def test_fetch_easin_presence_normalization(mock_get, tmp_path):
     # Check that normalization matched the species
     assert "Species E (Author, Year)" in df_result["scientific_name"].values
     assert df_result["easin_id"].values[0] == "EASIN111"
-    assert missing == []
\ No newline at end of file
+    assert missing == []
+
+@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.SESSION.get")
+def test_fetch_easin_presence_writes_species_major_grid(mock_get, sample_input_csv, mock_easin_response, tmp_path):
+    """Test the presence grid is written one row per species-country pair, species by species."""
+    mock_get.return_value.json.return_value = mock_easin_response
+    output_file = tmp_path / "output.csv"
+
+    rows, _ = fetch_easin_presence(str(sample_input_csv), str(output_file))
+
+    written = pd.read_csv(output_file)
+    assert list(written.columns) == ["scientific_name", "easin_id", "country", "present"]
+    assert list(zip(written["scientific_name"], written["country"])) == [
+        (species, country)
+        for species in ["Species A", "Species B", "Species C"]
+        for country in ["DE", "FR", "IT"]
+    ]
+    assert list(written["present"]) == ["yes", "yes", "no", "no", "no", "no", "no", "no", "yes"]
+    assert written["present"].tolist() == [r["present"] for r in rows]
+
+
+@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.SESSION.get")
+def test_fetch_easin_presence_shared_synonym_uses_one_record(mock_get, tmp_path):
+    """Test a name claimed by two records takes its ID and countries from the same record."""
+    input_file = tmp_path / "input.csv"
+    pd.DataFrame({"Scientific Name": ["Shared name"]}).to_csv(input_file, index=False)
+    mock_get.return_value.json.return_value = [
+        {"Name": "Species F", "EASINID": "EASIN001",
+         "PresentInCountries": [{"Country": "BE"}], "Synonyms": [{"Synonym": "Shared name"}]},
+        {"Name": "Species G", "EASINID": "EASIN002",
+         "PresentInCountries": [{"Country": "NL"}], "Synonyms": [{"Synonym": "Shared name"}]},
+    ]
+
+    rows, missing = fetch_easin_presence(str(input_file), str(tmp_path / "output.csv"))
+
+    assert set(r["easin_id"] for r in rows) == {"EASIN001"}
+    assert {r["country"]: r["present"] for r in rows} == {"BE": "yes", "NL": "no"}
+    assert missing == []
+
+
+@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.SESSION.get")
+def test_fetch_easin_presence_snake_case_column_skips_blanks(mock_get, mock_easin_response, tmp_path):
+    """Test the 'scientific_name' column is accepted and blank names are skipped."""
+    input_file = tmp_path / "input.csv"
+    input_file.write_text("scientific_name,notes\n Species C ,x\n,y\nSpecies A,z\n")
+    mock_get.return_value.json.return_value = mock_easin_response
+
+    rows, missing = fetch_easin_presence(str(input_file), str(tmp_path / "output.csv"))
+
+    assert list(dict.fromkeys(r["scientific_name"] for r in rows)) == ["Species A", "Species C"]
+    assert missing == []
+
+
+@patch("src.EASIN_mining_and_map_generation.get_unionlist_presence_EASIN_final.SESSION.get")
+def test_fetch_easin_presence_served_from_disk_cache_on_rerun(mock_get, sample_input_csv, mock_easin_response, tmp_path):
+    """Test a rerun reads the EU-concern list from the disk cache instead of the API."""
+    mock_get.return_value.json.return_value = mock_easin_response
+
+    with patch(f"{MODULE_PATH}.EASIN_CACHE_DIR", str(tmp_path / "cache")):
+        first, _ = fetch_easin_presence(str(sample_input_csv), str(tmp_path / "first.csv"))
+        second, _ = fetch_easin_presence(str(sample_input_csv), str(tmp_path / "second.csv"))
+
+    mock_get.assert_called_once()
+    assert first == second
@@ -76,14 +76,25 @@ def test_fetch_records_from_gbif_with_filtering(mock_search):
     assert len(records) == 2
 
 
-@patch('os.path.exists', return_value=True)
-@patch('pandas.read_csv', return_value=pd.DataFrame({'Scientific Name': ['SpeciesA', 'SpeciesB']}))
-def test_load_species_list_success(mock_read_csv, mock_exists):
+def test_load_species_list_success(tmp_path):
     """Test loading a species list from a file."""
-    species = load_species_list("fake_path.csv")
+    species_file = tmp_path / "species.csv"
+    pd.DataFrame({
+        'Scientific Name': ['SpeciesA', 'SpeciesB', None, 'SpeciesA'],
+        'Other': [1, 2, 3, 4]
+    }).to_csv(species_file, index=False)
+    species = load_species_list(str(species_file))
     assert species == ["SpeciesA", "SpeciesB"]
 
 
+def test_load_species_list_missing_column(tmp_path, capsys):
+    """Test a species file without the name column yields an empty list."""
+    species_file = tmp_path / "species.csv"
+    pd.DataFrame({'Species': ['SpeciesA']}).to_csv(species_file, index=False)
+    assert load_species_list(str(species_file)) == []
+    assert "Error loading species list" in capsys.readouterr().out
+
+
 @patch('os.path.exists', return_value=False)
 def test_load_species_list_file_not_found(mock_exists):
     """Test handling of a missing species file."""
@@ -91,22 +102,22 @@ def test_load_species_list_file_not_found(mock_exists):
         load_species_list("nonexistent.csv")
 
 
-@patch('os.path.exists', return_value=False)
-@patch('pandas.DataFrame.to_csv')
-def test_save_data_to_csv(mock_to_csv, mock_exists):
-    """Test saving data to a CSV file."""
+def test_save_data_to_csv(tmp_path):
+    """Test saving data to a new CSV file writes the header first."""
+    output_file = tmp_path / "test_output.csv"
     data_to_save = [{'species': 'A', 'country': 'B'}]
-    save_data_to_csv(data_to_save, "test_output.csv", False)
-    mock_to_csv.assert_called_once_with("test_output.csv", mode='a', index=False, header=True)
+    save_data_to_csv(data_to_save, str(output_file), False)
+    assert output_file.read_text() == "species,country\nA,B\n"
 
 
-@patch('os.path.exists', return_value=True)
-@patch('pandas.DataFrame.to_csv')
-def test_save_data_to_csv_no_header(mock_to_csv, mock_exists):
+def test_save_data_to_csv_no_header(tmp_path):
     """Test saving data to a CSV without a header if file already exists."""
-    data_to_save = [{'species': 'A', 'country': 'B'}]
-    save_data_to_csv(data_to_save, "test_output.csv", True)
-    mock_to_csv.assert_called_once_with("test_output.csv", mode='a', index=False, header=False)
+    output_file = tmp_path / "test_output.csv"
+    output_file.write_text("species,country\nA,B\n")
+    data_to_save = [{'species': 'C', 'country': None}]
+    save_data_to_csv(data_to_save, str(output_file), True)
+    assert output_file.read_text() == "species,country\nA,B\nC,\n"
+    assert pd.read_csv(output_file)['species'].tolist() == ['A', 'C']
 
 def test_large_dataset_logic_with_pagination(mock_records):
     """Test main() splits large datasets by month and handles multiple pages per month (>10k scenario)."""
@@ -119,30 +130,121 @@ def test_large_dataset_logic_with_pagination(mock_records):
          patch('os.path.exists', return_value=False), \
          patch('pandas.Timestamp.today', return_value=pd.Timestamp("2016-12-31")):
 
-        # Initial call inside main() to check total records
-        initial_call = {'count': 10001, 'results': []}  # triggers monthly splitting
-
-        # Prepare monthly responses: 12 months, each month has 2 pages
-        monthly_calls = []
-        for _ in range(12):
-            # Page 1
-            monthly_calls.append({'count': 600, 'results': [mock_records[0]] * 300})
-            # Page 2
-            monthly_calls.append({'count': 600, 'results': [mock_records[0]] * 300})
-            # Page 3 (empty) to stop pagination
-            monthly_calls.append({'count': 600, 'results': []})
+        # Initial call inside main() to check total records triggers monthly
+        # splitting; then 12 months, each with 2 pages and an empty page.
+        # Months are fetched concurrently, so pages are served by offset
+        # rather than in call order.
+        def search(**kwargs):
+            if kwargs['limit'] == 1:
+                return {'count': 10001, 'results': []}
+            if kwargs['offset'] < 600:
+                return {'count': 600, 'results': [mock_records[0]] * 300}
+            return {'count': 600, 'results': []}
 
-        mock_search.side_effect = [initial_call] + monthly_calls
+        mock_search.side_effect = search
+        monthly_calls = 12 * 3
 
         # Run main()
         main()
 
         # Assertions
-        expected_search_calls = 1 + len(monthly_calls)  # initial + all pages
+        expected_search_calls = 1 + monthly_calls  # initial + all pages
         assert mock_search.call_count == expected_search_calls, \
             f"Expected {expected_search_calls} search calls, got {mock_search.call_count}"
 
         # save_data_to_csv is called once per month (pages aggregated first)
         expected_save_calls = 12
         assert mock_save_data.call_count == expected_save_calls, \
-            f"Expected {expected_save_calls} save calls, got {mock_save_data.call_count}"
\ No newline at end of file
+            f"Expected {expected_save_calls} save calls, got {mock_save_data.call_count}"
+        assert all(len(c.args[0]) == 600 for c in mock_save_data.call_args_list)
+        # Only the first save writes the header
+        assert [c.args[2] for c in mock_save_data.call_args_list] == [False] + [True] * 11
+
+def test_main_error_cancels_queued_windows():
+    """Test main() stops on an error instead of running every queued search."""
+    import time
+    countries = [f"C{i}" for i in range(20)]
+
+    def fetch(species, country, *args, **kwargs):
+        if country == "C0":
+            raise RuntimeError("boom")
+        time.sleep(0.05)
+        return []
+
+    with patch('src.activity_mining.get_GBIF_observations_final.load_species_list', return_value=['Test Species']), \
+         patch('src.activity_mining.get_GBIF_observations_final.european_countries', countries), \
+         patch('src.activity_mining.get_GBIF_observations_final.plan_date_windows',
+               side_effect=lambda s, c, start, end, log: [(start, end)]), \
+         patch('src.activity_mining.get_GBIF_observations_final.fetch_records_from_gbif',
+               side_effect=fetch) as mock_fetch, \
+         patch('os.path.exists', return_value=False):
+        with pytest.raises(RuntimeError, match="boom"):
+            main(max_workers=1)
+
+    assert mock_fetch.call_count < len(countries)
+
+
+def test_main_prints_only_from_main_thread(mock_records, capsys):
+    """Test worker messages are printed by the main thread, one whole line each."""
+    import builtins
+    import threading
+    printing_threads = set()
+    real_print = builtins.print
+
+    def recording_print(*args, **kwargs):
+        printing_threads.add(threading.current_thread())
+        real_print(*args, **kwargs)
+
+    with patch('src.activity_mining.get_GBIF_observations_final.load_species_list', return_value=['Test Species']), \
+         patch('src.activity_mining.get_GBIF_observations_final.european_countries', ['BE', 'NL']), \
+         patch('src.activity_mining.get_GBIF_observations_final.save_data_to_csv'), \
+         patch('src.activity_mining.get_GBIF_observations_final.time.sleep'), \
+         patch('pygbif.occurrences.search', side_effect=lambda **kw: {
+             'count': 1, 'results': [mock_records[0]] if kw.get('offset') == 0 and kw['limit'] != 1 else []}), \
+         patch('os.path.exists', return_value=False), \
+         patch('builtins.print', side_effect=recording_print):
+        main()
+
+    out = capsys.readouterr().out
+    assert printing_threads == {threading.main_thread()}
+    assert out.count("✅ Finished fetching. Found 1 records") == 2
+    assert "\r" not in out
+
+
+def test_main_releases_saved_windows():
+    """Test a saved window's records are not kept alive until the run ends."""
+    import gc
+    import weakref
+
+    class Records(list):
+        """List that can be weakly referenced."""
+
+    fetched = {}
+    saved = []
+    alive_at_last_save = []
+
+    def fetch(species, country, *args, **kwargs):
+        records = Records([{"species": species, "country": country}])
+        fetched[country] = weakref.ref(records)
+        return records
+
+    # A plain function, not a Mock, so no call history keeps the records alive
+    def save(records, output_file, header_written):
+        saved.append(records[0]["country"])
+        if records[0]["country"] == "NL":
+            gc.collect()
+            alive_at_last_save.extend(
+                country for country, ref in fetched.items() if country != "NL" and ref() is not None
+            )
+
+    with patch('src.activity_mining.get_GBIF_observations_final.load_species_list', return_value=['Test Species']), \
+         patch('src.activity_mining.get_GBIF_observations_final.european_countries', ['BE', 'DE', 'NL']), \
+         patch('src.activity_mining.get_GBIF_observations_final.plan_date_windows',
+               side_effect=lambda s, c, start, end, log: [(start, end)]), \
+         patch('src.activity_mining.get_GBIF_observations_final.fetch_records_from_gbif', side_effect=fetch), \
+         patch('src.activity_mining.get_GBIF_observations_final.save_data_to_csv', new=save), \
+         patch('os.path.exists', return_value=False):
+        main(max_workers=1)
+
+    assert sorted(saved) == ['BE', 'DE', 'NL']
+    assert alive_at_last_save == []
@@ -8,7 +8,7 @@ import os
 # Add src folder to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
-from data_processing.process_GBIF_observations import parse_event_date, process_gbif_data
+from data_processing.process_GBIF_observations import parse_event_date, process_gbif_data, write_csv_arrow
 
 # Constants
 INPUT_FILE = "GBIF_species_occurrences_EU.csv"
@@ -108,6 +108,9 @@ def test_process_gbif_data(mock_print, mock_tqdm_pandas, mock_read_csv):
         ]
         actual_combinations = list(result_df[['Scientific Name', 'Country']].itertuples(index=False, name=None))
         assert sorted(actual_combinations) == sorted(expected_combinations)
+
+        # --- Counts stay int64, safe for arithmetic across date columns ---
+        assert (result_df[date_columns].dtypes == 'int64').all()
         
     finally:
         # Clean up: remove progress_apply
@@ -145,4 +148,92 @@ def test_parse_event_date_edge_cases():
     assert pd.isna(parse_event_date('2023-01-01T00:00:00/2023-01-02T00:00:01'))
     
     # Malformed range
-    assert pd.isna(parse_event_date('2023-01-01/2023-01-02/2023-01-03'))
\ No newline at end of file
+    assert pd.isna(parse_event_date('2023-01-01/2023-01-02/2023-01-03'))
+
+def test_parse_event_date_parses_repeated_strings_once():
+    """Test identical eventDate strings are parsed once and served from the cache."""
+    from data_processing.process_GBIF_observations import _parse_date_string
+
+    _parse_date_string.cache_clear()
+    results = [parse_event_date(raw) for raw in ['2023-01-01', ' 2023-01-01 ', '2023-01-01']]
+
+    assert results == [pd.Timestamp('2023-01-01')] * 3
+    assert _parse_date_string.cache_info().misses == 1
+
+
+def test_parse_event_date_iso_fast_path_matches_dateutil():
+    """Test ISO strings skip dateutil and parse exactly as dateutil would."""
+    from dateutil import parser
+    from data_processing.process_GBIF_observations import _parse_date_string
+
+    iso_strings = ['2023-01-01', '2023-01-01T15:30', '2023-01-01 15:30:00.250',
+                   '2023-01-01T12:00:00+02:00', '2023-01-01T12:00:00Z']
+    _parse_date_string.cache_clear()
+    with patch('data_processing.process_GBIF_observations.parser.parse',
+               wraps=parser.parse) as mock_parse:
+        results = [parse_event_date(raw) for raw in iso_strings]
+        # Not ISO (or not a valid ISO date): falls back to dateutil
+        assert parse_event_date('2 January 2023') == pd.Timestamp('2023-01-02')
+        assert pd.isna(parse_event_date('2023-02-30'))
+
+    assert mock_parse.call_count == 2
+    for raw, result in zip(iso_strings, results):
+        expected = parser.parse(raw)
+        if expected.tzinfo is not None:
+            expected = expected.astimezone(tz=None).replace(tzinfo=None)
+        assert result == expected, raw
+
+
+def test_parse_event_dates_matches_scalar_parser():
+    """Test the vectorized column parser agrees with parse_event_date on every format."""
+    from data_processing.process_GBIF_observations import parse_event_dates
+
+    raw = pd.Series([
+        '2023-01-01', ' 2023-01-01T15:30:00 ', '2023-01-01T15:30', '2023-01-01T15:30:00.250',
+        '2023-02-30', '2023-01-01/2023-01-01T12:00:00', '2023-01-01/2023-01-03',
+        '2023-01-01T12:00:00+02:00', 'Not a date', None, float('nan'),
+        '1200-05-01', '0201-05-01T08:00'
+    ], index=range(10, 23))
+
+    with patch('data_processing.process_GBIF_observations.tqdm.pandas'):
+        pd.Series.progress_apply = pd.Series.apply
+        try:
+            parsed = parse_event_dates(raw)
+        finally:
+            del pd.Series.progress_apply
+
+    assert parsed.index.equals(raw.index)
+    # Years outside the nanosecond range are kept, not dropped or raised on
+    assert parsed[21] == pd.Timestamp('1200-05-01')
+    for value, result in zip(raw, parsed):
+        expected = parse_event_date(value)
+        if pd.isna(expected):
+            assert pd.isna(result), value
+        else:
+            assert result == pd.Timestamp(expected), value
+
+
+def test_write_csv_arrow_quotes_header_and_strings(tmp_path):
+    """Test Arrow quotes the header and every string cell, unlike DataFrame.to_csv."""
+    pivot = pd.DataFrame({
+        'Scientific Name': ['Species A', 'Species "B", sp.'],
+        'Country': ['FR', 'US'],
+        '2023-01-01': [2, 0],
+    })
+    arrow_file, pandas_file = tmp_path / "arrow.csv", tmp_path / "pandas.csv"
+
+    write_csv_arrow(pivot, str(arrow_file))
+    pivot.to_csv(pandas_file, index=False)
+
+    assert arrow_file.read_text().splitlines() == [
+        '"Scientific Name","Country","2023-01-01"',
+        '"Species A","FR",2',
+        '"Species ""B"", sp.","US",0',
+    ]
+    # to_csv only quotes where needed, so the files differ byte for byte...
+    assert pandas_file.read_text().splitlines()[:2] == [
+        'Scientific Name,Country,2023-01-01',
+        'Species A,FR,2',
+    ]
+    # ...but any CSV reader gets the same values back
+    pd.testing.assert_frame_equal(pd.read_csv(arrow_file), pd.read_csv(pandas_file))
@@ -224,4 +224,97 @@ def test_generate_observation_map_end_to_end(mock_load_data, mock_plot_map, tmp_
     # FIX: assert False positionally, not as a keyword argument
     mock_plot_map.assert_called_once_with(mock_df, expected_output_path, False)
     
-    assert returned_path == expected_output_path
\ No newline at end of file
+    assert returned_path == expected_output_path
+
+# --- Test feature caching and batch map generation ---
+
+def test_cached_features_reused_per_resolution():
+    """Tests that the Natural Earth features are only built once per resolution."""
+    from src.flickr_to_plantnet.generate_observation_map import _cached_features
+    _cached_features.cache_clear()
+
+    first = _cached_features('50m')
+    second = _cached_features('50m')
+
+    assert first is second
+    assert _cached_features.cache_info().misses == 1
+
+@patch('matplotlib.pyplot.savefig')
+@patch('matplotlib.pyplot.close')
+@patch('matplotlib.pyplot.title')
+@patch('matplotlib.pyplot.figure')
+def test_generate_maps_batch_reuses_figure(mock_figure, mock_title, mock_close, mock_savefig, mock_valid_data, mock_empty_data, tmp_path):
+    """Tests that a single figure is created and cleared between maps."""
+    from src.flickr_to_plantnet.generate_observation_map import generate_maps_batch
+    _, df = mock_valid_data
+    _, empty_df = mock_empty_data
+
+    mock_fig = MagicMock()
+    mock_ax = MagicMock()
+    mock_figure.return_value = mock_fig
+    mock_fig.add_subplot.return_value = mock_ax
+
+    paths = generate_maps_batch({'Species A': df, 'Species B': empty_df}, str(tmp_path))
+
+    mock_figure.assert_called_once()
+    assert mock_ax.cla.call_count == 2
+    assert mock_savefig.call_count == 2
+    # Only the non-empty map gets a colorbar, which must be removed afterwards
+    mock_fig.colorbar.return_value.remove.assert_called_once()
+    mock_close.assert_called_once_with(mock_fig)
+    assert paths == [
+        os.path.join(str(tmp_path), f"Species_A_{PLOT_CONFIG['OUTPUT_FILE']}"),
+        os.path.join(str(tmp_path), f"Species_B_{PLOT_CONFIG['OUTPUT_FILE']}"),
+    ]
+
+@patch('matplotlib.pyplot.savefig')
+@patch('matplotlib.pyplot.close')
+@patch('matplotlib.pyplot.title')
+@patch('matplotlib.pyplot.figure')
+def test_plot_observations_on_map_dense_data_uses_grid(mock_figure, mock_title, mock_close, mock_savefig, mock_valid_data):
+    """Tests that large datasets are drawn as a binned density grid instead of a scatter."""
+    _, df = mock_valid_data
+
+    mock_fig = MagicMock()
+    mock_ax = MagicMock()
+    mock_figure.return_value = mock_fig
+    mock_fig.add_subplot.return_value = mock_ax
+
+    with patch.dict(PLOT_CONFIG, {'DENSITY_THRESHOLD': 2, 'DENSITY_BINS': 10}):
+        plot_observations_on_map(df, "test_dense_output.png")
+
+    mock_ax.scatter.assert_not_called()
+    mock_ax.imshow.assert_called_once()
+    grid = mock_ax.imshow.call_args[0][0]
+    assert grid.shape == (10, 10)
+    # The weighted grid preserves the total confidence of all observations
+    assert grid.sum() == pytest.approx(df['PlantNet_Confidence_Score'].sum())
+    mock_fig.colorbar.assert_called_once()
+
+@patch(f'{MODULE_PATH}._render_basemap')
+@patch('matplotlib.pyplot.savefig')
+@patch('matplotlib.pyplot.close')
+@patch('matplotlib.pyplot.title')
+@patch('matplotlib.pyplot.figure')
+def test_plot_observations_on_map_uses_basemap_cache(mock_figure, mock_title, mock_close, mock_savefig, mock_render, mock_valid_data, tmp_path):
+    """Tests that the basemap is rendered once per extent and then reused from the PNG cache."""
+    import matplotlib.pyplot as plt
+    _, df = mock_valid_data
+
+    mock_fig = MagicMock()
+    mock_ax = MagicMock()
+    mock_figure.return_value = mock_fig
+    mock_fig.add_subplot.return_value = mock_ax
+    # Stand-in for the Cartopy rendering: write a tiny image to the cache path
+    mock_render.side_effect = lambda extent, resolution, path: plt.imsave(path, np.zeros((2, 2, 3)))
+
+    with patch.dict(PLOT_CONFIG, {'BASEMAP_CACHE_DIR': str(tmp_path)}):
+        plot_observations_on_map(df, "first.png", auto_zoom=False)
+        plot_observations_on_map(df, "second.png", auto_zoom=False)
+
+    mock_render.assert_called_once()
+    assert mock_render.call_args[0][0] == PLOT_CONFIG['EU_BOUNDARY_EXTENT']
+    assert len(list(tmp_path.glob('basemap_*.png'))) == 1
+    # The cached image replaces the vector features
+    assert mock_ax.imshow.call_count == 2
+    mock_ax.add_feature.assert_not_called()
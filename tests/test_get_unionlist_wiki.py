@@ -9,14 +9,19 @@ import pytest
 import pandas as pd
 import requests
 import requests_mock
+from unittest.mock import patch
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
 from bs4 import BeautifulSoup
 from src.list_mining.get_unionlist_wiki import (
     extract_scientific_names,
     get_wikidata_q_number,
+    fetch_q_numbers_batch,
     fetch_sitelinks,
+    fetch_sitelinks_batch,
     fetch_webpage_content,
     run_wiki_sitelinks_pipeline,
-    EU_LANGUAGES
+    EU_LANGUAGES,
+    SESSION
 )
 
 # Mock HTML content for testing `extract_scientific_names`
@@ -93,6 +98,15 @@ class TestExtractScientificNames:
         result = extract_scientific_names(MOCK_WIKI_HTML.encode('utf-8'))
         assert result == expected_names
     
+    def test_extract_scientific_names_extra_table_classes(self):
+        """Test the table is found regardless of class order or extras."""
+        html = MOCK_WIKI_HTML.replace(
+            'class="wikitable sortable css-serial"',
+            'class="css-serial wikitable  jquery-tablesorter sortable"'
+        )
+        result = extract_scientific_names(html.encode('utf-8'))
+        assert result == ['Aedes albopictus', 'Myocastor coypus']
+    
     def test_extract_scientific_names_no_table(self):
         """Test behavior when the target table is not found."""
         html = "<html><body>No table here.</body></html>"
@@ -129,6 +143,17 @@ class TestGetWikidataQNumber:
         q_number = get_wikidata_q_number(species_name)
         assert q_number == "Q596541"
     
+    def test_get_wikidata_q_number_nested_link_text(self, requests_mock):
+        """Test the sidebar link is found when its text sits in a span."""
+        species_name = "Aedes albopictus"
+        requests_mock.get(
+            'https://en.wikipedia.org/wiki/Aedes_albopictus',
+            text='<html><body><a href="https://www.wikidata.org/wiki/'
+                 'Special:EntityPage/Q596541"><span> Wikidata item </span>'
+                 '</a></body></html>'
+        )
+        assert get_wikidata_q_number(species_name) == "Q596541"
+    
     def test_get_wikidata_q_number_not_found(self, requests_mock):
         """Test behavior when the Wikidata link is not found."""
         species_name = "Nonexistent Species"
@@ -154,6 +179,21 @@ class TestGetWikidataQNumber:
         q_number = get_wikidata_q_number(species_name)
         assert q_number is None
     
+    @pytest.mark.parametrize("error", [
+        ProtocolError("Connection broken"),
+        ReadTimeoutError(None, None, "Read timed out."),
+    ])
+    def test_get_wikidata_q_number_stream_failure(self, requests_mock, error):
+        """Test that urllib3 errors raised while streaming the body are handled."""
+        species_name = "StreamFailureSpecies"
+        mock_url = f'https://en.wikipedia.org/wiki/{species_name}'
+        requests_mock.get(mock_url, text=MOCK_SPECIES_WIKI_HTML)
+        
+        with patch('src.list_mining.get_unionlist_wiki._parse_q_number',
+                   side_effect=error):
+            q_number = get_wikidata_q_number(species_name)
+        assert q_number is None
+    
     def test_get_wikidata_q_number_with_spaces(self, requests_mock):
         """Test handling of species names with multiple spaces."""
         species_name = "Multiple Word Species"
@@ -164,6 +204,63 @@ class TestGetWikidataQNumber:
         assert q_number == "Q596541"
 
 
+class TestFetchQNumbersBatch:
+    """Tests for fetch_q_numbers_batch function."""
+
+    API_URL = 'https://en.wikipedia.org/w/api.php'
+
+    def test_batch_follows_normalisation_and_redirects(self, requests_mock):
+        """Test Q-numbers are mapped back to the requested names."""
+        requests_mock.get(self.API_URL, json={
+            "query": {
+                "normalized": [
+                    {"from": "aedes albopictus", "to": "Aedes albopictus"}
+                ],
+                "redirects": [
+                    {"from": "Aedes albopictus", "to": "Asian tiger mosquito"}
+                ],
+                "pages": {
+                    "123": {
+                        "pageid": 123,
+                        "title": "Asian tiger mosquito",
+                        "pageprops": {"wikibase_item": "Q596541"}
+                    },
+                    "-1": {"title": "Nonexistent species", "missing": ""}
+                }
+            }
+        })
+
+        result = fetch_q_numbers_batch(
+            ["aedes albopictus", "Nonexistent species"]
+        )
+
+        assert result == {
+            "aedes albopictus": "Q596541",
+            "Nonexistent species": None
+        }
+        query = requests_mock.last_request.qs
+        assert query["prop"] == ["pageprops"]
+        assert query["titles"] == ["aedes albopictus|nonexistent species"]
+
+    def test_batch_splits_into_chunks_of_50(self, requests_mock):
+        """Test that at most 50 titles are sent per API call."""
+        requests_mock.get(self.API_URL, json={"query": {"pages": {}}})
+        names = [f"Species {i}" for i in range(120)]
+
+        result = fetch_q_numbers_batch(names)
+
+        assert requests_mock.call_count == 3
+        assert all(value is None for value in result.values())
+
+    def test_batch_request_failure(self, requests_mock):
+        """Test that a failed batch leaves its species without Q-number."""
+        requests_mock.get(
+            self.API_URL, exc=requests.exceptions.RequestException
+        )
+        result = fetch_q_numbers_batch(["Aedes albopictus"])
+        assert result == {"Aedes albopictus": None}
+
+
 class TestFetchSitelinks:
     """Tests for fetch_sitelinks function."""
     
@@ -258,6 +355,53 @@ class TestFetchSitelinks:
         assert "ja" not in sitelinks
 
 
+class TestFetchSitelinksBatch:
+    """Tests for fetch_sitelinks_batch function."""
+
+    API_URL = 'https://www.wikidata.org/w/api.php'
+
+    def test_batch_success(self, requests_mock):
+        """Test sitelinks are parsed per Q-number from one wbgetentities call."""
+        requests_mock.get(self.API_URL, json={
+            "entities": {
+                **MOCK_WIKIDATA_JSON["entities"],
+                "Q404": {"id": "Q404", "missing": ""}
+            }
+        })
+
+        result = fetch_sitelinks_batch(["Q596541", "Q404", None, "Q596541"])
+
+        assert requests_mock.call_count == 1
+        assert set(result) == {"Q596541", "Q404"}
+        assert dict(result["Q596541"]) == {
+            "en": "Aedes albopictus",
+            "de": "Asiatische Tigermücke",
+            "fr": "Moustique tigre",
+            "it": "Aedes albopictus"
+        }
+        assert result["Q404"] == []
+
+        query = requests_mock.last_request.qs
+        assert query["action"] == ["wbgetentities"]
+        assert query["props"] == ["sitelinks"]
+        assert "enwiki" in query["sitefilter"][0].split("|")
+
+    def test_batch_splits_into_chunks_of_50(self, requests_mock):
+        """Test that at most 50 IDs are sent per API call."""
+        requests_mock.get(self.API_URL, json={"entities": {}})
+        result = fetch_sitelinks_batch([f"Q{i}" for i in range(101)])
+        assert requests_mock.call_count == 3
+        assert len(result) == 101
+
+    def test_batch_request_failure(self, requests_mock):
+        """Test that a failed batch yields empty sitelinks."""
+        requests_mock.get(
+            self.API_URL, exc=requests.exceptions.RequestException
+        )
+        result = fetch_sitelinks_batch(["Q1"])
+        assert result == {"Q1": []}
+
+
 class TestFetchWebpageContent:
     """Tests for fetch_webpage_content function."""
     
@@ -347,27 +491,28 @@ class TestRunWikiSitelinksPipeline:
         wiki_url = "https://example.com/species_list"
         requests_mock.get(wiki_url, text=MOCK_WIKI_HTML)
         
-        # Mock the species Wikipedia pages
-        species_url = 'https://en.wikipedia.org/wiki/Aedes_albopictus'
-        requests_mock.get(species_url, text=MOCK_SPECIES_WIKI_HTML)
-        
-        species_url2 = 'https://en.wikipedia.org/wiki/Myocastor_coypus'
-        requests_mock.get(
-            species_url2,
-            text="<html><body>No Wikidata</body></html>"
-        )
-        
-        # Mock the Wikidata API
-        wikidata_url = (
-            "https://www.wikidata.org/wiki/Special:EntityData/"
-            "Q596541.json"
-        )
-        requests_mock.get(wikidata_url, json=MOCK_WIKIDATA_JSON)
-        
         # Create temporary output files
         q_file = tmp_path / "test_q.csv"
         s_file = tmp_path / "test_s.csv"
         
+        # Mock the batched MediaWiki pageprops lookup
+        requests_mock.get('https://en.wikipedia.org/w/api.php', json={
+            "query": {
+                "pages": {
+                    "1": {
+                        "title": "Aedes albopictus",
+                        "pageprops": {"wikibase_item": "Q596541"}
+                    },
+                    "2": {"title": "Myocastor coypus"}
+                }
+            }
+        })
+        
+        # Mock the batched Wikidata sitelinks lookup
+        requests_mock.get(
+            'https://www.wikidata.org/w/api.php', json=MOCK_WIKIDATA_JSON
+        )
+        
         # Run pipeline
         df_q, df_s = run_wiki_sitelinks_pipeline(
             wiki_url=wiki_url,
@@ -401,6 +546,18 @@ class TestRunWikiSitelinksPipeline:
         assert len(df_s_loaded) == len(df_s)
 
 
+class TestSession:
+    """Tests for the shared requests session."""
+
+    def test_session_retries_transient_errors(self):
+        """Test the HTTPS adapter retries rate limits and 5xx with backoff."""
+        retries = SESSION.get_adapter('https://www.wikidata.org').max_retries
+        assert retries.total == 5
+        assert retries.backoff_factor == 0.5
+        assert {429, 503}.issubset(retries.status_forcelist)
+        assert retries.respect_retry_after_header
+
+
 class TestEULanguages:
     """Tests for EU_LANGUAGES constant."""
     
@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
 import os
+import orjson
 import requests
 import requests_mock
 from pathlib import Path
@@ -14,13 +15,17 @@ try:
         load_expected_species,
         find_observation_folders,
         call_plantnet_api,
+        find_observation_images,
+        match_expected_species,
         process_api_results,
         create_csv_row,
         process_all_observations,
         filter_high_fidelity_observations,
         print_summary_statistics,
         run_full_pipeline,
-        load_high_fidelity_data
+        load_high_fidelity_data,
+        load_identification_summary,
+        SUMMARY_HEADER
     )
 except ImportError:
     from ID_plantnet_images import (
@@ -28,13 +33,17 @@ except ImportError:
         load_expected_species,
         find_observation_folders,
         call_plantnet_api,
+        find_observation_images,
+        match_expected_species,
         process_api_results,
         create_csv_row,
         process_all_observations,
         filter_high_fidelity_observations,
         print_summary_statistics,
         run_full_pipeline,
-        load_high_fidelity_data
+        load_high_fidelity_data,
+        load_identification_summary,
+        SUMMARY_HEADER
     )
 
 MODULE_PATH = 'src.flickr_to_plantnet.ID_plantnet_images'
@@ -158,15 +167,16 @@ def test_plantnet_config_missing_api_key(monkeypatch):
 # 3. TEST load_expected_species
 # ==============================================================================
 
-@patch(f'{MODULE_PATH}.pd.read_csv')
+@patch(f'{MODULE_PATH}.read_csv_arrow')
 def test_load_expected_species_success(mock_read_csv, mock_metadata_df, monkeypatch):
     """Test successful loading of expected species mapping."""
     monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
     mock_read_csv.return_value = mock_metadata_df
     
     config = PlantNetConfig()
-    result = load_expected_species(config)
+    result, metadata_df = load_expected_species(config)
     
+    assert metadata_df is mock_metadata_df
     assert isinstance(result, dict)
     assert len(result) == 5
     assert result['101'] == 'Species A'
@@ -174,7 +184,37 @@ def test_load_expected_species_success(mock_read_csv, mock_metadata_df, monkeypa
     mock_read_csv.assert_called_once_with(config.master_metadata_file)
 
 
-@patch(f'{MODULE_PATH}.pd.read_csv')
+def test_load_expected_species_reads_ids_as_text(tmp_path, monkeypatch):
+    """Test that photo IDs are parsed as strings from a real metadata file."""
+    monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
+    metadata_file = tmp_path / "metadata.csv"
+    metadata_file.write_text("photo_id,scientific_name\n0101,Species A\n102,Species B\n")
+    
+    config = PlantNetConfig(base_dir=str(tmp_path), metadata_file=str(metadata_file))
+    result, metadata_df = load_expected_species(config)
+    
+    assert result == {'0101': 'Species A', '102': 'Species B'}
+    assert len(metadata_df) == 2
+
+
+def test_load_expected_species_multiline_quoted_field(tmp_path, monkeypatch):
+    """Test that quoted metadata fields spanning several lines are read like pd.read_csv."""
+    monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
+    metadata_file = tmp_path / "metadata.csv"
+    metadata_file.write_text(
+        'photo_id,scientific_name,title\n'
+        '101,Species A,"Pond at dusk\nsecond line, with a comma"\n'
+        '102,Species B,plain\n'
+    )
+    
+    config = PlantNetConfig(base_dir=str(tmp_path), metadata_file=str(metadata_file))
+    result, metadata_df = load_expected_species(config)
+    
+    assert result == {'101': 'Species A', '102': 'Species B'}
+    assert metadata_df['title'].tolist() == ["Pond at dusk\nsecond line, with a comma", "plain"]
+
+
+@patch(f'{MODULE_PATH}.read_csv_arrow')
 def test_load_expected_species_file_not_found(mock_read_csv, monkeypatch):
     """Test handling of missing metadata file."""
     monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
@@ -186,7 +226,7 @@ def test_load_expected_species_file_not_found(mock_read_csv, monkeypatch):
         load_expected_species(config)
 
 
-@patch(f'{MODULE_PATH}.pd.read_csv')
+@patch(f'{MODULE_PATH}.read_csv_arrow')
 def test_load_expected_species_missing_columns(mock_read_csv, monkeypatch):
     """Test handling of missing required columns."""
     monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
@@ -202,46 +242,37 @@ def test_load_expected_species_missing_columns(mock_read_csv, monkeypatch):
 # 4. TEST find_observation_folders
 # ==============================================================================
 
-@patch(f'{MODULE_PATH}.os.listdir')
-@patch(f'{MODULE_PATH}.os.path.isdir')
-def test_find_observation_folders_success(mock_isdir, mock_listdir, monkeypatch):
+def test_find_observation_folders_success(tmp_path, monkeypatch):
     """Test successful finding of observation folders."""
     monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
-    mock_listdir.return_value = ['101', '102', 'file.txt', '103']
-    # FIX: os.path.isdir receives a full path, not just the name. 
-    # Mock it to return True for any path that does not end with .txt
-    mock_isdir.side_effect = lambda x: not x.endswith('.txt')
+    for name in ['103', '101', '102']:
+        (tmp_path / name).mkdir()
+    (tmp_path / 'file.txt').write_text('not a folder')
     
-    config = PlantNetConfig()
-    # The actual call to listdir will be on config.base_dir, which is "PlantNet_Batch_Images"
-    # The actual calls to isdir will be os.path.isdir("PlantNet_Batch_Images/101"), etc.
+    config = PlantNetConfig(base_dir=str(tmp_path))
     result = find_observation_folders(config)
     
     assert result == ['101', '102', '103']
     assert len(result) == 3
 
 
-@patch(f'{MODULE_PATH}.os.listdir')
-def test_find_observation_folders_directory_not_found(mock_listdir, monkeypatch):
+def test_find_observation_folders_directory_not_found(tmp_path, monkeypatch):
     """Test handling of missing base directory."""
     monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
-    mock_listdir.side_effect = FileNotFoundError("Directory not found")
     
-    config = PlantNetConfig()
+    config = PlantNetConfig(base_dir=str(tmp_path / 'missing'))
     
     with pytest.raises(FileNotFoundError):
         find_observation_folders(config)
 
 
-@patch(f'{MODULE_PATH}.os.listdir')
-@patch(f'{MODULE_PATH}.os.path.isdir')
-def test_find_observation_folders_no_folders(mock_isdir, mock_listdir, monkeypatch):
+def test_find_observation_folders_no_folders(tmp_path, monkeypatch):
     """Test handling when no observation folders found."""
     monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
-    mock_listdir.return_value = ['file1.txt', 'file2.csv']
-    mock_isdir.return_value = False
+    (tmp_path / 'file1.txt').write_text('')
+    (tmp_path / 'file2.csv').write_text('')
     
-    config = PlantNetConfig()
+    config = PlantNetConfig(base_dir=str(tmp_path))
     
     with pytest.raises(ValueError, match="No observation ID folders found"):
         find_observation_folders(config)
@@ -260,7 +291,7 @@ def test_call_plantnet_api_success(mock_post, mock_exists, mock_api_success_resp
     # Mock the response object from requests.post
     mock_response = MagicMock()
     mock_response.status_code = 200
-    mock_response.json.return_value = mock_api_success_response
+    mock_response.content = orjson.dumps(mock_api_success_response)
     mock_post.return_value = mock_response
 
     # Create a proper file mock that returns bytes when read
@@ -281,10 +312,13 @@ def test_call_plantnet_api_success(mock_post, mock_exists, mock_api_success_resp
     m_open.assert_called_once_with('test.jpg', 'rb')
 
 
-@patch(f'{MODULE_PATH}.os.path.exists', return_value=False)
-def test_call_plantnet_api_file_not_found(mock_exists):
+@patch(f'{MODULE_PATH}.requests.post')
+def test_call_plantnet_api_file_not_found(mock_post, tmp_path):
     """Test handling when image file doesn't exist."""
-    success, result, error = call_plantnet_api('nonexistent.jpg', 'http://api.test')
+    missing_path = str(tmp_path / 'nonexistent.jpg')
+    success, result, error = call_plantnet_api(missing_path, 'http://api.test')
+    
+    mock_post.assert_not_called()
     
     assert success is False
     assert result is None
@@ -301,7 +335,7 @@ def test_call_plantnet_api_http_error(mock_post, mock_exists):
     mock_response.status_code = 401
 # Mock the json() call to return the error body only if the status code check is skipped
         # For a 401 error, raise_for_status will be called and should be caught first.
-    mock_response.json.return_value = {'error': 'Invalid API key'}
+    mock_response.content = orjson.dumps({'error': 'Invalid API key'})
     mock_response.text = '{"error": "Invalid API key"}'
     mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("401 Client Error: Unauthorized for url", response=mock_response)
     mock_post.return_value = mock_response
@@ -325,7 +359,7 @@ def test_call_plantnet_api_no_results(mock_post, mock_exists):
     
     mock_response = MagicMock()
     mock_response.status_code = 200
-    mock_response.json.return_value = {'results': []}
+    mock_response.content = orjson.dumps({'results': []})
     mock_post.return_value = mock_response
 
     m_open = mock_open(read_data=b'fake_image_data')
@@ -344,7 +378,8 @@ def test_call_plantnet_api_invalid_json(mock_post, mock_exists):
     
     mock_response = MagicMock()
     mock_response.status_code = 500
-    mock_response.json.side_effect = requests.exceptions.JSONDecodeError("Expecting value", "<html>Server Error</html>", 0)
+    mock_response.content = b"<html>Server Error</html>"
+    mock_response.text = "<html>Server Error</html>"
     mock_post.return_value = mock_response
 
     m_open = mock_open(read_data=b'fake_image_data')
@@ -353,6 +388,7 @@ def test_call_plantnet_api_invalid_json(mock_post, mock_exists):
     
     assert success is False
     assert "Could not decode JSON" in error
+    assert "<html>Server Error</html>" in error
 
 
 @patch(f'{MODULE_PATH}.os.path.exists', return_value=True)
@@ -371,6 +407,45 @@ def test_call_plantnet_api_network_error(mock_post, mock_exists):
     assert "Network or Request Error" in error
 
 
+@patch(f'{MODULE_PATH}.requests.post')
+def test_call_plantnet_api_multiple_images(mock_post, tmp_path, mock_api_success_response):
+    """Test that several images of one observation are sent in a single request."""
+    image_paths = []
+    for name in ['101.jpg', '101_b.jpg']:
+        path = tmp_path / name
+        path.write_bytes(b'fake_image_data')
+        image_paths.append(str(path))
+    
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.content = orjson.dumps(mock_api_success_response)
+    mock_post.return_value = mock_response
+    
+    success, result, error = call_plantnet_api(image_paths, "http://api.test")
+    
+    assert success is True
+    mock_post.assert_called_once()
+    kwargs = mock_post.call_args.kwargs
+    assert [name for _, (name, _) in kwargs['files']] == ['101.jpg', '101_b.jpg']
+    assert kwargs['data'] == {'organs': ['auto', 'auto']}
+
+
+def test_find_observation_images(tmp_path, monkeypatch):
+    """Test that the primary image comes first and extra images are capped at the API limit."""
+    monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
+    folder = tmp_path / '101'
+    folder.mkdir()
+    for name in ['101.jpg', 'a.jpg', 'b.png', 'c.jpeg', 'd.jpg', 'e.jpg', 'notes.txt']:
+        (folder / name).write_bytes(b'x')
+    
+    config = PlantNetConfig(base_dir=str(tmp_path))
+    result = find_observation_images(config, '101')
+    
+    assert [os.path.basename(p) for p in result] == ['101.jpg', 'a.jpg', 'b.png', 'c.jpeg', 'd.jpg']
+    # A missing folder still yields the expected primary path
+    assert find_observation_images(config, '999') == [os.path.join(str(tmp_path), '999', '999.jpg')]
+
+
 # ==============================================================================
 # 6. TEST process_api_results
 # ==============================================================================
@@ -403,6 +478,16 @@ def test_process_api_results_species_not_found(mock_api_success_response):
     assert result['species_score'] == 'N/A'
 
 
+def test_match_expected_species():
+    """Test ranking of the expected species, including absent and duplicate names."""
+    names = ['Species B', 'species a', 'Species A']
+    
+    assert match_expected_species(names, 'Species A') == 2  # first (best) match wins
+    assert match_expected_species(names, 'Species B') == 1
+    assert match_expected_species(names, 'Species Z') == 0
+    assert match_expected_species([], 'Species A') == 0
+
+
 def test_process_api_results_case_insensitive():
     """Test that species matching is case-insensitive."""
     api_response = {
@@ -453,8 +538,8 @@ def test_create_csv_row_success():
     assert row[4] == 'Species A'  # Top 1 scientific name
     assert row[5] == '0.950000'  # Top 1 score
     assert row[6] == 'Name A'  # Top 1 common names
-    assert row[-4] == 'Yes'  # Expected species found
-    assert row[-3] == '1'  # Expected species rank
+    assert row[-5] == 'Yes'  # Expected species found
+    assert row[-4] == '1'  # Expected species rank
 
 
 def test_create_csv_row_failure():
@@ -464,8 +549,9 @@ def test_create_csv_row_failure():
     assert row[0] == '102'
     assert row[3] == 'Failure'
     assert row[4] == 'N/A'  # No results
-    assert row[-4] == 'No'
-    assert row[-1] == 'API Error'
+    assert row[-5] == 'No'
+    assert row[-2] == 'API Error'
+    assert row[-1] == ''  # No additional images
 
 
 def test_create_csv_row_padding_top_5():
@@ -500,8 +586,8 @@ def test_process_all_observations(mock_csv_writer, mock_file, mock_api_call, mon
     """Test processing all observations and writing to CSV."""
     monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
     
-    # Setup mocks
-    config = PlantNetConfig()
+    # Setup mocks (a .csv summary path selects the CSV writer)
+    config = PlantNetConfig(output_summary_file="summary.csv")
     expected_species_map = {'101': 'Species A', '102': 'Species B'}
     observation_ids = ['101', '102']
     
@@ -531,6 +617,102 @@ def test_process_all_observations(mock_csv_writer, mock_file, mock_api_call, mon
     assert mock_writer_instance.writerow.call_count == 3  # 1 header + 2 data rows
 
 
+@patch(f'{MODULE_PATH}.call_plantnet_api')
+def test_process_all_observations_parquet(mock_api_call, tmp_path, monkeypatch):
+    """Test that a .parquet summary path writes a typed Parquet file."""
+    monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
+    
+    config = PlantNetConfig(base_dir=str(tmp_path),
+                            output_summary_file=str(tmp_path / "summary.parquet"))
+    mock_api_call.side_effect = [
+        (True, {'results': [{'score': 0.95, 'species': {
+            'scientificNameWithoutAuthor': 'Species A', 'commonNames': ['Common A']}}]}, ""),
+        (False, None, "Image file not found locally"),
+    ]
+    
+    result = process_all_observations(config, {'101': 'Species A', '102': 'Species B'}, ['101', '102'])
+    
+    assert result.endswith('.parquet')
+    results_df = load_identification_summary(result)
+    assert list(results_df.columns) == SUMMARY_HEADER
+    assert results_df['photo_id'].tolist() == ['101', '102']
+    assert results_df['Top_1_Score'].tolist() == pytest.approx([0.95, 0.0])
+    assert results_df['Expected_Species_Rank'].tolist() == ['1', 'Not in Top 5']
+    assert results_df['API_Status'].tolist() == ['Success', 'Local Failure']
+
+
+def test_process_all_observations_records_primary_and_additional_images(tmp_path, monkeypatch):
+    """Test Image_Used_Path keeps the primary image and extra images get their own column."""
+    monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
+    folder = tmp_path / "101"
+    folder.mkdir()
+    for name in ["101.jpg", "101_b.jpg", "101_c.png"]:
+        (folder / name).write_bytes(b"img")
+    config = PlantNetConfig(base_dir=str(tmp_path))
+    
+    with patch(f'{MODULE_PATH}.call_plantnet_api',
+               return_value=(False, None, "Image file not found locally")) as mock_api_call:
+        result = process_all_observations(config, {'101': 'Species A'}, ['101'])
+    
+    results_df = pd.read_csv(result, dtype=str, keep_default_na=False)
+    assert list(results_df.columns) == SUMMARY_HEADER
+    assert results_df['Image_Used_Path'].tolist() == [str(folder / "101.jpg")]
+    assert results_df['Additional_Image_Paths'].tolist() == [
+        f"{folder / '101_b.jpg'} | {folder / '101_c.png'}"
+    ]
+    assert len(mock_api_call.call_args[0][0]) == 3
+
+
+@patch(f'{MODULE_PATH}.SUMMARY_PARQUET_BATCH_SIZE', 2)
+@patch(f'{MODULE_PATH}.call_plantnet_api')
+def test_process_all_observations_parquet_keeps_batches_on_failure(mock_api_call, tmp_path, monkeypatch):
+    """Test that rows identified before a crash are already in the Parquet file."""
+    monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
+    config = PlantNetConfig(base_dir=str(tmp_path),
+                            output_summary_file=str(tmp_path / "summary.parquet"))
+    success = (True, {'results': [{'score': 0.5, 'species': {
+        'scientificNameWithoutAuthor': 'Species A', 'commonNames': []}}]}, "")
+    mock_api_call.side_effect = [success, success, success, KeyboardInterrupt]
+    
+    with pytest.raises(KeyboardInterrupt):
+        process_all_observations(config, {}, ['101', '102', '103', '104'])
+    
+    results_df = load_identification_summary(config.identification_summary_file)
+    assert results_df['photo_id'].tolist() == ['101', '102', '103']
+
+
+@patch(f'{MODULE_PATH}.call_plantnet_api')
+def test_process_all_observations_logs_progress(mock_api_call, tmp_path, monkeypatch, capsys, caplog):
+    """Test that each observation prints one progress line and the top-5 detail is DEBUG only."""
+    import logging
+    monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
+    config = PlantNetConfig(base_dir=str(tmp_path))
+    mock_api_call.side_effect = [
+        (True, {'results': [{'score': 0.95, 'species': {
+            'scientificNameWithoutAuthor': 'Species A', 'commonNames': []}}]}, ""),
+        (False, None, "Image file not found locally"),
+    ]
+    
+    with caplog.at_level(logging.DEBUG, logger=MODULE_PATH):
+        process_all_observations(config, {'101': 'Species A', '102': 'Species B'}, ['101', '102'])
+    
+    out = capsys.readouterr().out
+    assert "[1/2] 101: ✅ Species A found at rank 1" in out
+    assert "[2/2] 102: ❌ Image file not found locally" in out
+    assert "Score: 0.9500" not in out
+    messages = [r.getMessage() for r in caplog.records if r.name == MODULE_PATH]
+    assert any("1. Species A (Score: 0.9500)" in m for m in messages)
+    assert all(r.levelno == logging.DEBUG for r in caplog.records if r.name == MODULE_PATH)
+
+
+def test_module_leaves_logging_configuration_to_caller():
+    """Test that importing the module adds no handlers and keeps propagation on."""
+    import logging
+    module_logger = logging.getLogger(MODULE_PATH)
+    assert module_logger.handlers == []
+    assert module_logger.propagate
+
+
 # ==============================================================================
 # 9. TEST filter_high_fidelity_observations
 # ==============================================================================
@@ -625,8 +807,7 @@ def test_run_full_pipeline_integration(mock_read_csv,
     monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
     
     # Setup mocks
-    mock_read_csv.return_value = mock_metadata_df
-    mock_load_species.return_value = {'101': 'Species A', '102': 'Species B'}
+    mock_load_species.return_value = ({'101': 'Species A', '102': 'Species B'}, mock_metadata_df)
     mock_find_folders.return_value = ['101', '102']
     mock_process.return_value = 'summary.csv'
     mock_filter.return_value = 'high_fidelity.csv'
@@ -642,6 +823,9 @@ def test_run_full_pipeline_integration(mock_read_csv,
     mock_process.assert_called_once()
     mock_filter.assert_called_once()
     mock_print_stats.assert_called_once()
+    # The metadata is parsed once by load_expected_species and reused for filtering
+    mock_read_csv.assert_not_called()
+    assert mock_filter.call_args[0][1] is mock_metadata_df
 
 
 # ==============================================================================
@@ -657,4 +841,19 @@ def test_load_high_fidelity_data(mock_read_csv, mock_metadata_df, monkeypatch):
     result = load_high_fidelity_data(base_dir="test_dir")
     
     assert isinstance(result, pd.DataFrame)
-    mock_read_csv.assert_called_once()
\ No newline at end of file
+    mock_read_csv.assert_called_once()
+
+
+def test_load_high_fidelity_data_keeps_pandas_dtypes(tmp_path, monkeypatch):
+    """Test photo IDs load as integers, empty cells as NaN and dates as text."""
+    monkeypatch.setenv("PLANTNET_API_KEY", "test_key")
+    config = PlantNetConfig(base_dir=str(tmp_path), api_key="dummy")
+    with open(config.high_fidelity_file, 'w') as f:
+        f.write("photo_id,date_taken,title\n101,2023-05-01 10:00:00,\n102,2023-05-02 11:00:00,Flower\n")
+    
+    result = load_high_fidelity_data(base_dir=str(tmp_path))
+    
+    assert result['photo_id'].dtype == 'int64'
+    assert result['photo_id'].tolist() == [101, 102]
+    assert pd.isna(result.loc[0, 'title'])
+    assert result.loc[0, 'date_taken'] == "2023-05-01 10:00:00"
\ No newline at end of file
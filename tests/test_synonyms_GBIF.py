@@ -1,16 +1,29 @@
 import unittest
-from unittest.mock import patch, MagicMock, call
+from unittest.mock import patch, MagicMock, call, ANY
+import asyncio
+import aiohttp
 import pandas as pd
 import os
 import io
+import tempfile
+import requests_mock
+from aioresponses import aioresponses
 
 # --- IMPORTANT: Ensure the module path is correct ---
 # This assumes your main script is accessible via the path: src.list_mining.get_synonyms_GBIF
 from src.list_mining.get_synonyms_GBIF import (
+    gbif_get,
+    gbif_get_all,
+    gbif_get_async,
+    _retry_delay,
+    RETRY_STRATEGY,
     get_gbif_species_key, 
     get_gbif_synonyms, 
     get_gbif_common_names, 
     process_species,
+    process_species_async,
+    species_rows,
+    unique_species_names,
     fetch_gbif_names_and_synonyms,
     main
 )
@@ -45,35 +58,86 @@ class TestGBIFProcessor(unittest.TestCase):
         self.input_file = "test_input.csv"
         self.output_file = "test_output.csv"
 
+        # Keep the on-disk GBIF cache out of the tests unless a test opts in
+        cache_patcher = patch(f'{MODULE_PATH}.GBIF_CACHE_DIR', None)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+        # Retry the async requests without waiting out the real backoff
+        delay_patcher = patch(f'{MODULE_PATH}._retry_delay', return_value=0)
+        self.mock_retry_delay = delay_patcher.start()
+        self.addCleanup(delay_patcher.stop)
+
     def tearDown(self):
         """No file cleanup needed since files are mocked."""
         pass # Keeping this for clarity, but the original file cleanup is gone
 
-    # --- Unit Tests for Core Functions (Patched pygbif) ---
+    # --- Unit Tests for Core Functions (Patched GBIF API) ---
+
+    def test_gbif_get_uses_shared_session(self):
+        """Test that gbif_get builds the API URL, passes params and decodes JSON."""
+        with requests_mock.Mocker() as m:
+            m.get("https://api.gbif.org/v1/species/match", json={"usageKey": 1})
+            data = gbif_get("species/match", name="Anodonta anatina")
+        self.assertEqual(data, {"usageKey": 1})
+        self.assertEqual(m.last_request.qs["name"], ["anodonta anatina"])
+
+    def test_gbif_get_served_from_disk_cache_on_rerun(self):
+        """Test that a repeated GBIF call is answered from the disk cache."""
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                patch(f'{MODULE_PATH}.GBIF_CACHE_DIR', cache_dir), \
+                requests_mock.Mocker() as m:
+            m.get("https://api.gbif.org/v1/species/1/synonyms", json={"results": []})
+            first = gbif_get("species/1/synonyms", limit=1000, offset=0)
+            second = gbif_get("species/1/synonyms", limit=1000, offset=0)
+            self.assertEqual(m.call_count, 1)
+            self.assertEqual(first, second)
+
+            # Failed requests are not cached
+            m.get("https://api.gbif.org/v1/species/2/synonyms", status_code=500)
+            for _ in range(2):
+                with self.assertRaises(Exception):
+                    gbif_get("species/2/synonyms")
+            self.assertEqual(m.call_count, 3)
+
+    @patch(f'{MODULE_PATH}.gbif_get')
+    def test_gbif_get_all_follows_pages(self, mock_get):
+        """Test that paged endpoints are walked with limit/offset until endOfRecords."""
+        mock_get.side_effect = [
+            {"results": [{"scientificName": "A"}], "endOfRecords": False},
+            {"results": [{"scientificName": "B"}], "endOfRecords": True},
+        ]
+        data = gbif_get_all("species/1/synonyms")
+        self.assertEqual(data["results"], [{"scientificName": "A"}, {"scientificName": "B"}])
+        mock_get.assert_has_calls([
+            call("species/1/synonyms", limit=1000, offset=0),
+            call("species/1/synonyms", limit=1000, offset=1000),
+        ])
 
-    @patch('pygbif.species.name_backbone')
+    @patch(f'{MODULE_PATH}.gbif_get')
     def test_get_gbif_species_key_success(self, mock_backbone):
         """Test successful key retrieval for an accepted name."""
         mock_backbone.return_value = {"usageKey": self.key_accepted, "status": "ACCEPTED"}
         key = get_gbif_species_key("Accepted Name")
         self.assertEqual(key, self.key_accepted)
 
-    @patch('pygbif.species.name_backbone')
+    @patch(f'{MODULE_PATH}.gbif_get')
     def test_get_gbif_species_key_no_match(self, mock_backbone):
         """Test key retrieval for a name that returns NO_MATCH."""
         mock_backbone.return_value = {"status": "NO_MATCH"}
         key = get_gbif_species_key("No Match")
         self.assertIsNone(key)
 
-    @patch('pygbif.species.name_usage')
+    @patch(f'{MODULE_PATH}.gbif_get')
     def test_get_gbif_synonyms(self, mock_usage):
         """Test synonym retrieval and correct extraction."""
         mock_usage.return_value = {"results": self.mock_synonyms}
         syns = get_gbif_synonyms(self.key_accepted)
+        mock_usage.assert_called_once_with(f"species/{self.key_accepted}/synonyms", limit=1000, offset=0)
         expected_syns = {"Anodonta acallia", "Anodonta adusta", "Anodon subrhombea"}
         self.assertEqual(syns, expected_syns)
 
-    @patch('pygbif.species.name_usage')
+    @patch(f'{MODULE_PATH}.gbif_get')
     def test_get_gbif_common_names(self, mock_usage):
         """Test common name retrieval, language filtering, and tuple format."""
         mock_usage.return_value = {"results": self.mock_vernacular}
@@ -103,53 +167,123 @@ class TestGBIFProcessor(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertEqual(result["scientific_name"], self.scientific_name_accepted)
 
-    # --- Integration Test for the Main Workflow (Full Mocking of I/O) ---
+    def test_process_species_async(self):
+        """Test the aiohttp path: match, then synonyms and vernacular names."""
+        async def run():
+            async with aiohttp.ClientSession() as session:
+                return await process_species_async(session, self.scientific_name_accepted)
 
-    @patch(f'{MODULE_PATH}.process_species')
-    @patch('pandas.DataFrame.to_csv') # Mock output writing
-    @patch('pandas.read_csv')         # Mock input reading
-    def test_fetch_gbif_names_and_synonyms_integration(self, mock_read_csv, mock_to_csv, mock_process):
-        """Test the full workflow, including mocked CSV I/O and result formatting."""
-        
-        # Setup mock input reading
-        mock_read_csv.return_value = self.mock_input_df
+        base = "https://api.gbif.org/v1/species"
+        with aioresponses() as mocked:
+            mocked.get(f"{base}/match?name=Anodonta%20anatina",
+                       payload={"usageKey": self.key_accepted, "status": "ACCEPTED"})
+            mocked.get(f"{base}/{self.key_accepted}/synonyms?limit=1000&offset=0",
+                       payload={"results": self.mock_synonyms, "endOfRecords": True})
+            mocked.get(f"{base}/{self.key_accepted}/vernacularNames?limit=1000&offset=0", status=500)
+            result = asyncio.run(run())
+
+        self.assertEqual(result["scientific_name"], self.scientific_name_accepted)
+        self.assertEqual(set(result["synonyms"]), {"Anodonta acallia", "Anodonta adusta", "Anodon subrhombea"})
+        # A failed vernacular lookup leaves the synonyms intact
+        self.assertEqual(result["common_names"], [])
+
+    def test_gbif_get_async_retries_rate_limit_and_server_errors(self):
+        """Test a 429 (with Retry-After) and a 503 are retried before the payload is returned."""
+        async def run():
+            async with aiohttp.ClientSession() as session:
+                return await gbif_get_async(session, "species/match", name="Anodonta anatina")
+
+        url = "https://api.gbif.org/v1/species/match?name=Anodonta%20anatina"
+        with aioresponses() as mocked:
+            mocked.get(url, status=429, headers={"Retry-After": "7"})
+            mocked.get(url, status=503)
+            mocked.get(url, payload={"usageKey": self.key_accepted, "status": "ACCEPTED"})
+            result = asyncio.run(run())
+
+        self.assertEqual(result["usageKey"], self.key_accepted)
+        self.assertEqual(
+            [c.args for c in self.mock_retry_delay.call_args_list], [(1, "7"), (2, None)]
+        )
+
+    def test_gbif_get_async_gives_up_after_max_retries(self):
+        """Test a persistent 503 raises once the retries are used up."""
+        async def run():
+            async with aiohttp.ClientSession() as session:
+                return await gbif_get_async(session, "species/match", name="Anodonta anatina")
+
+        url = "https://api.gbif.org/v1/species/match?name=Anodonta%20anatina"
+        with aioresponses() as mocked:
+            mocked.get(url, status=503, repeat=True)
+            with self.assertRaises(aiohttp.ClientResponseError):
+                asyncio.run(run())
+
+        self.assertEqual(self.mock_retry_delay.call_count, RETRY_STRATEGY.total)
+
+    def test_retry_delay_backoff_and_retry_after(self):
+        """Test the async backoff doubles per attempt and honours a numeric Retry-After."""
+        # _retry_delay is imported at module level, before setUp patches it
+        self.assertEqual([_retry_delay(n) for n in (1, 2, 3)], [0.5, 1.0, 2.0])
+        self.assertEqual(_retry_delay(1, "7"), 7.0)
+        self.assertEqual(_retry_delay(3, "1"), 2.0)
+        self.assertEqual(_retry_delay(1, "Wed, 21 Oct 2015 07:28:00 GMT"), 0.5)
+
+    def test_unique_species_names_normalizes_variants(self):
+        """Test whitespace/case variants collapse to the first spelling."""
+        names = pd.Series(["Poa annua", "Poa annua ", " poa ANNUA", None, "  ", "Aedes albopictus"])
+        self.assertEqual(unique_species_names(names), ["Poa annua", "Aedes albopictus"])
+
+    def test_species_rows_grouped_per_species(self):
+        """Test rows are emitted as synonyms first, then common names."""
+        entry = {"scientific_name": "A", "synonyms": ["A1"], "common_names": [("An", "en")]}
+        self.assertEqual(list(species_rows(entry)), [
+            ["A", "A1", "Synonym", ""],
+            ["A", "An", "Common Name", "en"],
+        ])
+
+    # --- Integration Test for the Main Workflow (mocked GBIF, real CSV I/O) ---
+
+    @patch(f'{MODULE_PATH}.process_species_async')
+    def test_fetch_gbif_names_and_synonyms_integration(self, mock_process):
+        """Test the full workflow: rows streamed to the output CSV and returned as a DataFrame."""
         
         # Setup mock results for the two species in the test CSV
         mock_process.side_effect = [
             {
                 "scientific_name": self.scientific_name_accepted,
                 "synonyms": ["SynA", "SynB"],
-                "common_names": [("NameX", "es"), ("NameY", "de")]
+                "common_names": [("NameX", "es"), ("NameY, Z", "de")]
             },
             # Second species (no match) returns None from process_species
             None 
         ]
 
-        df_result = fetch_gbif_names_and_synonyms(self.input_file, self.output_file, max_workers=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, self.input_file)
+            output_path = os.path.join(tmp, self.output_file)
+            self.mock_input_df.to_csv(input_path, index=False)
+
+            df_result = fetch_gbif_names_and_synonyms(input_path, output_path, max_workers=1)
+            with open(output_path, encoding="utf-8") as f:
+                header = f.readline().strip()
         
         self.assertIsNotNone(df_result)
         
-        # 1. Verify read_csv was called correctly
-        mock_read_csv.assert_called_once_with(self.input_file, usecols=['Scientific Name'])
-        
-        # 2. Verify process_species was called for each unique species
+        # 1. Verify process_species was called for each unique species
         self.assertEqual(mock_process.call_count, 2)
         mock_process.assert_has_calls([
-            call(self.scientific_name_accepted),
-            call(self.scientific_name_no_match)
+            call(ANY, self.scientific_name_accepted),
+            call(ANY, self.scientific_name_no_match)
         ], any_order=True)
 
-        # 3. Verify output formatting and to_csv call
+        # 2. Verify the streamed CSV and the returned DataFrame
+        self.assertEqual(header, "Scientific Name,Name,Type,Language (optional)")
         self.assertEqual(len(df_result), 4) # 2 synonyms + 2 common names
-        
-        mock_to_csv.assert_called_once()
-        
-        # Check arguments passed to to_csv
-        args, kwargs = mock_to_csv.call_args
-        self.assertEqual(args[0], self.output_file) # Check filename
-        self.assertEqual(kwargs['index'], False)    # Check index=False
-        self.assertEqual(kwargs['encoding'], 'utf-8') # Check encoding='utf-8'
-
+        self.assertEqual(df_result.values.tolist(), [
+            [self.scientific_name_accepted, "SynA", "Synonym", ""],
+            [self.scientific_name_accepted, "SynB", "Synonym", ""],
+            [self.scientific_name_accepted, "NameX", "Common Name", "es"],
+            [self.scientific_name_accepted, "NameY, Z", "Common Name", "de"],
+        ])
 
     # --- Test for Standalone Execution ---
     
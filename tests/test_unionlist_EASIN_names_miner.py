@@ -1,7 +1,9 @@
 import unittest
 from unittest.mock import patch, MagicMock, mock_open
+import io
 import sys
 import os
+import orjson
 import requests
 
 # Correct the path to import the script.
@@ -23,7 +25,7 @@ class TestEasinApiProcessing(unittest.TestCase):
         # --- Mock a successful API response (UPDATED: Added EASINID) ---
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [
+        mock_response.raw = io.BytesIO(orjson.dumps([
             {
                 "EASINID": "R123", # <--- NEW FIELD ADDED
                 "Name": "Species A",
@@ -44,8 +46,8 @@ class TestEasinApiProcessing(unittest.TestCase):
                     {"Synonym": "Synonym B1"}
                 ]
             }
-        ]
-        mock_requests_get.return_value = mock_response
+        ]))
+        mock_requests_get.return_value.__enter__.return_value = mock_response
 
         # --- Execute the function ---
         test_url = "http://test-api.com"
@@ -55,7 +57,7 @@ class TestEasinApiProcessing(unittest.TestCase):
         # --- Verify the behavior and output ---
         
         # Check that the API was called with the correct URL
-        mock_requests_get.assert_called_once_with(test_url)
+        mock_requests_get.assert_called_once_with(test_url, stream=True)
 
         # Check that the file was opened for writing
         mock_file.assert_called_once_with(test_output_file, mode='w', newline='', encoding='utf-8')
@@ -103,4 +105,109 @@ class TestEasinApiProcessing(unittest.TestCase):
             full_captured_output = "".join([call[0][0] for call in captured_output_calls])
             
             # Verify that the failure message was printed
-            self.assertIn("Error: Unable to fetch data from the API", full_captured_output)
\ No newline at end of file
+            self.assertIn("Error: Unable to fetch data from the API", full_captured_output)
+
+    @patch("list_mining.get_EASIN_unionlistofconcern.requests.get")
+    def test_fetch_and_process_keeps_species_order(self, mock_requests_get):
+        """
+        Tests that the flattened rows keep the per-species grouping
+        (common names, then synonyms) and fill missing fields with 'N/A'.
+        """
+        import tempfile
+        mock_response = MagicMock()
+        mock_response.raw = io.BytesIO(orjson.dumps([
+            {"EASINID": "R1", "Name": "Species A",
+             "CommonNames": [{"Name": "Common A"}], "Synonyms": [{"Synonym": "Synonym A"}]},
+            {"Name": "Species B", "Synonyms": [{}],
+             "CommonNames": [{"Name": "Common B"}]},
+        ]))
+        mock_requests_get.return_value.__enter__.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, "names.csv")
+            fetch_and_process_easin_data("http://test-api.com", output_file)
+            with open(output_file, newline='', encoding='utf-8') as f:
+                lines = f.read().split('\r\n')
+
+        self.assertEqual(lines[1:-1], [
+            'R1,Species A,Common Name,Common A',
+            'R1,Species A,Synonym,Synonym A',
+            'N/A,Species B,Common Name,Common B',
+            'N/A,Species B,Synonym,N/A',
+        ])
+
+    @patch("list_mining.get_EASIN_unionlistofconcern.requests.get")
+    def test_fetch_and_process_writes_nulls_as_empty_cells(self, mock_requests_get):
+        """
+        Tests that explicit null fields are written as empty cells, as
+        csv.writer did, while missing keys still become 'N/A'.
+        """
+        import tempfile
+        mock_response = MagicMock()
+        mock_response.raw = io.BytesIO(orjson.dumps([
+            {"EASINID": None, "Name": None,
+             "CommonNames": [{"Name": None}], "Synonyms": [{}]},
+        ]))
+        mock_requests_get.return_value.__enter__.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, "names.csv")
+            fetch_and_process_easin_data("http://test-api.com", output_file)
+            with open(output_file, newline='', encoding='utf-8') as f:
+                lines = f.read().split('\r\n')
+
+        self.assertEqual(lines[1:-1], [
+            ',,Common Name,',
+            ',,Synonym,N/A',
+        ])
+
+    @patch("list_mining.get_EASIN_unionlistofconcern.CHUNK_SIZE", 2)
+    @patch("list_mining.get_EASIN_unionlistofconcern.requests.get")
+    def test_fetch_and_process_streams_in_batches(self, mock_requests_get):
+        """
+        Tests that species spread over several streamed batches are all
+        written once, in order, below a single header row.
+        """
+        import tempfile
+        mock_response = MagicMock()
+        mock_response.raw = io.BytesIO(orjson.dumps([
+            {"EASINID": f"R{i}", "Name": f"Species {i}", "Synonyms": [{"Synonym": f"Synonym {i}"}]}
+            for i in range(5)
+        ]))
+        mock_requests_get.return_value.__enter__.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, "names.csv")
+            fetch_and_process_easin_data("http://test-api.com", output_file)
+            with open(output_file, newline='', encoding='utf-8') as f:
+                lines = f.read().split('\r\n')
+
+        self.assertEqual(lines[0], 'EASINID,Scientific Name,Label,All Names')
+        self.assertEqual(lines[1:-1], [f'R{i},Species {i},Synonym,Synonym {i}' for i in range(5)])
+
+    @patch("list_mining.get_EASIN_unionlistofconcern.CHUNK_SIZE", 1)
+    @patch("list_mining.get_EASIN_unionlistofconcern.requests.get")
+    def test_fetch_and_process_skips_duplicate_names(self, mock_requests_get):
+        """
+        Tests that repeated (EASINID, Label, name) rows are written only once,
+        also when the repeats fall in different streamed batches.
+        """
+        import tempfile
+        species = {"EASINID": "R1", "Name": "Species A",
+                   "CommonNames": [{"Name": "Common A"}, {"Name": "Common A"}],
+                   "Synonyms": [{"Synonym": "Common A"}]}
+        mock_response = MagicMock()
+        mock_response.raw = io.BytesIO(orjson.dumps([species, species]))
+        mock_requests_get.return_value.__enter__.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, "names.csv")
+            fetch_and_process_easin_data("http://test-api.com", output_file)
+            with open(output_file, newline='', encoding='utf-8') as f:
+                lines = f.read().split('\r\n')
+
+        # The same name under a different label is kept
+        self.assertEqual(lines[1:-1], [
+            'R1,Species A,Common Name,Common A',
+            'R1,Species A,Synonym,Common A',
+        ])
@@ -0,0 +1,73 @@
+"""
+Unit tests for the combined Wikipedia + GBIF union list pipeline.
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src.list_mining.get_unionlist_wiki_GBIF import run_union_list_enrichment
+
+MODULE_PATH = 'src.list_mining.get_unionlist_wiki_GBIF'
+
+
+class TestRunUnionListEnrichment:
+    """Tests for run_union_list_enrichment."""
+
+    @patch(f'{MODULE_PATH}.fetch_gbif_names_for_species')
+    @patch(f'{MODULE_PATH}.collect_wiki_sitelinks')
+    @patch(f'{MODULE_PATH}.extract_scientific_names')
+    @patch(f'{MODULE_PATH}.fetch_webpage_content')
+    def test_wiki_and_gbif_lookups_overlap(
+        self, mock_fetch, mock_extract, mock_wiki, mock_gbif, tmp_path
+    ):
+        """Both lookups run concurrently on the extracted species names."""
+        mock_fetch.return_value = MagicMock(content=b"<html></html>")
+        mock_extract.return_value = ["Aedes albopictus", "Aedes albopictus ",
+                                     "Myocastor coypus"]
+        df_q, df_s, df_gbif = pd.DataFrame({'q': [1]}), pd.DataFrame(), pd.DataFrame({'g': [1]})
+
+        # Each side waits for the other to start: only passes if they overlap
+        both_started = threading.Barrier(2, timeout=5)
+
+        def wiki_side(*args):
+            both_started.wait()
+            return df_q, df_s
+
+        def gbif_side(*args):
+            both_started.wait()
+            return df_gbif
+
+        mock_wiki.side_effect = wiki_side
+        mock_gbif.side_effect = gbif_side
+
+        result = run_union_list_enrichment(
+            wiki_url="https://example.com/list",
+            q_number_file=str(tmp_path / "q.csv"),
+            sitelinks_file=str(tmp_path / "s.csv"),
+            gbif_output_file=str(tmp_path / "g.csv"),
+            max_workers=5
+        )
+
+        assert result == (df_q, df_s, df_gbif)
+        mock_wiki.assert_called_once_with(
+            mock_extract.return_value,
+            str(tmp_path / "q.csv"), str(tmp_path / "s.csv")
+        )
+        mock_gbif.assert_called_once_with(
+            ["Aedes albopictus", "Myocastor coypus"],
+            str(tmp_path / "g.csv"), 5
+        )
+
+    @patch(f'{MODULE_PATH}.fetch_gbif_names_for_species')
+    @patch(f'{MODULE_PATH}.collect_wiki_sitelinks')
+    @patch(f'{MODULE_PATH}.fetch_webpage_content', return_value=None)
+    def test_failed_fetch_skips_lookups(self, mock_fetch, mock_wiki, mock_gbif, capsys):
+        """Nothing is queried when the species list page cannot be fetched."""
+        df_q, df_s, df_gbif = run_union_list_enrichment(wiki_url="https://example.com/fail")
+
+        assert df_q.empty and df_s.empty and df_gbif is None
+        mock_wiki.assert_not_called()
+        mock_gbif.assert_not_called()
+        assert "Failed to fetch webpage content" in capsys.readouterr().out